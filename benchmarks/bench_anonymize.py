@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Parallel anonymization benchmark.
+
+Anonymizes a generated file of records with 1, 2, 4, ... worker processes
+(up to the CPU count) and reports the throughput and the speedup over a
+single process, for a top-level JSON array and for NDJSON.
+
+Usage:
+    python benchmarks/bench_anonymize.py [--records 50000] [--chunk-size 1000] [--max-workers N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = str(ROOT / 'src' / 'cli_generate.py')
+RECORD = ROOT / 'examples' / 'test_anonymization.json'
+
+
+def write_inputs(directory, records):
+    """Write the benchmark input as a JSON array and as NDJSON."""
+    with open(RECORD, 'r', encoding='utf-8') as f:
+        record = json.dumps(json.load(f), ensure_ascii=False)
+
+    array_path = Path(directory) / 'records.json'
+    ndjson_path = Path(directory) / 'records.ndjson'
+    with open(array_path, 'w', encoding='utf-8') as f:
+        f.write('[' + ', '.join([record] * records) + ']')
+    with open(ndjson_path, 'w', encoding='utf-8') as f:
+        f.write((record + '\n') * records)
+    return array_path, ndjson_path
+
+
+def run(path, workers, chunk_size, ndjson):
+    """Return the wall time of one CLI anonymization, in seconds."""
+    command = [sys.executable, CLI, '--anonymize', str(path), '--workers', str(workers),
+               '--chunk-size', str(chunk_size)]
+    if ndjson:
+        command.append('--ndjson')
+
+    start = time.perf_counter()
+    subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel anonymization benchmark")
+    parser.add_argument('--records', type=int, default=50000, help='Records in the input (default: 50000)')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Records per chunk (default: 1000)')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1,
+                        help='Largest worker count to try (default: CPU count)')
+    args = parser.parse_args()
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    with tempfile.TemporaryDirectory() as directory:
+        array_path, ndjson_path = write_inputs(directory, args.records)
+
+        for label, path, ndjson in (('array', array_path, False), ('ndjson', ndjson_path, True)):
+            print(f"{label} ({args.records} records, chunks of {args.chunk_size})")
+            baseline = None
+            for workers in worker_counts:
+                seconds = run(path, workers, args.chunk_size, ndjson)
+                baseline = baseline or seconds
+                print(f"  {workers:>3} worker(s) {seconds:8.2f} s {args.records / seconds:12.0f} records/s"
+                      f"   x{baseline / seconds:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the CLI.
+
+Measures the wall time of short CLI invocations, minus the time of a bare
+interpreter start, and checks that modes which do not need them never
+import Faker or YAML. Exits with status 1 when a budget is exceeded or a
+forbidden module is imported, so it can gate releases.
+
+Budgets are coarse ceilings with about twice the usual cost as headroom.
+To catch smaller regressions, save the timings of a reference run with
+--output and check later runs against it with --compare: a scenario then
+fails when its fastest run is slower than in the baseline by more than
+--tolerance.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 7] [--scale 1.0]
+                                       [--output startup.json] [--compare startup.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = str(ROOT / 'src' / 'cli_generate.py')
+EXAMPLES = ROOT / 'examples'
+
+# name, CLI arguments, startup budget in ms over a bare interpreter,
+# modules that must not be imported
+SCENARIOS = [
+    ('analyze', ['--analyze', str(EXAMPLES / 'test_anonymization.json')], 120, ['faker', 'yaml']),
+    ('generate', ['--skeleton', str(EXAMPLES / 'skeleton_example.json')], 400, ['yaml']),
+    ('generate+swagger', ['--skeleton', str(EXAMPLES / 'skeleton_example.json'),
+                          '--swagger', str(EXAMPLES / 'swagger_example.yaml')], 450, []),
+    ('anonymize', ['--anonymize', str(EXAMPLES / 'test_anonymization.json')], 600, ['yaml']),
+]
+
+
+def time_command(command, runs):
+    """Return the median and the fastest wall time of a command, in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def imported_modules(arguments):
+    """Return the top-level modules imported by a CLI invocation."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', CLI] + arguments,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip().split('.')[0])
+    return modules
+
+
+def compare(timings, baseline, tolerance):
+    """
+    Print the change of every scenario against a baseline.
+
+    Returns:
+        Names of the scenarios that regressed
+    """
+    previous = baseline['timings']
+    regressions = []
+
+    print(f"\n{'scenario':<18}{'ms':>10}{'baseline':>10}{'change':>10}")
+    for name, elapsed in timings.items():
+        before = previous.get(name)
+        if before is None:
+            print(f"{name:<18}{elapsed:>10.1f}{'new':>10}")
+            continue
+
+        change = elapsed / before - 1 if before > 0 else 0.0
+        regressed = change > tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<18}{elapsed:>10.1f}{before:>10.1f}{change:>+10.1%}{'  REGRESSION' if regressed else ''}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup benchmark")
+    parser.add_argument('--runs', type=int, default=7, help='Runs per scenario (default: 7)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiplier applied to every budget, for slow machines (default: 1.0)')
+    parser.add_argument('--output', '-o', type=str, help='Write the timings to this JSON file')
+    parser.add_argument('--compare', type=str, help='Baseline timings file to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown over the baseline before failing (default: 0.25)')
+    args = parser.parse_args()
+
+    baseline, fastest_baseline = time_command([sys.executable, '-c', 'pass'], args.runs)
+    print(f"bare interpreter: {baseline:.1f} ms")
+
+    failures = []
+    timings = {}
+    for name, arguments, budget, forbidden in SCENARIOS:
+        median, fastest = time_command([sys.executable, CLI] + arguments, args.runs)
+        elapsed = median - baseline
+        # Noise only ever adds time, so baselines compare the fastest runs
+        timings[name] = round(fastest - fastest_baseline, 1)
+        limit = budget * args.scale
+        status = 'ok' if elapsed <= limit else 'SLOW'
+        print(f"{name:<18} {elapsed:8.1f} ms  (budget {limit:.0f} ms)  {status}")
+        if elapsed > limit:
+            failures.append(f"{name}: {elapsed:.1f} ms > {limit:.0f} ms")
+
+        leaked = sorted(set(forbidden) & imported_modules(arguments))
+        if leaked:
+            print(f"{'':<18} imports {', '.join(leaked)}")
+            failures.append(f"{name}: imports {', '.join(leaked)}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'runs': args.runs, 'timings': timings}, f, indent=2)
+        print(f"\nTimings saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            reference = json.load(f)
+        failures += [f"{name}: over {args.tolerance:.0%} slower than the baseline"
+                     for name in compare(timings, reference, args.tolerance)]
+
+    if failures:
+        print("\nStartup regressions:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Throughput, latency and memory benchmark suite.
+
+Runs JSONProcessor.process_json, DataAnonymizer.anonymize_json,
+DataAnonymizer.get_sensitive_fields and SwaggerParser.load_swagger on
+synthetic inputs scaled by width (keys per object), depth (nested
+objects) and array length, and on large synthetic OpenAPI specs. Each
+case reports its throughput (records/s, MB/s), median latency and peak
+Python memory (tracemalloc, measured in a separate run so that tracing
+does not skew timings).
+
+Results are written as JSON. With --compare, they are checked against a
+saved baseline and the script exits with status 1 when a case lost more
+than --tolerance of its throughput or grew its peak memory by as much, so
+it can gate releases.
+
+Usage:
+    python benchmarks/bench_suite.py [--scale 1.0] [--runs 5] [--only anonymize]
+                                     [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+from data_anonymizer import DataAnonymizer  # noqa: E402
+from data_generator import DataGenerator  # noqa: E402
+from json_processor import JSONProcessor  # noqa: E402
+from swagger_parser import SwaggerParser  # noqa: E402
+
+# Field names cycled through synthetic objects: sensitive, typed and neutral ones
+FIELD_NAMES = [
+    'firstName', 'lastName', 'email', 'phone', 'city', 'street', 'company', 'createdAt',
+    'id', 'age', 'price', 'isActive', 'status', 'description', 'code', 'label',
+]
+
+# name, shape of the synthetic inputs (scaled by --scale)
+SHAPES = [
+    ('wide', {'width': 64, 'depth': 1, 'length': 2000}),
+    ('deep', {'width': 4, 'depth': 8, 'length': 2000}),
+    ('long', {'width': 8, 'depth': 2, 'length': 20000}),
+]
+
+# name, number of schemas and properties per schema of synthetic specs (scaled by --scale)
+SPECS = [
+    ('spec-200', {'schemas': 200, 'properties': 20}),
+    ('spec-1000', {'schemas': 1000, 'properties': 20}),
+]
+
+
+def field_name(index):
+    """Return the name of the index-th field of a synthetic object."""
+    name = FIELD_NAMES[index % len(FIELD_NAMES)]
+    return name if index < len(FIELD_NAMES) else f"{name}{index // len(FIELD_NAMES)}"
+
+
+def make_skeleton(width, depth):
+    """Build a skeleton with width empty fields per level and depth nested levels."""
+    node = {field_name(i): "" for i in range(width)}
+    node['tags'] = []
+    for level in range(depth - 1):
+        node = {**{field_name(i): "" for i in range(width)}, f"child{level}": node}
+    return node
+
+
+def make_record(rng, width, depth):
+    """Build a filled record with the shape of make_skeleton."""
+    def level():
+        return {field_name(i): rng.choice(['Alice Martin', 'alice@example.com', '+33 6 12 34 56 78',
+                                           'Paris', 'A short note about the order', '2024-03-15'])
+                if i % 3 else rng.randint(0, 10 ** 6)
+                for i in range(width)}
+
+    node = level()
+    node['tags'] = ['a', 'b', 'c']
+    for depth_level in range(depth - 1):
+        node = {**level(), f"child{depth_level}": node}
+    return node
+
+
+def make_spec(schemas, properties):
+    """Build an OpenAPI spec with chained $ref, allOf and typed properties."""
+    types = [
+        {'type': 'string', 'minLength': 2, 'maxLength': 50},
+        {'type': 'string', 'format': 'email'},
+        {'type': 'integer', 'minimum': 0, 'maximum': 1000},
+        {'type': 'string', 'enum': ['a', 'b', 'c']},
+        {'type': 'array', 'items': {'type': 'string'}, 'minItems': 1},
+    ]
+    components = {}
+    for i in range(schemas):
+        props = {field_name(j): dict(types[j % len(types)]) for j in range(properties)}
+        if i:
+            props['parent'] = {'$ref': f'#/components/schemas/Schema{i - 1}'}
+        schema = {'type': 'object', 'properties': props, 'required': [field_name(0)]}
+        if i % 10 == 9:
+            schema = {'allOf': [{'$ref': f'#/components/schemas/Schema{i - 1}'}, schema]}
+        components[f'Schema{i}'] = schema
+
+    return {'openapi': '3.0.0', 'info': {'title': 'Benchmark', 'version': '1.0.0'},
+            'paths': {}, 'components': {'schemas': components}}
+
+
+def scaled(shape, scale):
+    """Scale the array length or schema count of a shape."""
+    shape = dict(shape)
+    for key in ('length', 'schemas'):
+        if key in shape:
+            shape[key] = max(1, int(shape[key] * scale))
+    return shape
+
+
+def measure(function, runs):
+    """
+    Time a function and measure its peak memory.
+
+    Returns:
+        (median seconds, peak traced memory in MB)
+    """
+    function()  # Warm-up: imports, pools, caches
+
+    samples = []
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return statistics.median(samples), peak / 1e6
+
+
+def result(name, params, seconds, peak_mb, records, size_bytes=None):
+    """Build one result entry."""
+    entry = {
+        'name': name,
+        'params': params,
+        'seconds': round(seconds, 6),
+        'records_per_s': round(records / seconds, 1),
+        'latency_ms': round(seconds / records * 1000, 4),
+        'peak_mb': round(peak_mb, 2),
+    }
+    if size_bytes is not None:
+        entry['mb_per_s'] = round(size_bytes / 1e6 / seconds, 2)
+    return entry
+
+
+def bench_generate(shape_name, shape, runs):
+    """Generate length documents from a skeleton with process_json."""
+    skeleton = make_skeleton(shape['width'], shape['depth'])
+    documents = max(1, shape['length'] // 20)
+    processor = JSONProcessor()
+    generator = DataGenerator(seed=1)
+
+    def run():
+        for _ in range(documents):
+            generator.clear_cache()
+            processor.process_json(skeleton, None, generator)
+
+    seconds, peak_mb = measure(run, runs)
+    return result(f'process_json/{shape_name}', {**shape, 'documents': documents}, seconds, peak_mb, documents)
+
+
+def bench_document(shape_name, shape, runs):
+    """Anonymize and analyze one document holding an array of length records."""
+    rng = random.Random(1)
+    document = {'records': [make_record(rng, shape['width'], shape['depth']) for _ in range(shape['length'])]}
+    size_bytes = len(json.dumps(document, ensure_ascii=False).encode('utf-8'))
+    anonymizer = DataAnonymizer()
+    results = []
+
+    for name, function in (('anonymize_json', lambda: anonymizer.anonymize_json(document)),
+                           ('get_sensitive_fields', lambda: anonymizer.get_sensitive_fields(document)),
+                           ('count_sensitive_fields', lambda: anonymizer.count_sensitive_fields(document))):
+        seconds, peak_mb = measure(function, runs)
+        results.append(result(f'{name}/{shape_name}', shape, seconds, peak_mb, shape['length'], size_bytes))
+
+    return results
+
+
+def bench_swagger(spec_name, shape, runs, directory):
+    """Load a synthetic spec from JSON and from YAML, without the spec cache."""
+    import yaml
+
+    spec = make_spec(shape['schemas'], shape['properties'])
+    results = []
+    for suffix, dump in (('json', lambda f: json.dump(spec, f)),
+                         ('yaml', lambda f: yaml.safe_dump(spec, f, sort_keys=False))):
+        path = Path(directory) / f'{spec_name}.{suffix}'
+        with open(path, 'w', encoding='utf-8') as f:
+            dump(f)
+
+        seconds, peak_mb = measure(lambda: SwaggerParser().load_swagger(str(path)), runs)
+        results.append(result(f'load_swagger/{spec_name}.{suffix}', shape, seconds, peak_mb,
+                              shape['schemas'], path.stat().st_size))
+
+    return results
+
+
+def run_suite(scale, runs, only):
+    """Run the selected benchmark groups and return their results."""
+    groups = {
+        'generate': lambda: [bench_generate(name, scaled(shape, scale), runs) for name, shape in SHAPES],
+        'anonymize': lambda: [entry for name, shape in SHAPES
+                              for entry in bench_document(name, scaled(shape, scale), runs)],
+    }
+
+    results = []
+    for group, function in groups.items():
+        if not only or group in only:
+            results.extend(function())
+
+    if not only or 'swagger' in only:
+        with tempfile.TemporaryDirectory() as directory:
+            for name, shape in SPECS:
+                results.extend(bench_swagger(name, scaled(shape, scale), runs, directory))
+
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print the change of every case against a baseline.
+
+    Returns:
+        Names of the cases that regressed
+    """
+    previous = {entry['name']: entry for entry in baseline['results']}
+    regressions = []
+
+    print(f"\n{'case':<44}{'records/s':>14}{'change':>10}{'peak MB':>10}{'change':>10}")
+    for entry in results:
+        before = previous.get(entry['name'])
+        if before is None:
+            print(f"{entry['name']:<44}{entry['records_per_s']:>14.0f}{'new':>10}")
+            continue
+
+        speed = entry['records_per_s'] / before['records_per_s'] - 1
+        memory = entry['peak_mb'] / before['peak_mb'] - 1 if before['peak_mb'] else 0.0
+        regressed = speed < -tolerance or memory > tolerance
+        if regressed:
+            regressions.append(entry['name'])
+
+        print(f"{entry['name']:<44}{entry['records_per_s']:>14.0f}{speed:>+10.1%}"
+              f"{entry['peak_mb']:>10.1f}{memory:>+10.1%}{'  REGRESSION' if regressed else ''}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput, latency and memory benchmark suite")
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier of array lengths and spec sizes')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per case (default: 5)')
+    parser.add_argument('--only', action='append', choices=['generate', 'anonymize', 'swagger'],
+                        help='Benchmark group to run (repeatable, default: all)')
+    parser.add_argument('--output', '-o', type=str, help='Write the results to this JSON file')
+    parser.add_argument('--compare', type=str, help='Baseline results file to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='Allowed throughput loss or memory growth before failing (default: 0.15)')
+    args = parser.parse_args()
+
+    results = run_suite(args.scale, args.runs, args.only)
+
+    print(f"{'case':<44}{'records/s':>14}{'MB/s':>10}{'latency ms':>12}{'peak MB':>10}")
+    for entry in results:
+        mb_per_s = f"{entry['mb_per_s']:.1f}" if 'mb_per_s' in entry else '-'
+        print(f"{entry['name']:<44}{entry['records_per_s']:>14.0f}{mb_per_s:>10}"
+              f"{entry['latency_ms']:>12.3f}{entry['peak_mb']:>10.1f}")
+
+    if args.output:
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'scale': args.scale,
+            'runs': args.runs,
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Tree visitors of the data anonymizer.
+Kept apart from data_anonymizer so that the tree walker is only imported
+when a parsed document is anonymized or analyzed.
+"""
+
+from typing import Any, List, Optional
+
+from tree_walker import NodePath, TreeVisitor
+
+
+class AnonymizingVisitor(TreeVisitor):
+    """Rebuilds a document with the non-blank strings held by object keys anonymized."""
+
+    def __init__(self, anonymize_field):
+        self.result: Any = None
+        self._anonymize_field = anonymize_field
+        self._containers: List[Any] = []
+
+    def _add(self, value: Any, key: Any, parent: Optional[NodePath]):
+        containers = self._containers
+        if not containers:
+            self.result = value
+        elif parent.is_list:
+            containers[-1].append(value)
+        else:
+            containers[-1][key] = value
+
+    def enter_dict(self, node: dict, key: Any, path: NodePath) -> bool:
+        copy = {}
+        self._add(copy, key, path.parent)
+        self._containers.append(copy)
+        return True
+
+    def enter_list(self, node: list, key: Any, path: NodePath) -> bool:
+        copy = []
+        self._add(copy, key, path.parent)
+        self._containers.append(copy)
+        return True
+
+    def leave_dict(self, node: dict, key: Any, path: NodePath):
+        self._containers.pop()
+
+    leave_list = leave_dict
+
+    def visit_value(self, value: Any, key: Any, parent: NodePath):
+        containers = self._containers
+        if not containers:
+            self.result = value
+        elif parent.is_list:
+            containers[-1].append(value)
+        elif isinstance(value, str) and value.strip():
+            # Anonymize string values based on field name
+            containers[-1][key] = self._anonymize_field(key, value)
+        else:
+            containers[-1][key] = value
+
+
+class SensitiveFieldsVisitor(TreeVisitor):
+    """Collects the paths of the non-blank strings held by sensitive keys."""
+
+    def __init__(self, is_sensitive_field):
+        self.paths: List[str] = []
+        self._is_sensitive_field = is_sensitive_field
+
+    def visit_value(self, value: Any, key: Any, parent: NodePath):
+        if not parent.is_list and isinstance(value, str) and value.strip() and self._is_sensitive_field(key):
+            self.paths.append(parent.child_text(key))
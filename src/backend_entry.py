@@ -5,10 +5,12 @@ This file serves as the main entry point when the Python backend is packaged as
 It simply calls the CLI module with the same arguments.
 This way, no changes are needed on the Electron side: we just call
 the backend.exe with the same arguments as before.
+With `--serve`, it runs as a persistent JSON-RPC server instead.
 """
 
 from __future__ import annotations
 
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -25,6 +27,17 @@ from cli_generate import main as cli_main  # type: ignore
 
 def main() -> None:  # pragma: no cover
     """Point d'entrée de l'exécutable."""
+    # Nécessaire pour que les processus de génération parallèle démarrent
+    # correctement dans l'exécutable empaqueté (Windows / spawn)
+    multiprocessing.freeze_support()
+
+    # Mode démon : un seul processus sert toutes les requêtes (JSON-RPC
+    # ligne par ligne sur stdin/stdout), voir backend_server.py
+    if sys.argv[1:] == ['--serve']:
+        from backend_server import serve  # type: ignore
+        serve()
+        return
+
     cli_main()
 
 
@@ -0,0 +1,404 @@
+"""
+Persistent backend server.
+Speaks line-delimited JSON-RPC 2.0 over stdin/stdout so that a single
+long-running process can serve every generate, analyze and anonymize call,
+keeping Faker, the anonymizer pools, compiled plans and parsed Swagger specs
+warm between requests.
+
+Each input line is one request, each output line one response:
+
+    -> {"jsonrpc": "2.0", "id": 1, "method": "generate",
+        "params": {"skeleton": {...}, "swagger_path": "api.yaml"}}
+    <- {"jsonrpc": "2.0", "id": 1, "result": {...}}
+
+Methods:
+    ping                      -> "pong"
+    generate   skeleton | skeleton_path, [swagger | swagger_path],
+               [count], [seed], [pool_size], [output_path]
+    analyze    data | data_path, [wildcard], [sample_rate], [sample_size],
+               [scan_values], [output_path]
+    anonymize  data | data_path, [output_path]
+    validate   data | data_path, swagger | swagger_path, [schema], [output_path]
+    cancel     id (of the request to cancel)
+    shutdown
+
+Requests run one at a time in arrival order on a worker thread. A queued
+request can always be cancelled; a running bulk generation stops at the
+next record. Cancelled requests get an error response with code -32800.
+Notifications (requests without an id) never get a response, even on error.
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO, Tuple
+
+from data_anonymizer import DataAnonymizer
+from data_generator import DataGenerator, DEFAULT_POOL_SIZE
+from generation_plan import GenerationPlan
+from json_input import load_file as load_json_file
+from json_output import dump as dump_json, open_output
+from json_processor import JSONProcessor
+from parallel_generator import derive_shard_seed, DEFAULT_SHARD_SIZE
+from schema_validator import SchemaValidator
+from spec_cache import SpecCache
+from swagger_parser import SwaggerParser
+
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_ERROR = -32000
+REQUEST_CANCELLED = -32800
+
+# Number of compiled plans kept warm
+PLAN_CACHE_SIZE = 64
+
+
+class RequestCancelled(Exception):
+    """Raised inside a running request when it has been cancelled."""
+
+
+class InvalidParams(ValueError):
+    """Raised when a request has missing or invalid parameters."""
+
+
+class BackendServer:
+    """Line-delimited JSON-RPC server keeping backend objects warm."""
+
+    def __init__(self, stdin: TextIO = None, stdout: TextIO = None):
+        """
+        Initialize the server.
+
+        Args:
+            stdin: Stream to read requests from (default: sys.stdin)
+            stdout: Stream to write responses to (default: sys.stdout)
+        """
+        self.stdin = stdin or sys.stdin
+        self.stdout = stdout or sys.stdout
+
+        self._write_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._requests: Dict[Any, Tuple[Future, threading.Event]] = {}
+        self._requests_lock = threading.Lock()
+        self._running = True
+
+        # Warm state, only touched from the worker thread
+        self.processor = JSONProcessor()
+        self._generator: Optional[DataGenerator] = None
+        self._seeded_generator: Optional[Tuple[Tuple[int, int], DataGenerator]] = None
+        self._anonymizer: Optional[DataAnonymizer] = None
+        self._specs: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._plans: "OrderedDict[Tuple[str, int], Tuple[Optional[Dict[str, Any]], GenerationPlan]]" = OrderedDict()
+        self._validators: "OrderedDict[int, Tuple[Dict[str, Any], SchemaValidator]]" = OrderedDict()
+        self._spec_cache = SpecCache()
+
+        self._methods: Dict[str, Callable[[Dict[str, Any], threading.Event], Any]] = {
+            'ping': lambda params, cancelled: 'pong',
+            'generate': self._generate,
+            'analyze': self._analyze,
+            'anonymize': self._anonymize,
+            'validate': self._validate,
+        }
+
+    def serve_forever(self):
+        """Read and dispatch requests until shutdown or end of input."""
+        try:
+            for line in self.stdin:
+                if line.strip():
+                    try:
+                        self._dispatch(line)
+                    except Exception as e:
+                        # One malformed line must never stop the server
+                        self._send_error(None, INTERNAL_ERROR, f"Internal error: {e}")
+                if not self._running:
+                    break
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def _dispatch(self, line: str):
+        """Parse a request line and schedule or answer it."""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            self._send_error(None, PARSE_ERROR, f"Parse error: {e}")
+            return
+
+        if (not isinstance(request, dict) or not isinstance(request.get('method'), str)
+                or not isinstance(request.get('id'), (str, int, float, type(None)))):
+            request_id = request.get('id') if isinstance(request, dict) else None
+            self._send_error(request_id if isinstance(request_id, (str, int, float)) else None,
+                             INVALID_REQUEST, "Invalid request")
+            return
+
+        request_id = request.get('id')
+        method = request['method']
+        params = request.get('params')
+        if params is None:
+            params = {}
+        elif not isinstance(params, dict):
+            self._fail(request_id, INVALID_PARAMS, "Invalid params: expected an object")
+            return
+
+        if method == 'cancel':
+            self._send_result(request_id, self._cancel(params.get('id')))
+            return
+
+        if method == 'shutdown':
+            self._running = False
+            self._send_result(request_id, True)
+            return
+
+        handler = self._methods.get(method)
+        if handler is None:
+            self._fail(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+            return
+
+        cancelled = threading.Event()
+        future = self._executor.submit(self._run, request_id, handler, params, cancelled)
+        if request_id is not None:
+            with self._requests_lock:
+                self._requests[request_id] = (future, cancelled)
+
+    def _run(self, request_id: Any, handler: Callable, params: Dict[str, Any],
+             cancelled: threading.Event):
+        """Execute a request on the worker thread and send its response."""
+        try:
+            if cancelled.is_set():
+                raise RequestCancelled()
+            result = handler(params, cancelled)
+        except RequestCancelled:
+            self._fail(request_id, REQUEST_CANCELLED, "Request cancelled")
+        except (InvalidParams, FileNotFoundError) as e:
+            self._fail(request_id, INVALID_PARAMS, str(e))
+        except Exception as e:
+            self._fail(request_id, SERVER_ERROR, f"Error: {e}")
+        else:
+            self._send_result(request_id, result)
+        finally:
+            with self._requests_lock:
+                self._requests.pop(request_id, None)
+
+    def _cancel(self, request_id: Any) -> bool:
+        """
+        Cancel a queued or running request.
+
+        Args:
+            request_id: Identifier of the request to cancel
+
+        Returns:
+            True if the request was still pending or running
+        """
+        with self._requests_lock:
+            entry = self._requests.get(request_id)
+        if entry is None:
+            return False
+
+        future, cancelled = entry
+        cancelled.set()
+        if future.cancel():
+            # Never started: answer on its behalf
+            with self._requests_lock:
+                self._requests.pop(request_id, None)
+            self._send_error(request_id, REQUEST_CANCELLED, "Request cancelled")
+        return True
+
+    def _send_result(self, request_id: Any, result: Any):
+        """Send a success response."""
+        if request_id is not None:
+            self._send({'jsonrpc': '2.0', 'id': request_id, 'result': result})
+
+    def _fail(self, request_id: Any, code: int, message: str):
+        """Send the error response of a request, unless it is a notification."""
+        if request_id is not None:
+            self._send_error(request_id, code, message)
+
+    def _send_error(self, request_id: Any, code: int, message: str):
+        """Send an error response."""
+        self._send({'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}})
+
+    def _send(self, message: Dict[str, Any]):
+        """Write one response line."""
+        line = json.dumps(message, ensure_ascii=False)
+        with self._write_lock:
+            self.stdout.write(line + '\n')
+            self.stdout.flush()
+
+    # Methods
+
+    def _generate(self, params: Dict[str, Any], cancelled: threading.Event) -> Any:
+        """Generate one document, or a list of count documents."""
+        skeleton = self._load_input(params, 'skeleton')
+        swagger_spec = params.get('swagger')
+        if swagger_spec is None and params.get('swagger_path'):
+            swagger_spec = self._load_swagger(params['swagger_path'])
+
+        plan = self._get_plan(skeleton, swagger_spec)
+        count = params.get('count')
+        seed = params.get('seed')
+
+        if count is None:
+            generator = self._get_generator(seed, params.get('pool_size', 0))
+            generator.clear_cache()
+            return self._output(plan.generate(generator), params)
+
+        if not isinstance(count, int) or count < 0:
+            raise InvalidParams("'count' must be a non-negative integer")
+
+        pool_size = params.get('pool_size', DEFAULT_POOL_SIZE)
+        if seed is None:
+            records_iter = self.processor.iter_records(plan, count, self._get_generator(None, pool_size))
+        else:
+            records_iter = self._iter_seeded_records(plan, count, seed, pool_size)
+
+        records = []
+        for record in records_iter:
+            if cancelled.is_set():
+                raise RequestCancelled()
+            records.append(record)
+        return self._output(records, params)
+
+    def _analyze(self, params: Dict[str, Any], cancelled: threading.Event) -> Any:
+        """Analyze a document for sensitive fields."""
+        data = self._load_input(params, 'data')
+        analysis = self._get_anonymizer().build_analysis(data, params.get('wildcard', False),
+                                                         params.get('sample_rate'), params.get('sample_size'),
+                                                         params.get('scan_values', False))
+        return self._output(analysis, params)
+
+    def _anonymize(self, params: Dict[str, Any], cancelled: threading.Event) -> Any:
+        """Anonymize a document."""
+        data = self._load_input(params, 'data')
+        return self._output(self._get_anonymizer().anonymize_json(data), params)
+
+    def _validate(self, params: Dict[str, Any], cancelled: threading.Event) -> Any:
+        """Validate a document against the schemas of a Swagger spec."""
+        data = self._load_input(params, 'data')
+        swagger_spec = params.get('swagger')
+        if swagger_spec is None and params.get('swagger_path'):
+            swagger_spec = self._load_swagger(params['swagger_path'])
+        if swagger_spec is None:
+            raise InvalidParams("Missing parameter 'swagger' or 'swagger_path'")
+
+        report = self._get_validator(swagger_spec).validate(data, params.get('schema'))
+        return self._output(report.to_dict(), params)
+
+    # Warm state helpers
+
+    def _get_generator(self, seed: Optional[int], pool_size: int) -> DataGenerator:
+        """Return the shared generator, reseeded or rebuilt as requested."""
+        if self._generator is None or self._generator.pool_size != pool_size:
+            self._generator = DataGenerator(pool_size=pool_size)
+        if seed is not None:
+            self._generator.set_seed(seed)
+        return self._generator
+
+    def _iter_seeded_records(self, plan: GenerationPlan, count: int, seed: int,
+                             pool_size: int) -> Iterator[Any]:
+        """
+        Generate count records for a seed, shard by shard.
+
+        Seeds each shard like ParallelGenerator does, so a seeded request
+        returns the same records as cli_generate --seed.
+        """
+        key = (seed, pool_size)
+        if self._seeded_generator is None or self._seeded_generator[0] != key:
+            # Pools are seeded from the master seed, as in the workers
+            self._seeded_generator = (key, DataGenerator(seed=0, pool_size=pool_size, pool_seed=seed))
+        generator = self._seeded_generator[1]
+        generator.clear_cache()
+
+        for shard_index, start in enumerate(range(0, count, DEFAULT_SHARD_SIZE)):
+            generator.set_seed(derive_shard_seed(seed, shard_index))
+            yield from self.processor.iter_records(plan, min(DEFAULT_SHARD_SIZE, count - start), generator)
+
+    def _get_anonymizer(self) -> DataAnonymizer:
+        """Return the shared anonymizer, building its pools once."""
+        if self._anonymizer is None:
+            self._anonymizer = DataAnonymizer()
+        return self._anonymizer
+
+    def _get_validator(self, swagger_spec: Dict[str, Any]) -> SchemaValidator:
+        """Return the validator of a spec, keeping its compiled schemas."""
+        entry = self._validators.get(id(swagger_spec))
+        if entry is not None and entry[0] is swagger_spec:
+            self._validators.move_to_end(id(swagger_spec))
+            return entry[1]
+
+        validator = SchemaValidator(SwaggerParser.for_spec(swagger_spec))
+        self._validators[id(swagger_spec)] = (swagger_spec, validator)
+        if len(self._validators) > PLAN_CACHE_SIZE:
+            self._validators.popitem(last=False)
+        return validator
+
+    def _get_plan(self, skeleton: Any, swagger_spec: Optional[Dict[str, Any]]) -> GenerationPlan:
+        """Return the compiled plan of a skeleton, compiling it on first use."""
+        # Specs are matched by identity: the ones loaded from swagger_path stay
+        # the same object while their file is unchanged (see _load_swagger)
+        key = (json.dumps(skeleton), id(swagger_spec))
+        entry = self._plans.get(key)
+        if entry is not None and entry[0] is swagger_spec:
+            self._plans.move_to_end(key)
+            return entry[1]
+
+        plan = self.processor.compile(skeleton, swagger_spec)
+        # The spec is kept so that its id stays unique
+        self._plans[key] = (swagger_spec, plan)
+        if len(self._plans) > PLAN_CACHE_SIZE:
+            self._plans.popitem(last=False)
+        return plan
+
+    def _load_swagger(self, path: str) -> Dict[str, Any]:
+        """Load a Swagger file, reusing the parsed spec while the file is unchanged."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"The Swagger file '{path}' does not exist.")
+
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._specs.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        spec = SwaggerParser().load_swagger(path, self._spec_cache)
+        self._specs[path] = (mtime, spec)
+        return spec
+
+    def _load_input(self, params: Dict[str, Any], name: str) -> Any:
+        """Read an inline JSON parameter or the file given by '<name>_path'."""
+        if name in params:
+            return params[name]
+
+        path = params.get(f"{name}_path")
+        if not path:
+            raise InvalidParams(f"Missing parameter '{name}' or '{name}_path'")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"The file '{path}' does not exist.")
+
+        return load_json_file(path)
+
+    def _output(self, result: Any, params: Dict[str, Any]) -> Any:
+        """Return a result inline, or write it to 'output_path' when given."""
+        output_path = params.get('output_path')
+        if not output_path:
+            return result
+
+        # Compressed when the path ends in .gz, .bz2 or .xz
+        with open_output(output_path) as f:
+            dump_json(result, f, 2 if params.get('pretty') else None)
+        return {'output_path': output_path}
+
+
+def serve(stdin: TextIO = None, stdout: TextIO = None):
+    """
+    Run the backend server until shutdown or end of input.
+
+    Args:
+        stdin: Stream to read requests from (default: sys.stdin)
+        stdout: Stream to write responses to (default: sys.stdout)
+    """
+    BackendServer(stdin, stdout).serve_forever()
@@ -0,0 +1,299 @@
+"""
+Batch processing module.
+Generates, anonymizes or analyzes many files in one run, reusing one
+DataGenerator or DataAnonymizer and one parsed Swagger spec for all of
+them, so that interpreter startup, Faker and the anonymization pools are
+paid once per batch instead of once per file.
+
+Files can also be processed on a process pool; each worker builds its own
+objects once and reuses them for every file it gets.
+
+Inputs are given as a directory (its *.json files, or *.ndjson files for
+NDJSON anonymization, compressed or not), a glob pattern, or a
+manifest: a text file listing one path per line, where blank lines and
+lines starting with # are ignored and relative paths are resolved from
+the manifest's directory.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from compressed_io import COMPRESSED_SUFFIXES, open_input, strip_compression_suffix
+from json_input import load_file as load_json_file
+from json_output import dump as dump_json, open_output, write_records
+
+
+MODES = ('generate', 'anonymize', 'analyze')
+
+# Characters making an input a glob pattern rather than a path
+_GLOB_CHARS = frozenset('*?[')
+
+# State built once per worker process by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def expand_inputs(source: str, suffixes: Tuple[str, ...] = ('.json',)) -> List[str]:
+    """
+    List the files of a batch.
+
+    Args:
+        source: Directory, glob pattern or manifest file
+        suffixes: Extensions of the files taken from a directory
+
+    Returns:
+        File paths, sorted for directories and patterns, in manifest order otherwise
+
+    Raises:
+        FileNotFoundError: If the source does not exist or a listed file is missing
+    """
+    if os.path.isdir(source):
+        suffixes += tuple(suffix + compressed for suffix in suffixes for compressed in COMPRESSED_SUFFIXES)
+        paths = [os.path.join(source, name) for name in sorted(os.listdir(source))
+                 if name.endswith(suffixes)]
+        return [path for path in paths if os.path.isfile(path)]
+
+    if _GLOB_CHARS.intersection(source):
+        return sorted(path for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+
+    if not os.path.isfile(source):
+        raise FileNotFoundError(f"The batch input '{source}' does not exist.")
+
+    base = os.path.dirname(source)
+    paths = []
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            path = line if os.path.isabs(line) else os.path.join(base, line)
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"The file '{line}' listed in '{source}' does not exist.")
+            paths.append(path)
+    return paths
+
+
+def plan_outputs(inputs: List[str], output_dir: Optional[str],
+                 extension: Optional[str] = '.json') -> List[Tuple[str, Optional[str]]]:
+    """
+    Pair each input with its output path.
+
+    Outputs mirror the layout of the inputs under output_dir, so that
+    files with the same name in different directories do not collide.
+
+    Args:
+        inputs: Input file paths
+        output_dir: Output directory (None to keep results in the summary)
+        extension: Extension of the output files, replacing the input's (None to
+            keep it); compressed inputs give outputs with the same compression
+
+    Returns:
+        (input path, output path or None) pairs
+    """
+    if output_dir is None:
+        return [(path, None) for path in inputs]
+    if not inputs:
+        return []
+
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in inputs])
+    jobs = []
+    for path in inputs:
+        relative = os.path.relpath(os.path.abspath(path), base)
+        if extension is not None:
+            stripped = strip_compression_suffix(relative)
+            relative = os.path.splitext(stripped)[0] + extension + relative[len(stripped):]
+        jobs.append((path, os.path.join(output_dir, relative)))
+    return jobs
+
+
+class _FileProcessor:
+    """Objects of a batch reused across its files."""
+
+    def __init__(self, mode: str, options: Dict[str, Any]):
+        self.mode = mode
+        self.options = options
+        self._generator = None
+        self._anonymizer = None
+        self._processor = None
+        self._swagger_spec = None
+
+        # Built here, so that per-file timings only cover the file itself
+        if mode == 'generate':
+            self._setup_generation()
+        else:
+            self._setup_anonymizer()
+
+    def _setup_generation(self):
+        from data_generator import DataGenerator, DEFAULT_POOL_SIZE
+        from json_processor import JSONProcessor
+
+        options = self.options
+        pool_size = options.get('pool_size')
+        if pool_size is None:
+            pool_size = DEFAULT_POOL_SIZE if options.get('count') is not None else 0
+
+        # Pools seeded once for the batch instead of refilled on every reseed
+        self._generator = DataGenerator(pool_size=pool_size, pool_seed=options.get('seed'))
+        self._processor = JSONProcessor()
+
+        if options.get('swagger_path'):
+            from spec_cache import SpecCache
+            from swagger_parser import SwaggerParser
+
+            cache = None if options.get('no_spec_cache') else SpecCache()
+            self._swagger_spec = SwaggerParser().load_swagger(options['swagger_path'], cache)
+
+    def _setup_anonymizer(self):
+        from data_anonymizer import DataAnonymizer
+
+        options = self.options
+        kwargs = {'pseudonym_key': options.get('pseudonym_key')}
+        if options.get('pool_size') is not None:
+            kwargs['pool_size'] = options['pool_size']
+        self._anonymizer = DataAnonymizer(**kwargs)
+        if self.mode == 'anonymize':
+            # Filled now rather than during the first file
+            self._anonymizer.build_pools()
+
+    def process(self, input_path: str, output_path: Optional[str]) -> Dict[str, Any]:
+        """
+        Process one file.
+
+        Returns:
+            Result entry of the file for the summary
+        """
+        started_at = time.perf_counter()
+        result: Dict[str, Any] = {'input': input_path, 'output': output_path}
+        try:
+            if output_path is not None:
+                if os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+                    raise ValueError("The output would overwrite the input.")
+                os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            result.update(getattr(self, f'_{self.mode}')(input_path, output_path))
+            result['status'] = 'ok'
+        except Exception as e:
+            result['status'] = 'error'
+            result['error'] = str(e)
+        result['seconds'] = round(time.perf_counter() - started_at, 6)
+        return result
+
+    def _generate(self, input_path: str, output_path: str) -> Dict[str, Any]:
+        options = self.options
+        generator = self._generator
+        if options.get('seed') is not None:
+            # Every file gets the output of a run seeded on its own
+            generator.set_seed(options['seed'])
+
+        plan = self._processor.compile(load_json_file(input_path), self._swagger_spec)
+        indent = 2 if options.get('pretty') else None
+        count = options.get('count')
+
+        with open_output(output_path) as f:
+            if count is None:
+                generator.clear_cache()
+                dump_json(plan.generate(generator), f, indent)
+                return {}
+
+            records = self._processor.iter_records(plan, count, generator)
+            return {'records': write_records(records, f, options.get('pretty'), options.get('ndjson'))}
+
+    def _anonymize(self, input_path: str, output_path: str) -> Dict[str, Any]:
+        options = self.options
+        if options.get('ndjson'):
+            with open_input(input_path) as source, open_output(output_path) as target:
+                return {'records': self._anonymizer.anonymize_ndjson(source, target)}
+
+        anonymized = self._anonymizer.anonymize_json(load_json_file(input_path))
+        with open_output(output_path) as f:
+            dump_json(anonymized, f, 2 if options.get('pretty') else None)
+        return {}
+
+    def _analyze(self, input_path: str, output_path: Optional[str]) -> Dict[str, Any]:
+        options = self.options
+        analysis = self._anonymizer.build_analysis(load_json_file(input_path), options.get('wildcard_paths'),
+                                                   options.get('sample_rate'), options.get('sample_size'),
+                                                   options.get('scan_values'))
+        if output_path is None:
+            return {'analysis': analysis}
+
+        with open_output(output_path) as f:
+            dump_json(analysis, f, 2 if options.get('pretty') else None)
+        return {'sensitive_fields': analysis['total_fields']}
+
+
+def _init_worker(mode: str, options: Dict[str, Any]):
+    """Build the objects of a worker process once."""
+    _worker_state['processor'] = _FileProcessor(mode, options)
+
+
+def _process_file(job: Tuple[str, Optional[str]]) -> Dict[str, Any]:
+    """Process one file in a worker process."""
+    return _worker_state['processor'].process(*job)
+
+
+class BatchRunner:
+    """Runs one mode over many files."""
+
+    def __init__(self, mode: str, options: Optional[Dict[str, Any]] = None, workers: Optional[int] = None):
+        """
+        Initialize the batch runner.
+
+        Args:
+            mode: 'generate', 'anonymize' or 'analyze'
+            options: CLI options of the mode (swagger_path, count, seed, pool_size,
+                pretty, ndjson, pseudonym_key, wildcard_paths, sample_rate,
+                sample_size, scan_values, no_spec_cache)
+            workers: Number of worker processes (None or 1 to process files in this process)
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown batch mode '{mode}'")
+
+        self.mode = mode
+        self.options = options or {}
+        self.workers = max(1, workers or 1)
+
+    def iter_results(self, jobs: List[Tuple[str, Optional[str]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Process files and yield their result entries in job order.
+
+        Args:
+            jobs: (input path, output path or None) pairs, see plan_outputs
+
+        Yields:
+            Result entry of each file
+        """
+        if self.workers == 1 or len(jobs) <= 1:
+            processor = _FileProcessor(self.mode, self.options)
+            for job in jobs:
+                yield processor.process(*job)
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs)), initializer=_init_worker,
+                                 initargs=(self.mode, self.options)) as executor:
+            yield from executor.map(_process_file, jobs)
+
+    def run(self, jobs: List[Tuple[str, Optional[str]]]) -> Dict[str, Any]:
+        """
+        Process files and build the batch summary.
+
+        Args:
+            jobs: (input path, output path or None) pairs, see plan_outputs
+
+        Returns:
+            Summary with per-file results and timings
+        """
+        started_at = time.perf_counter()
+        results = list(self.iter_results(jobs))
+        failed = sum(1 for result in results if result['status'] != 'ok')
+
+        return {
+            'mode': self.mode,
+            'files': len(results),
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'workers': self.workers,
+            'seconds': round(time.perf_counter() - started_at, 6),
+            'results': results,
+        }
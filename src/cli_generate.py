@@ -3,19 +3,205 @@
 Command line interface for JSONnymous data generation.
 """
 
+import time
+
+_CLI_START = time.perf_counter()
+
 import argparse
 import json
 import os
 import sys
-from typing import Dict, Any
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, Iterable, Iterator, Optional, TYPE_CHECKING
+
+from json_output import dump as dump_json, open_output, write_encoded_records, write_records
+
+# Modules are imported by the mode that needs them (Faker and YAML are slow
+# to import), see _timed_import
+if TYPE_CHECKING:
+    from data_anonymizer import DataAnonymizer
+    from run_stats import RunStats
+    from schema_validator import SchemaValidator, ValidationReport
+    from swagger_parser import SwaggerParser
+
+# Environment variable holding the default --pseudonym-key
+PSEUDONYM_KEY_ENV = 'JSON_TOOLS_PSEUDONYM_KEY'
+
+# Seconds spent importing each backend module, for --import-profile
+_import_times: Dict[str, float] = {}
+
+
+@contextmanager
+def _timed_import(name: str) -> Iterator[None]:
+    """Time the imports done in the block under the given name."""
+    start = time.perf_counter()
+    yield
+    _import_times[name] = _import_times.get(name, 0.0) + time.perf_counter() - start
+
+
+def print_import_profile(mode: str, ready_at: float, work_started_at: float):
+    """
+    Print the startup timing report to stderr.
+    
+    Args:
+        mode: CLI mode that ran
+        ready_at: perf_counter value when argument parsing started
+        work_started_at: perf_counter value when the mode's imports were done
+    """
+    now = time.perf_counter()
+    rows = [("cli module imports", ready_at - _CLI_START)]
+    rows += [(f"import {name}", seconds) for name, seconds in _import_times.items()]
+    rows += [("time to first work", work_started_at - _CLI_START), ("total", now - _CLI_START)]
+    
+    print(f"Startup profile (mode: {mode})", file=sys.stderr)
+    for label, seconds in rows:
+        print(f"  {label:<24}{seconds * 1000:8.1f} ms", file=sys.stderr)
+
+
+def _phase(stats: Optional['RunStats'], name: str):
+    """Time a block as a --stats phase (no-op without statistics)."""
+    return stats.phase(name) if stats is not None else nullcontext()
+
+
+def print_stats(stats: 'RunStats', stats_file: str):
+    """
+    Output the --stats report.
+    
+    Args:
+        stats: Statistics of the run
+        stats_file: JSON file to write the report to ("" for a text report on stderr)
+    """
+    if stats_file:
+        with open(stats_file, 'w', encoding='utf-8') as f:
+            json.dump(stats.to_dict(), f, indent=2)
+        print(f"Run statistics saved to {stats_file}", file=sys.stderr)
+    else:
+        print(stats.format_text(), file=sys.stderr)
+
+
+def load_swagger_parser(swagger_path: str, no_spec_cache: bool = False,
+                        stats: Optional['RunStats'] = None) -> 'SwaggerParser':
+    """
+    Load a Swagger file into a parser.
+    
+    Args:
+        swagger_path: Path to the Swagger/OpenAPI file
+        no_spec_cache: Parse the file without the on-disk spec cache
+        stats: Run statistics to record the load into (optional)
+        
+    Returns:
+        Parser holding the loaded specification
+    """
+    if not os.path.exists(swagger_path):
+        raise FileNotFoundError(f"The Swagger file '{swagger_path}' does not exist.")
+    
+    with _timed_import('swagger_parser'):
+        from swagger_parser import SwaggerParser
+        from spec_cache import SpecCache
+    
+    cache = None if no_spec_cache else SpecCache()
+    if stats is not None and cache is not None:
+        stats.instrument_spec_cache(cache)
+    
+    # YAML is only imported on a spec cache miss
+    parser = SwaggerParser()
+    with _phase(stats, 'load swagger'):
+        parser.load_swagger(swagger_path, cache)
+    return parser
+
+
+def _validated(records: Iterable[Any], validator: 'SchemaValidator', schema_name: Optional[str],
+               report: 'ValidationReport') -> Iterator[Any]:
+    """Pass records through, validating each one into the report."""
+    for record in records:
+        validator.validate(record, schema_name, report)
+        yield record
+
+
+def _validated_encoded(encoded_records: Iterable[str], validator: 'SchemaValidator',
+                       schema_name: Optional[str], report: 'ValidationReport') -> Iterator[str]:
+    """Pass encoded records through, validating each one into the report."""
+    for encoded in encoded_records:
+        validator.validate(json.loads(encoded), schema_name, report)
+        yield encoded
+
+
+def print_validation_report(report: 'ValidationReport'):
+    """Print a validation report of generated data to stderr."""
+    print(json.dumps(report.to_dict(), ensure_ascii=False), file=sys.stderr)
 
-from data_generator import DataGenerator
-from data_anonymizer import DataAnonymizer
-from json_processor import JSONProcessor
-from swagger_parser import SwaggerParser
+
+def run_batch(args: argparse.Namespace, mode: str) -> int:
+    """
+    Run a mode over every file of a directory, glob pattern or manifest.
+    
+    The summary (per-file status and timings) goes to --output or stdout,
+    and each file's result to the same relative path under --output-dir.
+    
+    Args:
+        args: Parsed CLI arguments
+        mode: 'generate', 'anonymize' or 'analyze'
+        
+    Returns:
+        Number of files that failed
+    """
+    if mode not in ('generate', 'anonymize', 'analyze'):
+        raise ValueError("The --batch option works with --skeleton, --anonymize or --analyze.")
+    if args.stream or args.validate is not None:
+        raise ValueError("The --batch option cannot be combined with --stream or --validate.")
+    if args.output_dir is None and mode != 'analyze':
+        raise ValueError("The --output-dir option is required in batch mode.")
+    if args.count is not None and args.count < 0:
+        raise ValueError("The --count option must be a non-negative integer.")
+    if args.swagger and not os.path.exists(args.swagger):
+        raise FileNotFoundError(f"The Swagger file '{args.swagger}' does not exist.")
+    
+    with _timed_import('batch_runner'):
+        from batch_runner import BatchRunner, expand_inputs, plan_outputs
+    
+    source = {'generate': args.skeleton, 'anonymize': args.anonymize, 'analyze': args.analyze}[mode]
+    if not source:
+        raise ValueError("The --skeleton option is required for data generation.")
+    
+    ndjson_input = mode == 'anonymize' and args.ndjson
+    inputs = expand_inputs(source, ('.ndjson', '.jsonl') if ndjson_input else ('.json',))
+    if not inputs:
+        raise FileNotFoundError(f"No input file found for '{source}'.")
+    
+    if mode == 'anonymize':
+        # Anonymized files keep their name
+        extension = None
+    else:
+        extension = '.ndjson' if mode == 'generate' and args.ndjson and args.count is not None else '.json'
+    jobs = plan_outputs(inputs, args.output_dir, extension)
+    
+    options = {
+        'swagger_path': args.swagger,
+        'no_spec_cache': args.no_spec_cache,
+        'count': args.count,
+        'seed': args.seed,
+        'pool_size': args.pool_size,
+        'pretty': args.pretty,
+        'ndjson': args.ndjson,
+        'pseudonym_key': args.pseudonym_key or os.environ.get(PSEUDONYM_KEY_ENV) or None,
+        'wildcard_paths': args.wildcard_paths,
+        'sample_rate': args.sample_rate,
+        'sample_size': args.sample_size,
+        'scan_values': args.scan_values,
+    }
+    summary = BatchRunner(mode, options, args.workers).run(jobs)
+    
+    with open_output(args.output) as f:
+        dump_json(summary, f, 2 if args.pretty else None)
+    
+    print(f"{summary['succeeded']} of {summary['files']} file(s) processed in {summary['seconds']:.2f}s"
+          + (f", {summary['failed']} failed" if summary['failed'] else ""), file=sys.stderr)
+    return summary['failed']
 
 
 def main():
+    ready_at = time.perf_counter()
+    
     parser = argparse.ArgumentParser(
         description="Generate realistic JSON data from a skeleton and optional Swagger schema"
     )
@@ -23,36 +209,198 @@ def main():
     # Main arguments
     parser.add_argument('--skeleton', '-s', type=str, help='Path to JSON skeleton file')
     parser.add_argument('--swagger', '-w', type=str, help='Path to Swagger/OpenAPI schema file')
-    parser.add_argument('--output', '-o', type=str, help='Output file path (default: stdout)')
+    parser.add_argument('--no-spec-cache', action='store_true',
+                        help='Parse the Swagger file without the on-disk spec cache '
+                             '(location: $JSON_TOOLS_CACHE_DIR)')
+    parser.add_argument('--output', '-o', type=str,
+                        help='Output file path (default: stdout); .gz, .bz2 and .xz files are compressed')
     parser.add_argument('--pretty', '-p', action='store_true', help='Pretty print JSON output')
+    parser.add_argument('--batch', action='store_true',
+                        help='Treat the --skeleton, --anonymize or --analyze path as a directory, a glob pattern '
+                             'or a manifest (one path per line) and process every file in one run; --output '
+                             'receives the summary with per-file timings')
+    parser.add_argument('--output-dir', type=str,
+                        help='With --batch, directory receiving the result of each file under its relative path '
+                             '(optional with --analyze: results are embedded in the summary)')
+    
+    # Bulk generation
+    parser.add_argument('--count', '-n', type=int, help='Number of records to generate (streamed as a JSON array)')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Write bulk records as newline-delimited JSON; with --anonymize, '
+                             'read and write one record per line')
+    parser.add_argument('--seed', type=int, help='Master seed for reproducible generation')
+    parser.add_argument('--workers', type=int,
+                        help='Number of worker processes for bulk generation or anonymization; '
+                             'with --batch, files are processed in parallel')
+    parser.add_argument('--shard-size', type=int,
+                        help='Records per shard in seeded/parallel bulk generation (default: 1000)')
+    parser.add_argument('--pool-size', type=int,
+                        help='Size of the Faker value pools, 0 to disable (default: 1000 with --count, 0 otherwise; '
+                             '100 for anonymization)')
     
     # Anonymization mode
     parser.add_argument('--anonymize', '-a', type=str, help='Path to JSON file to anonymize')
     parser.add_argument('--analyze', type=str, help='Path to JSON file to analyze for sensitive fields')
+    parser.add_argument('--wildcard-paths', action='store_true',
+                        help='With --analyze, report paths like users[*].email with occurrence counts')
+    parser.add_argument('--sample-rate', type=float,
+                        help='With --analyze, fraction of the items of each array to analyze (implies --wildcard-paths)')
+    parser.add_argument('--sample-size', type=int,
+                        help='With --analyze, maximum items analyzed per array (implies --wildcard-paths)')
+    parser.add_argument('--scan-values', action='store_true',
+                        help='With --analyze, also detect e-mails, phones, IBANs, cards, IPs and dates in values, '
+                             'whatever their key, with counts per detector')
+    parser.add_argument('--pseudonym-key', type=str,
+                        help='Secret key: each value is always replaced by the same fake value, '
+                             f'across records and runs (default: ${PSEUDONYM_KEY_ENV})')
+    parser.add_argument('--chunk-size', type=int,
+                        help='Records per chunk in parallel anonymization (default: 1000)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Anonymize while reading, in constant memory (for files larger than memory)')
+    
+    # Validation
+    parser.add_argument('--validate', type=str, nargs='?', const='',
+                        help='Validate a JSON (or, with --ndjson, NDJSON) file against the --swagger schemas; '
+                             'without a file, validate the generated data and report to stderr')
+    parser.add_argument('--schema', type=str,
+                        help='With --validate, schema of each document (default: match each object '
+                             'to the closest schema)')
+    
+    # Diagnostics
+    parser.add_argument('--import-profile', action='store_true',
+                        help='Print startup and import timings to stderr')
+    parser.add_argument('--stats', '--profile', dest='stats', type=str, nargs='?', const='',
+                        help='Report time per phase, generated values, Faker calls, cache hit rates and '
+                             'peak memory, to stderr or to the given JSON file')
+    parser.add_argument('--cprofile', type=str,
+                        help='Write a cProfile dump of the run to this file (see pstats)')
     
     args = parser.parse_args()
     
+    if args.anonymize:
+        mode = 'anonymize'
+    elif args.analyze:
+        mode = 'analyze'
+    elif args.validate:
+        mode = 'validate'
+    else:
+        mode = 'generate'
+    work_started_at = ready_at
+    
+    stats = None
+    if args.stats is not None:
+        from run_stats import RunStats
+        stats = RunStats()
+    
+    profiler = None
+    if args.cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    
     try:
+        # Batch mode: one run over many files
+        if args.batch:
+            if run_batch(args, mode):
+                sys.exit(1)
+            return
+        
         # Anonymization mode
         if args.anonymize:
             if not os.path.exists(args.anonymize):
                 raise FileNotFoundError(f"The file to anonymize '{args.anonymize}' does not exist.")
             
+            with _timed_import('data_anonymizer'):
+                from data_anonymizer import DataAnonymizer
+            with _timed_import('json_input'):
+                from compressed_io import detect_compression, open_input
+                from json_input import MappedInput, load_file as load_json_file
+            with _timed_import('faker'):
+                import faker  # noqa: F401 - used by the anonymization pools
+            work_started_at = time.perf_counter()
+            
+            # Consistent pseudonymization when a key is given
+            pseudonym_key = args.pseudonym_key or os.environ.get(PSEUDONYM_KEY_ENV) or None
+            if args.pool_size is not None:
+                anonymizer = DataAnonymizer(pseudonym_key=pseudonym_key, pool_size=args.pool_size)
+            else:
+                anonymizer = DataAnonymizer(pseudonym_key=pseudonym_key)
+            if stats is not None:
+                stats.instrument_faker(anonymizer)
+            
+            # Parallel: chunks of records of a top-level array or NDJSON file
+            if args.workers is not None:
+                with _timed_import('parallel'):
+                    from parallel_anonymizer import ParallelAnonymizer, DEFAULT_CHUNK_SIZE
+                work_started_at = time.perf_counter()
+                
+                engine = ParallelAnonymizer(workers=args.workers,
+                                            chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE,
+                                            anonymizer=anonymizer)
+                
+                def write(stream):
+                    if args.ndjson:
+                        with open_input(args.anonymize) as source:
+                            lines = (line for line in source if line.strip())
+                            write_encoded_records(engine.iter_encoded(lines, encoded=True), stream, ndjson=True)
+                        return
+                    
+                    indent = 2 if args.pretty else None
+                    if detect_compression(args.anonymize):
+                        # Compressed files cannot be mapped: records are parsed here
+                        from json_stream import iter_array_items, peek_char
+                        with open_input(args.anonymize) as source:
+                            is_array = peek_char(source) == '['
+                            if is_array:
+                                encoded = engine.iter_encoded(iter_array_items(source), indent)
+                                write_encoded_records(encoded, stream, args.pretty)
+                    else:
+                        with MappedInput(args.anonymize) as mapped:
+                            is_array = mapped.first_char() == '['
+                            if is_array:
+                                # Workers parse their records from their own mapping of the file
+                                encoded = engine.iter_encoded_ranges(args.anonymize, mapped.iter_item_ranges(),
+                                                                     indent=indent)
+                                write_encoded_records(encoded, stream, args.pretty)
+                    
+                    if not is_array:
+                        # A single document has no records to split
+                        with open_input(args.anonymize) as source:
+                            anonymizer.anonymize_stream(source, stream, args.pretty)
+            
+            # Streaming: anonymize while reading, in constant memory
+            elif args.stream or args.ndjson:
+                def write(stream):
+                    with open_input(args.anonymize) as source:
+                        if args.ndjson:
+                            anonymizer.anonymize_ndjson(source, stream)
+                        else:
+                            anonymizer.anonymize_stream(source, stream, args.pretty)
+            
+            if args.workers is not None or args.stream or args.ndjson:
+                # Reading, anonymization and writing are interleaved
+                with _phase(stats, 'anonymize'):
+                    with open_output(args.output) as f:
+                        write(f)
+                    if args.output:
+                        print(f"Anonymized data saved to {args.output}", file=sys.stderr)
+                
+                return
+            
             # Load the JSON file to anonymize
-            with open(args.anonymize, 'r', encoding='utf-8') as f:
-                data_to_anonymize = json.load(f)
+            with _phase(stats, 'load input'):
+                data_to_anonymize = load_json_file(args.anonymize)
             
             # Anonymize the data
-            anonymizer = DataAnonymizer()
-            anonymized_data = anonymizer.anonymize_json(data_to_anonymize)
+            with _phase(stats, 'anonymize'):
+                anonymized_data = anonymizer.anonymize_json(data_to_anonymize)
             
             # Output the anonymized data
-            if args.output:
-                with open(args.output, 'w', encoding='utf-8') as f:
-                    json.dump(anonymized_data, f, indent=2 if args.pretty else None, ensure_ascii=False)
-                print(f"Anonymized data saved to {args.output}", file=sys.stderr)
-            else:
-                json.dump(anonymized_data, sys.stdout, indent=2 if args.pretty else None, ensure_ascii=False)
+            with _phase(stats, 'serialize'):
+                with open_output(args.output) as f:
+                    dump_json(anonymized_data, f, 2 if args.pretty else None)
+                if args.output:
+                    print(f"Anonymized data saved to {args.output}", file=sys.stderr)
             
             return
         
@@ -61,27 +409,61 @@ def main():
             if not os.path.exists(args.analyze):
                 raise FileNotFoundError(f"The file to analyze '{args.analyze}' does not exist.")
             
+            with _timed_import('data_anonymizer'):
+                from data_anonymizer import DataAnonymizer
+            with _timed_import('json_input'):
+                from json_input import load_file as load_json_file
+            work_started_at = time.perf_counter()
+            
             # Load the JSON file to analyze
-            with open(args.analyze, 'r', encoding='utf-8') as f:
-                data_to_analyze = json.load(f)
+            with _phase(stats, 'load input'):
+                data_to_analyze = load_json_file(args.analyze)
             
             # Analyze sensitive fields
-            anonymizer = DataAnonymizer()
-            sensitive_fields = anonymizer.get_sensitive_fields(data_to_analyze)
+            with _phase(stats, 'analyze'):
+                analysis_result = DataAnonymizer().build_analysis(data_to_analyze, args.wildcard_paths,
+                                                                  args.sample_rate, args.sample_size,
+                                                                  args.scan_values)
             
-            # Output the analysis
-            analysis_result = {
-                "sensitive_fields": sensitive_fields,
-                "total_fields": len(sensitive_fields),
-                "message": f"Found {len(sensitive_fields)} sensitive field(s)"
-            }
+            with _phase(stats, 'serialize'):
+                with open_output(args.output) as f:
+                    dump_json(analysis_result, f, 2 if args.pretty else None)
+                if args.output:
+                    print(f"Analysis saved to {args.output}", file=sys.stderr)
             
-            if args.output:
-                with open(args.output, 'w', encoding='utf-8') as f:
-                    json.dump(analysis_result, f, indent=2 if args.pretty else None, ensure_ascii=False)
-                print(f"Analysis saved to {args.output}", file=sys.stderr)
-            else:
-                json.dump(analysis_result, sys.stdout, indent=2 if args.pretty else None, ensure_ascii=False)
+            return
+        
+        # Validation mode
+        if args.validate:
+            if not os.path.exists(args.validate):
+                raise FileNotFoundError(f"The file to validate '{args.validate}' does not exist.")
+            if not args.swagger:
+                raise ValueError("The --swagger option is required for validation.")
+            
+            with _timed_import('schema_validator'):
+                from schema_validator import SchemaValidator
+                from json_stream import iter_array_items, peek_char
+            with _timed_import('json_input'):
+                from compressed_io import open_input
+            validator = SchemaValidator(load_swagger_parser(args.swagger, args.no_spec_cache, stats))
+            work_started_at = time.perf_counter()
+            
+            # Parsing and validation are interleaved
+            with _phase(stats, 'validate'), open_input(args.validate) as source:
+                if args.ndjson:
+                    report = validator.validate_ndjson(source, args.schema)
+                elif peek_char(source) == '[':
+                    # Top-level array: one document per item, read one at a time
+                    report = validator.validate_records(iter_array_items(source), args.schema)
+                else:
+                    report = validator.validate(json.load(source), args.schema)
+            
+            validation_result = report.to_dict()
+            with _phase(stats, 'serialize'):
+                with open_output(args.output) as f:
+                    dump_json(validation_result, f, 2 if args.pretty else None)
+                if args.output:
+                    print(f"Validation report saved to {args.output}", file=sys.stderr)
             
             return
         
@@ -93,37 +475,138 @@ def main():
         if not os.path.exists(args.skeleton):
             raise FileNotFoundError(f"The skeleton file '{args.skeleton}' does not exist.")
         
+        with _timed_import('data_generator'):
+            from data_generator import DataGenerator, DEFAULT_POOL_SIZE
+        with _timed_import('faker'):
+            import faker  # noqa: F401 - used by DataGenerator
+        with _timed_import('json_processor'):
+            from json_processor import JSONProcessor
+        with _timed_import('json_input'):
+            from compressed_io import open_input
+        
         # Load JSON skeleton
-        with open(args.skeleton, 'r', encoding='utf-8') as f:
-            skeleton = json.load(f)
+        with _phase(stats, 'load input'):
+            with open_input(args.skeleton) as f:
+                skeleton = json.load(f)
         
         # Load Swagger schema if provided
         swagger_schema = None
         if args.swagger:
-            if not os.path.exists(args.swagger):
-                raise FileNotFoundError(f"The Swagger file '{args.swagger}' does not exist.")
+            parser = load_swagger_parser(args.swagger, args.no_spec_cache, stats)
+            swagger_schema = parser.swagger_spec
+        
+        # Validation of the generated data, reported to stderr
+        validator = report = None
+        if args.validate is not None:
+            if not args.swagger:
+                raise ValueError("The --swagger option is required for validation.")
             
-            parser = SwaggerParser()
-            swagger_schema = parser.load_swagger(args.swagger)
+            with _timed_import('schema_validator'):
+                from schema_validator import SchemaValidator, ValidationReport
+            validator = SchemaValidator(parser)
+            report = ValidationReport()
+        
+        # Bulk mode: stream records instead of building one document
+        if args.count is not None:
+            if args.count < 0:
+                raise ValueError("The --count option must be a non-negative integer.")
+            
+            pool_size = args.pool_size if args.pool_size is not None else DEFAULT_POOL_SIZE
+            
+            if args.seed is not None or args.workers is not None:
+                with _timed_import('parallel'):
+                    from parallel_generator import ParallelGenerator, DEFAULT_SEED, DEFAULT_SHARD_SIZE
+                work_started_at = time.perf_counter()
+                
+                # Sharded generation: identical output for a seed whatever the worker count
+                engine = ParallelGenerator(
+                    skeleton, swagger_schema,
+                    seed=args.seed if args.seed is not None else DEFAULT_SEED,
+                    workers=args.workers, shard_size=args.shard_size or DEFAULT_SHARD_SIZE,
+                    pool_size=pool_size, stats=stats
+                )
+                indent = 2 if args.pretty and not args.ndjson else None
+                
+                # Records are generated and encoded in the workers
+                encoded = engine.iter_encoded(args.count, indent)
+                if stats is not None:
+                    encoded = stats.timed_iter(encoded, 'generate')
+                if validator is not None:
+                    encoded = _validated_encoded(encoded, validator, args.schema, report)
+                
+                def write(stream):
+                    return write_encoded_records(encoded, stream, args.pretty, args.ndjson)
+            else:
+                with _phase(stats, 'setup'):
+                    generator = DataGenerator(pool_size=pool_size)
+                work_started_at = time.perf_counter()
+                if stats is not None:
+                    stats.instrument_generator(generator)
+                
+                processor = JSONProcessor()
+                with _phase(stats, 'compile'):
+                    plan = processor.compile(skeleton, swagger_schema)
+                records = processor.iter_records(plan, args.count, generator)
+                if stats is not None:
+                    records = stats.timed_iter(records, 'generate')
+                if validator is not None:
+                    records = _validated(records, validator, args.schema, report)
+                
+                def write(stream):
+                    return write_records(records, stream, args.pretty, args.ndjson)
+            
+            # Time not spent generating records goes to their serialization
+            with _phase(stats, 'serialize'):
+                with open_output(args.output) as f:
+                    written = write(f)
+                if args.output:
+                    print(f"{written} generated record(s) saved to {args.output}", file=sys.stderr)
+            
+            if report is not None:
+                print_validation_report(report)
+            return
         
         # Initialize data generator
-        generator = DataGenerator()
+        with _phase(stats, 'setup'):
+            generator = DataGenerator(seed=args.seed, pool_size=args.pool_size or 0)
+        work_started_at = time.perf_counter()
+        if stats is not None:
+            stats.instrument_generator(generator)
         
         # Process JSON with processor
         processor = JSONProcessor()
-        result = processor.process_json(skeleton, swagger_schema, generator)
+        
+        with _phase(stats, 'compile'):
+            plan = processor.compile(skeleton, swagger_schema)
+        with _phase(stats, 'generate'):
+            result = plan.generate(generator)
+        if validator is not None:
+            with _phase(stats, 'validate'):
+                validator.validate(result, args.schema, report)
         
         # Output result
-        if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2 if args.pretty else None, ensure_ascii=False)
-            print(f"Generated data saved to {args.output}", file=sys.stderr)
-        else:
-            json.dump(result, sys.stdout, indent=2 if args.pretty else None, ensure_ascii=False)
+        with _phase(stats, 'serialize'):
+            with open_output(args.output) as f:
+                dump_json(result, f, 2 if args.pretty else None)
+            if args.output:
+                print(f"Generated data saved to {args.output}", file=sys.stderr)
+        
+        if report is not None:
+            print_validation_report(report)
     
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+            print(f"cProfile dump saved to {args.cprofile}", file=sys.stderr)
+        if stats is not None:
+            print_stats(stats, args.stats)
+        if args.import_profile:
+            print_import_profile(mode, ready_at, work_started_at)
 
 
 if __name__ == '__main__':
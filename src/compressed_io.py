@@ -0,0 +1,277 @@
+"""
+Compressed file module.
+Reads and writes gzip, bz2 and xz files as plain text streams, with the
+stdlib codecs.
+
+Inputs are recognized by their magic bytes, whatever their name; outputs
+are compressed according to their extension (.gz, .bz2, .xz). The codec
+runs in a background thread connected to the caller by a bounded queue of
+chunks, so that (de)compression, which releases the GIL, overlaps with
+generation and anonymization instead of adding to the wall time.
+"""
+
+import io
+import os
+from typing import Any, BinaryIO, Callable, Optional, TextIO
+
+
+# Compressed bytes read, or uncompressed bytes written, per chunk
+CHUNK_SIZE = 1 << 20
+
+# Chunks queued between the caller and the codec thread
+QUEUE_CHUNKS = 8
+
+# Compression levels: gzip's default (9) is several times slower than 6 for
+# a few percent of size; bz2 and xz keep their own defaults
+_LEVELS = {'gzip': 6, 'bz2': 9, 'xz': None}
+
+_MAGIC_BYTES = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+)
+
+_SUFFIXES = {'.gz': 'gzip', '.gzip': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+# Extensions of compressed files, for file name matching
+COMPRESSED_SUFFIXES = tuple(_SUFFIXES)
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """
+    Return the compression of an existing file from its magic bytes.
+
+    Returns:
+        'gzip', 'bz2', 'xz', or None for an uncompressed file
+    """
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    for magic, name in _MAGIC_BYTES:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def suffix_compression(path: str) -> Optional[str]:
+    """Return the compression of a file from its extension, or None."""
+    return _SUFFIXES.get(os.path.splitext(path)[1].lower())
+
+
+def strip_compression_suffix(path: str) -> str:
+    """Remove a compression extension ("data.json.gz" -> "data.json")."""
+    root, suffix = os.path.splitext(path)
+    return root if suffix.lower() in _SUFFIXES else path
+
+
+def _open_codec(path: str, compression: str, mode: str) -> BinaryIO:
+    """Open a compressed binary file with the stdlib codec."""
+    level = _LEVELS[compression] if mode == 'wb' else None
+
+    if compression == 'gzip':
+        import gzip
+        if mode == 'rb':
+            return gzip.open(path, mode)
+        raw = open(path, mode)
+        # No file name or time in the header, so that seeded outputs stay identical
+        return _Closing(gzip.GzipFile(filename='', fileobj=raw, mode=mode, compresslevel=level, mtime=0), raw)
+    if compression == 'bz2':
+        import bz2
+        return bz2.open(path, mode) if level is None else bz2.open(path, mode, compresslevel=level)
+    import lzma
+    return lzma.open(path, mode)
+
+
+class _Closing:
+    """Codec file also closing the file object it was given."""
+
+    def __init__(self, codec: BinaryIO, raw: BinaryIO):
+        self._codec = codec
+        self._raw = raw
+        self.write = codec.write
+
+    def close(self):
+        try:
+            self._codec.close()
+        finally:
+            self._raw.close()
+
+
+class _CodecThread:
+    """Background thread exchanging chunks with the caller through a queue."""
+
+    def __init__(self, target: 'Callable[[_CodecThread], None]', end_marker: bool = False):
+        """
+        Args:
+            target: Work of the thread, given this object
+            end_marker: Queue None for the caller once the work is over
+        """
+        import queue
+        import threading
+
+        self.queue: Any = queue.Queue(QUEUE_CHUNKS)
+        self.error: Optional[BaseException] = None
+        self._end_marker = end_marker
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True)
+        self._thread.start()
+
+    def _run(self, target: 'Callable[[_CodecThread], None]'):
+        try:
+            target(self)
+        except BaseException as e:
+            self.error = e
+        if self._end_marker:
+            self.put(None)
+        if self.error is not None:
+            # Nobody consumes the queue any more: unblock the caller's puts
+            self._stopped.set()
+
+    @property
+    def stopped(self) -> bool:
+        """Whether the exchange was stopped (by the caller or a failure)."""
+        return self._stopped.is_set()
+
+    def put(self, item: Any) -> bool:
+        """Queue an item for the other side; False once stopped."""
+        import queue
+        while not self._stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def stop(self):
+        """Stop the thread and wait for it, dropping queued chunks."""
+        import queue
+        self._stopped.set()
+        try:
+            while True:
+                self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._thread.join()
+
+    def join(self):
+        self._thread.join()
+
+    def raise_error(self):
+        """Raise the error the thread failed with, if any (once)."""
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+
+class _DecompressingReader(io.RawIOBase):
+    """Raw reader of the chunks decompressed ahead by a background thread."""
+
+    def __init__(self, path: str, compression: str):
+        self._chunk = memoryview(b'')
+        self._eof = False
+        self._codec = _open_codec(path, compression, 'rb')
+        self._thread = _CodecThread(self._decompress, end_marker=True)
+
+    def _decompress(self, thread: _CodecThread):
+        with self._codec as codec:
+            while not thread.stopped:
+                chunk = codec.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                thread.put(chunk)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._chunk:
+            if self._eof:
+                return 0
+            chunk = self._thread.queue.get()
+            if chunk is None:
+                self._eof = True
+                self._thread.raise_error()
+                return 0
+            self._chunk = memoryview(chunk)
+
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._thread.stop()
+        super().close()
+
+
+class _CompressingWriter(io.RawIOBase):
+    """Raw writer handing its chunks to a background compression thread."""
+
+    def __init__(self, path: str, compression: str):
+        self._codec = _open_codec(path, compression, 'wb')
+        self._thread = _CodecThread(self._compress)
+
+    def _compress(self, thread: _CodecThread):
+        codec = self._codec
+        try:
+            while True:
+                chunk = thread.queue.get()
+                if chunk is None:
+                    break
+                codec.write(chunk)
+        finally:
+            codec.close()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._thread.raise_error()
+        # The caller may reuse its buffer once this returns
+        if not self._thread.put(bytes(data)):
+            self._thread.raise_error()
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            try:
+                super().close()
+            finally:
+                self._thread.put(None)
+                self._thread.join()
+            self._thread.raise_error()
+
+
+def open_input(path: str) -> TextIO:
+    """
+    Open a UTF-8 text file, decompressing it if needed.
+
+    Args:
+        path: File path, compressed or not
+
+    Returns:
+        Text stream (a leading BOM is skipped)
+    """
+    compression = detect_compression(path)
+    if compression is None:
+        return open(path, 'r', encoding='utf-8-sig')
+
+    raw = _DecompressingReader(path, compression)
+    return io.TextIOWrapper(io.BufferedReader(raw, CHUNK_SIZE), encoding='utf-8-sig')
+
+
+def open_compressed_output(path: str, compression: str, buffer_size: int = CHUNK_SIZE) -> TextIO:
+    """
+    Open a UTF-8 text file compressed in a background thread.
+
+    Args:
+        path: Output file path
+        compression: 'gzip', 'bz2' or 'xz'
+        buffer_size: Bytes buffered before handing a chunk to the thread
+
+    Returns:
+        Text stream; closing it waits for the compressed file to be complete
+    """
+    raw = _CompressingWriter(path, compression)
+    return io.TextIOWrapper(io.BufferedWriter(raw, buffer_size), encoding='utf-8')
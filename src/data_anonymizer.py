@@ -5,59 +5,179 @@ Allows mixing sensitive data while keeping the structure.
 
 import json
 import random
-from typing import Dict, Any, List, Optional, Union
-from faker import Faker
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, TextIO, Tuple, Union, TYPE_CHECKING
 import re
 
+from field_classifier import SENSITIVE_CATEGORIES, classify
+
+# Streaming and tree walking modules are imported by the methods using them,
+# and hashlib only with a pseudonym key, to keep analysis startup cheap
+if TYPE_CHECKING:
+    from json_stream import Event
+    from pii_scanner import PIIScanner
+
+
+# Number of values in each default anonymization pool
+POOL_SIZE = 100
+
+# Faker call filling each default anonymization pool
+POOL_FACTORIES = {
+    'firstNames': lambda fake: fake.first_name(),
+    'lastNames': lambda fake: fake.last_name(),
+    'emails': lambda fake: fake.email(),
+    'phones': lambda fake: fake.phone_number(),
+    'addresses': lambda fake: fake.address(),
+    'streets': lambda fake: fake.street_address(),
+    'cities': lambda fake: fake.city(),
+    'postcodes': lambda fake: fake.postcode(),
+    'countries': lambda fake: fake.country(),
+    'companies': lambda fake: fake.company(),
+    'urls': lambda fake: fake.url(),
+    'sentences': lambda fake: fake.sentence(),
+    'paragraphs': lambda fake: fake.paragraph(),
+    'dates': lambda fake: fake.date_between(start_date='-30y', end_date='today').isoformat(),
+    'datetimes': lambda fake: fake.date_time_between(start_date='-30y', end_date='now').isoformat(),
+    'words': lambda fake: fake.word(),
+    'shortSentences': lambda fake: fake.sentence(nb_words=3),
+    'shortParagraphs': lambda fake: fake.paragraph(nb_sentences=2),
+}
+
+# Fixed end of the date ranges of keyed pools, which must not depend on today
+PSEUDONYM_EPOCH = datetime(2025, 1, 1)
+
+# Factories replacing POOL_FACTORIES entries in keyed pools
+STABLE_POOL_FACTORIES = {
+    'dates': lambda fake: fake.date_between(start_date=PSEUDONYM_EPOCH.date() - timedelta(days=30 * 365),
+                                            end_date=PSEUDONYM_EPOCH.date()).isoformat(),
+    'datetimes': lambda fake: fake.date_time_between(start_date=PSEUDONYM_EPOCH - timedelta(days=30 * 365),
+                                                     end_date=PSEUDONYM_EPOCH).isoformat(),
+}
+
+# Number of pseudonymized values memoized by each anonymizer
+MEMO_SIZE = 65536
+
+# Pool used to replace each sensitive category that maps to a single pool
+CATEGORY_POOLS = {
+    'firstName': 'firstNames',
+    'lastName': 'lastNames',
+    'email': 'emails',
+    'phone': 'phones',
+    'address': 'addresses',
+    'street': 'streets',
+    'city': 'cities',
+    'postcode': 'postcodes',
+    'country': 'countries',
+    'company': 'companies',
+    'url': 'urls',
+}
+
+
+class _LazyPools(dict):
+    """Pool dictionary filling each default pool on first access."""
+    
+    def __init__(self, anonymizer: 'DataAnonymizer'):
+        super().__init__()
+        self._anonymizer = anonymizer
+    
+    def __missing__(self, pool_name: str) -> List[str]:
+        factory = POOL_FACTORIES.get(pool_name)
+        if factory is None:
+            raise KeyError(pool_name)
+        
+        anonymizer = self._anonymizer
+        if anonymizer.pseudonym_key is None:
+            fake = anonymizer.fake
+        else:
+            # Keyed pools only depend on the key, and dates on a fixed epoch
+            from faker import Faker
+            fake = Faker(anonymizer.locale)
+            fake.seed_instance(anonymizer._blake2b(pool_name.encode('utf-8'), key=anonymizer.pseudonym_key).hexdigest())
+            factory = STABLE_POOL_FACTORIES.get(pool_name, factory)
+        
+        pool = [factory(fake) for _ in range(anonymizer.pool_size)]
+        self[pool_name] = pool
+        return pool
+
 
 class DataAnonymizer:
     """JSON data anonymizer."""
     
-    def __init__(self, locale: str = 'en_US'):
+    def __init__(self, locale: str = 'en_US', pools: Optional[Dict[str, List[str]]] = None,
+                 pseudonym_key: Optional[Union[str, bytes]] = None, pool_size: int = POOL_SIZE,
+                 memo_size: int = MEMO_SIZE):
         """
         Initialize the anonymizer with a specific locale.
         
+        Faker and the anonymization pools are only created when first
+        needed, so that analysis-only use stays cheap.
+        
+        Without pseudonym_key, every occurrence of a value gets a random
+        replacement. With a key, pools are seeded from the key and each value
+        is replaced by the pool entry selected by its keyed hash, so that
+        equal values stay equal (e.g. for joins) across records, runs and
+        processes. Different values may share a replacement; larger pools
+        make this rarer.
+        
         Args:
             locale: Locale for generation (default English)
+            pools: Already built pools to use instead of generating them
+                (e.g. build_pools() of another anonymizer)
+            pseudonym_key: Secret key for consistent pseudonymization (optional)
+            pool_size: Number of values in each default pool
+            memo_size: Number of pseudonymized values memoized
         """
-        self.fake = Faker(locale)
+        if pool_size < 1:
+            raise ValueError("The pool size must be at least 1.")
+        
+        self.locale = locale
+        self.pool_size = pool_size
+        self.memo_size = memo_size
+        self._fake = None
+        self._pii_scanner: Optional['PIIScanner'] = None
+        
+        # blake2b keys are limited to 64 bytes
+        if isinstance(pseudonym_key, str):
+            pseudonym_key = pseudonym_key.encode('utf-8')
+        self._blake2b: Optional[Callable[..., Any]] = None
+        if pseudonym_key is not None:
+            # Bound once for _pseudonymize, which hashes every new value
+            import hashlib
+            self._blake2b = hashlib.blake2b
+            if len(pseudonym_key) > 64:
+                pseudonym_key = self._blake2b(pseudonym_key).digest()
+        self.pseudonym_key: Optional[bytes] = pseudonym_key
+        self._memo: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
         
         # Anonymized data pools
-        self.pools = {
-            'firstNames': [self.fake.first_name() for _ in range(100)],
-            'lastNames': [self.fake.last_name() for _ in range(100)],
-            'emails': [self.fake.email() for _ in range(100)],
-            'phones': [self.fake.phone_number() for _ in range(100)],
-            'addresses': [self.fake.address() for _ in range(100)],
-            'streets': [self.fake.street_address() for _ in range(100)],
-            'cities': [self.fake.city() for _ in range(100)],
-            'postcodes': [self.fake.postcode() for _ in range(100)],
-            'countries': [self.fake.country() for _ in range(100)],
-            'companies': [self.fake.company() for _ in range(100)],
-            'urls': [self.fake.url() for _ in range(100)],
-            'sentences': [self.fake.sentence() for _ in range(100)],
-            'paragraphs': [self.fake.paragraph() for _ in range(100)],
-            'dates': [self.fake.date_between(start_date='-30y', end_date='today').isoformat() for _ in range(100)],
-            'datetimes': [self.fake.date_time_between(start_date='-30y', end_date='now').isoformat() for _ in range(100)]
-        }
+        self.pools = _LazyPools(self)
+        if pools:
+            self.pools.update(pools)
         
-        # Define patterns to identify sensitive fields
-        self.sensitive_patterns = {
-            'firstName': ['prenom', 'firstname', 'fname', 'given_name', 'first_name'],
-            'lastName': ['nom', 'lastname', 'lname', 'surname', 'last_name', 'family_name'],
-            'email': ['email', 'mail', 'e_mail', 'e-mail', 'adresse_email'],
-            'phone': ['telephone', 'phone', 'tel', 'mobile', 'cellphone', 'numero'],
-            'address': ['adresse', 'address', 'addr'],
-            'street': ['rue', 'street', 'street_address', 'voie'],
-            'city': ['ville', 'city', 'localite'],
-            'postcode': ['code_postal', 'postal_code', 'zip', 'zip_code', 'postcode', 'postalcode'],
-            'country': ['pays', 'country', 'nation'],
-            'company': ['entreprise', 'company', 'societe', 'organization'],
-            'url': ['url', 'website', 'site', 'lien'],
-            'description': ['description', 'commentaire', 'comment', 'note'],
-            'date': ['date', 'created_at', 'updated_at', 'created', 'updated'],
-            'datetime': ['datetime', 'timestamp', 'time']
-        }
+        # Patterns used to identify sensitive fields, in precedence order.
+        # Matching itself goes through the shared field classifier.
+        self.sensitive_patterns = {category: list(keywords) for category, keywords in SENSITIVE_CATEGORIES}
+    
+    @property
+    def pii_scanner(self) -> 'PIIScanner':
+        """Value-level PII scanner, compiled on first use."""
+        if self._pii_scanner is None:
+            from pii_scanner import PIIScanner
+            self._pii_scanner = PIIScanner()
+        return self._pii_scanner
+    
+    @property
+    def fake(self):
+        """Faker instance, created on first use."""
+        if self._fake is None:
+            from faker import Faker
+            self._fake = Faker(self.locale)
+        return self._fake
+    
+    @fake.setter
+    def fake(self, value):
+        self._fake = value
     
     def anonymize_json(self, data: Union[Dict, List, str]) -> Union[Dict, List, str]:
         """
@@ -73,17 +193,88 @@ class DataAnonymizer:
         if isinstance(data, str):
             try:
                 parsed_data = json.loads(data)
-                anonymized = self._anonymize_recursive(parsed_data)
+                anonymized = self._anonymize_tree(parsed_data)
                 return json.dumps(anonymized, indent=2, ensure_ascii=False)
             except json.JSONDecodeError:
                 return data
         
         # Otherwise, process directly
-        return self._anonymize_recursive(data)
+        return self._anonymize_tree(data)
+    
+    def anonymize_stream(self, source: TextIO, target: TextIO, pretty: bool = False):
+        """
+        Anonymize a JSON document read from a stream, writing it as it goes.
+        
+        Gives the same output as anonymize_json followed by json.dump, with
+        memory bounded by the nesting depth instead of the document size.
+        
+        Args:
+            source: Text stream containing one JSON document
+            target: Text stream to write the anonymized document to
+            pretty: Indent the output
+        """
+        from json_stream import iter_events, write_events
+        write_events(self._anonymize_events(iter_events(source)), target, indent=2 if pretty else None)
+    
+    def anonymize_ndjson(self, source: TextIO, target: TextIO) -> int:
+        """
+        Anonymize newline-delimited JSON records one line at a time.
+        
+        Args:
+            source: Text stream with one JSON document per line
+            target: Text stream to write the anonymized records to
+            
+        Returns:
+            Number of records anonymized
+        """
+        count = 0
+        for line in source:
+            if not line.strip():
+                continue
+            
+            target.write(json.dumps(self._anonymize_tree(json.loads(line)), ensure_ascii=False))
+            target.write('\n')
+            count += 1
+        
+        return count
     
-    def _anonymize_recursive(self, data: Any) -> Any:
+    def _anonymize_events(self, events: Iterable['Event']) -> Iterator['Event']:
         """
-        Recursively anonymize a data structure.
+        Anonymize a stream of JSON events.
+        
+        Applies the rules of _anonymize_tree: non-blank strings held
+        directly by an object key are anonymized, everything else is kept.
+        
+        Args:
+            events: Events from json_stream.iter_events
+            
+        Yields:
+            Anonymized events
+        """
+        containers: List[bool] = []  # True for objects, False for arrays
+        key = None
+        
+        for event, value in events:
+            if event == 'map_key':
+                key = value
+            elif event == 'string':
+                if containers and containers[-1] and value.strip():
+                    value = self._anonymize_field(key, value)
+            elif event == 'start_map':
+                containers.append(True)
+            elif event == 'start_array':
+                containers.append(False)
+            elif event == 'end_map' or event == 'end_array':
+                containers.pop()
+            
+            yield event, value
+    
+    def _anonymize_tree(self, data: Any) -> Any:
+        """
+        Anonymize a parsed document, whatever its nesting depth.
+        
+        Non-blank strings held directly by an object key are anonymized,
+        everything else (numbers, booleans, null, array strings) is kept.
         
         Args:
             data: Data to anonymize
@@ -91,28 +282,19 @@ class DataAnonymizer:
         Returns:
             Anonymized data
         """
-        if isinstance(data, dict):
-            anonymized = {}
-            for key, value in data.items():
-                if isinstance(value, str) and value.strip():
-                    # Anonymize string values based on field name
-                    anonymized[key] = self._anonymize_field(key, value)
-                else:
-                    # Recursive processing for objects and lists
-                    anonymized[key] = self._anonymize_recursive(value)
-            return anonymized
+        from anonymizer_visitors import AnonymizingVisitor
+        from tree_walker import walk
         
-        elif isinstance(data, list):
-            return [self._anonymize_recursive(item) for item in data]
-        
-        else:
-            # Keep other types as is (numbers, booleans, null)
-            return data
+        visitor = AnonymizingVisitor(self._anonymize_field)
+        walk(data, visitor)
+        return visitor.result
     
     def _anonymize_field(self, field_name: str, value: str) -> str:
         """
         Anonymize a field based on its name and value.
         
+        Keyword precedence is defined by field_classifier.SENSITIVE_CATEGORIES.
+        
         Args:
             field_name: Field name
             value: Field value
@@ -120,69 +302,78 @@ class DataAnonymizer:
         Returns:
             Anonymized value
         """
-        field_name_lower = field_name.lower()
-        
-        # First name
-        if any(pattern in field_name_lower for pattern in self.sensitive_patterns['firstName']):
-            return random.choice(self.pools['firstNames'])
+        if self.pseudonym_key is not None:
+            return self._pseudonymize(field_name, value)
         
-        # Last name
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['lastName']):
-            return random.choice(self.pools['lastNames'])
+        pool_name = self._select_pool(field_name, value)
+        if pool_name is not None:
+            return random.choice(self.pools[pool_name])
         
-        # Email
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['email']):
-            return random.choice(self.pools['emails'])
-        
-        # Phone
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['phone']):
-            return random.choice(self.pools['phones'])
-        
-        # Address
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['address']):
-            return random.choice(self.pools['addresses'])
-        
-        # Street
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['street']):
-            return random.choice(self.pools['streets'])
+        # Default: mix with generic data
+        return self._anonymize_generic_string(value)
+    
+    def _select_pool(self, field_name: str, value: str) -> Optional[str]:
+        """
+        Select the pool replacing a field value.
         
-        # City
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['city']):
-            return random.choice(self.pools['cities'])
+        Args:
+            field_name: Field name
+            value: Field value
+            
+        Returns:
+            Pool name, or None for generic strings
+        """
+        category = classify(field_name).sensitive_category
         
-        # Postal code
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['postcode']):
-            return random.choice(self.pools['postcodes'])
+        # Description/comment
+        if category == 'description':
+            return 'paragraphs' if len(value) > 100 else 'sentences'
         
-        # Country
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['country']):
-            return random.choice(self.pools['countries'])
+        # Date: try to preserve format
+        if category == 'date':
+            return 'datetimes' if 'T' in value or ':' in value else 'dates'
         
-        # Company
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['company']):
-            return random.choice(self.pools['companies'])
+        # Names, contact details, locations, companies and URLs
+        return CATEGORY_POOLS.get(category)
+    
+    def _pseudonymize(self, field_name: str, value: str) -> str:
+        """
+        Replace a value by the pool entry selected by its keyed hash.
         
-        # URL
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['url']):
-            return random.choice(self.pools['urls'])
+        The same value always gets the same replacement for a given key,
+        in every run and every process. Recent results are memoized.
         
-        # Description/comment
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['description']):
-            if len(value) > 100:
-                return random.choice(self.pools['paragraphs'])
+        Args:
+            field_name: Field name
+            value: Field value
+            
+        Returns:
+            Pseudonymized value
+        """
+        memo_key = (field_name, value)
+        result = self._memo.get(memo_key)
+        if result is not None:
+            self._memo.move_to_end(memo_key)
+            return result
+        
+        pool_name = self._select_pool(field_name, value)
+        if pool_name is None:
+            # Generic strings: preserve approximate length
+            if len(value) <= 10:
+                pool_name = 'words'
+            elif len(value) <= 50:
+                pool_name = 'shortSentences'
             else:
-                return random.choice(self.pools['sentences'])
+                pool_name = 'shortParagraphs'
         
-        # Date
-        elif any(pattern in field_name_lower for pattern in self.sensitive_patterns['date']):
-            # Try to preserve format
-            if 'T' in value or ':' in value:
-                return random.choice(self.pools['datetimes'])
-            else:
-                return random.choice(self.pools['dates'])
+        pool = self.pools[pool_name]
+        digest = self._blake2b(value.encode('utf-8'), key=self.pseudonym_key, digest_size=8).digest()
+        result = pool[int.from_bytes(digest, 'big') % len(pool)]
         
-        # Default: mix with generic data
-        return self._anonymize_generic_string(value)
+        self._memo[memo_key] = result
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return result
     
     def _anonymize_generic_string(self, value: str) -> str:
         """
@@ -202,6 +393,17 @@ class DataAnonymizer:
         else:
             return self.fake.paragraph(nb_sentences=2)
     
+    def build_pools(self) -> Dict[str, List[str]]:
+        """
+        Fill every default pool and return all pools.
+        
+        Returns:
+            Pool name -> values, to share with other anonymizers
+        """
+        for pool_name in POOL_FACTORIES:
+            self.pools[pool_name]
+        return dict(self.pools)
+    
     def add_to_pool(self, pool_name: str, values: List[str]):
         """
         Add values to an anonymization pool.
@@ -210,7 +412,7 @@ class DataAnonymizer:
             pool_name: Pool name
             values: Values to add
         """
-        if pool_name not in self.pools:
+        if pool_name not in self.pools and pool_name not in POOL_FACTORIES:
             self.pools[pool_name] = []
         
         self.pools[pool_name].extend(values)
@@ -232,35 +434,224 @@ class DataAnonymizer:
             except json.JSONDecodeError:
                 return []
         
-        sensitive_fields = []
-        self._find_sensitive_fields_recursive(data, sensitive_fields)
-        return list(set(sensitive_fields))  # Remove duplicates
+        from anonymizer_visitors import SensitiveFieldsVisitor
+        from tree_walker import walk
+        
+        visitor = SensitiveFieldsVisitor(self._is_sensitive_field)
+        walk(data, visitor)
+        return list(set(visitor.paths))  # Remove duplicates
+    
+    def count_sensitive_fields(self, data: Any, sample_rate: Optional[float] = None,
+                               sample_size: Optional[int] = None, seed: int = 0) -> Dict[str, int]:
+        """
+        Count sensitive fields by wildcard path.
+        
+        Array indices are collapsed ("users[*].email"), so the report size
+        depends on the document shape, not on its length. Arrays can be
+        sampled: only the sampled items are visited, and counts are scaled
+        back to estimates for the whole array.
+        
+        Args:
+            data: Data to analyze
+            sample_rate: Fraction of the items of each array to visit (optional)
+            sample_size: Maximum number of items visited per array (optional)
+            seed: Seed of the item sampling, for reproducible reports
+            
+        Returns:
+            Wildcard path -> number of non-empty sensitive values, in order of
+            first appearance (estimated when sampling)
+        """
+        if sample_rate is not None and not 0 < sample_rate <= 1:
+            raise ValueError("The sample rate must be in ]0, 1].")
+        if sample_size is not None and sample_size < 1:
+            raise ValueError("The sample size must be at least 1.")
+        
+        rng = random.Random(seed)
+        counts: Dict[str, float] = {}
+        
+        # Paths and sensitivity are computed once per distinct key
+        field_paths: Dict[Tuple[str, str], str] = {}
+        sensitive: Dict[str, bool] = {}
+        
+        # (node, wildcard path, weight of each occurrence under the sampling)
+        stack: List[Tuple[Any, str, float]] = [(data, "", 1.0)]
+        while stack:
+            node, prefix, weight = stack.pop()
+            
+            if isinstance(node, dict):
+                children = []
+                for key, value in node.items():
+                    if isinstance(value, str):
+                        is_sensitive = sensitive.get(key)
+                        if is_sensitive is None:
+                            is_sensitive = sensitive[key] = self._is_sensitive_field(key)
+                        if not is_sensitive or not value.strip():
+                            continue
+                    elif not isinstance(value, (dict, list)):
+                        continue
+                    
+                    field_path = field_paths.get((prefix, key))
+                    if field_path is None:
+                        field_path = field_paths[(prefix, key)] = f"{prefix}.{key}" if prefix else key
+                    
+                    if isinstance(value, str):
+                        counts[field_path] = counts.get(field_path, 0) + weight
+                    else:
+                        children.append((value, field_path, weight))
+                stack.extend(reversed(children))
+            
+            elif isinstance(node, list) and node:
+                items, scale = self._sample_items(node, rng, sample_rate, sample_size)
+                item_path = f"{prefix}[*]"
+                item_weight = weight * scale
+                stack.extend((item, item_path, item_weight) for item in reversed(items)
+                             if isinstance(item, (dict, list)))
+        
+        return {path: int(count + 0.5) for path, count in counts.items()}
     
-    def _find_sensitive_fields_recursive(self, data: Any, sensitive_fields: List[str], prefix: str = ""):
+    def count_pii_values(self, data: Any, sample_rate: Optional[float] = None,
+                         sample_size: Optional[int] = None, seed: int = 0) -> Dict[str, Dict[str, int]]:
         """
-        Recursively find sensitive fields in data.
+        Count personal data found in string values, whatever their key.
+        
+        Every string goes through the combined pii_scanner.PIIScanner, so
+        that e-mails, phone numbers, IBANs, etc. held by keys such as "value"
+        or "data" are found. Paths and sampling work as in
+        count_sensitive_fields.
         
         Args:
             data: Data to analyze
-            sensitive_fields: List to store sensitive field names
-            prefix: Current field path prefix
-        """
-        if isinstance(data, dict):
-            for key, value in data.items():
-                field_path = f"{prefix}.{key}" if prefix else key
-                
-                if isinstance(value, str) and value.strip():
-                    # Check if this field is sensitive
-                    if self._is_sensitive_field(key):
-                        sensitive_fields.append(field_path)
-                
-                # Recursive processing
-                self._find_sensitive_fields_recursive(value, sensitive_fields, field_path)
-        
-        elif isinstance(data, list):
-            for i, item in enumerate(data):
-                item_path = f"{prefix}[{i}]" if prefix else f"[{i}]"
-                self._find_sensitive_fields_recursive(item, sensitive_fields, item_path)
+            sample_rate: Fraction of the items of each array to visit (optional)
+            sample_size: Maximum number of items visited per array (optional)
+            seed: Seed of the item sampling, for reproducible reports
+            
+        Returns:
+            Wildcard path -> detector name -> number of values it matched,
+            in order of first appearance (estimated when sampling)
+        """
+        if sample_rate is not None and not 0 < sample_rate <= 1:
+            raise ValueError("The sample rate must be in ]0, 1].")
+        if sample_size is not None and sample_size < 1:
+            raise ValueError("The sample size must be at least 1.")
+        
+        scan = self.pii_scanner.scan
+        rng = random.Random(seed)
+        counts: Dict[str, Dict[str, float]] = {}
+        field_paths: Dict[Tuple[str, str], str] = {}
+        
+        stack: List[Tuple[Any, str, float]] = [(data, "", 1.0)]
+        while stack:
+            node, prefix, weight = stack.pop()
+            
+            if isinstance(node, str):
+                detected = scan(node)
+                if detected:
+                    path_counts = counts.setdefault(prefix, {})
+                    for name in detected:
+                        path_counts[name] = path_counts.get(name, 0) + weight
+            
+            elif isinstance(node, dict):
+                children = []
+                for key, value in node.items():
+                    if not isinstance(value, (str, dict, list)):
+                        continue
+                    
+                    field_path = field_paths.get((prefix, key))
+                    if field_path is None:
+                        field_path = field_paths[(prefix, key)] = f"{prefix}.{key}" if prefix else key
+                    children.append((value, field_path, weight))
+                stack.extend(reversed(children))
+            
+            elif isinstance(node, list) and node:
+                items, scale = self._sample_items(node, rng, sample_rate, sample_size)
+                item_path = f"{prefix}[*]"
+                item_weight = weight * scale
+                stack.extend((item, item_path, item_weight) for item in reversed(items)
+                             if isinstance(item, (str, dict, list)))
+        
+        return {path: {name: int(count + 0.5) for name, count in path_counts.items()}
+                for path, path_counts in counts.items()}
+    
+    def build_analysis(self, data: Any, wildcard: bool = False,
+                       sample_rate: Optional[float] = None, sample_size: Optional[int] = None,
+                       scan_values: bool = False) -> Dict[str, Any]:
+        """
+        Analyze a document and build the sensitive fields report.
+        
+        Args:
+            data: Document to analyze
+            wildcard: Report wildcard paths ("users[*].email") with counts
+            sample_rate: Fraction of array items analyzed (implies wildcard)
+            sample_size: Maximum array items analyzed per array (implies wildcard)
+            scan_values: Also detect personal data in the values themselves
+            
+        Returns:
+            Analysis report
+        """
+        report = self._build_field_analysis(data, wildcard, sample_rate, sample_size)
+        
+        if scan_values:
+            value_fields = self.count_pii_values(data, sample_rate, sample_size)
+            detections: Dict[str, int] = {}
+            for path_counts in value_fields.values():
+                for name, count in path_counts.items():
+                    detections[name] = detections.get(name, 0) + count
+            
+            report["value_detections"] = detections
+            report["value_fields"] = value_fields
+            report["message"] += f", {sum(detections.values())} value(s) containing personal data"
+        
+        return report
+    
+    def _build_field_analysis(self, data: Any, wildcard: bool,
+                              sample_rate: Optional[float], sample_size: Optional[int]) -> Dict[str, Any]:
+        """Build the key-based part of the analysis report."""
+        if wildcard or sample_rate is not None or sample_size is not None:
+            field_counts = self.count_sensitive_fields(data, sample_rate, sample_size)
+            sampled = sample_rate is not None or sample_size is not None
+            
+            return {
+                "sensitive_fields": list(field_counts),
+                "field_counts": field_counts,
+                "total_fields": len(field_counts),
+                "sampled": sampled,
+                "message": f"Found {len(field_counts)} sensitive field path(s)"
+                           + (" (counts estimated from a sample)" if sampled else "")
+            }
+        
+        sensitive_fields = self.get_sensitive_fields(data)
+        
+        return {
+            "sensitive_fields": sensitive_fields,
+            "total_fields": len(sensitive_fields),
+            "message": f"Found {len(sensitive_fields)} sensitive field(s)"
+        }
+    
+    @staticmethod
+    def _sample_items(items: List[Any], rng: random.Random, sample_rate: Optional[float],
+                      sample_size: Optional[int]) -> Tuple[List[Any], float]:
+        """
+        Sample the items of an array.
+        
+        Args:
+            items: Non-empty array
+            rng: Random generator of the sampling
+            sample_rate: Fraction of the items to keep (optional)
+            sample_size: Maximum number of items kept (optional)
+            
+        Returns:
+            Kept items in array order, and the weight of each kept item
+        """
+        visited = len(items)
+        if sample_rate is not None:
+            visited = max(1, int(len(items) * sample_rate + 0.5))
+        if sample_size is not None:
+            visited = min(visited, sample_size)
+        if visited == len(items):
+            return items, 1.0
+        
+        kept = [items[i] for i in sorted(rng.sample(range(len(items)), visited))]
+        return kept, len(items) / visited
     
     def _is_sensitive_field(self, field_name: str) -> bool:
         """
@@ -272,10 +663,4 @@ class DataAnonymizer:
         Returns:
             True if the field is sensitive
         """
-        field_name_lower = field_name.lower()
-        
-        for pattern_list in self.sensitive_patterns.values():
-            if any(pattern in field_name_lower for pattern in pattern_list):
-                return True
-        
-        return False 
\ No newline at end of file
+        return classify(field_name).sensitive_category is not None
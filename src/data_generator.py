@@ -3,30 +3,88 @@ Module for generating coherent anonymized data.
 Uses the Faker library to generate realistic data.
 """
 
-from faker import Faker
 import random
 import uuid
 import re
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from field_classifier import classify
+from regex_generator import compile_pattern, matches_pattern
+
+
+# Pool size used for bulk generation when none is configured
+DEFAULT_POOL_SIZE = 1000
+
+# Faker call producing each string category (see field_classifier), plus
+# the generic word used when no category matches
+STRING_FACTORIES = {
+    'email': lambda fake: fake.email(),
+    'phone': lambda fake: fake.phone_number(),
+    'name': lambda fake: fake.last_name(),
+    'firstname': lambda fake: fake.first_name(),
+    'address': lambda fake: fake.address(),
+    'city': lambda fake: fake.city(),
+    'postal': lambda fake: fake.postcode(),
+    'country': lambda fake: fake.country(),
+    'company': lambda fake: fake.company(),
+    'url': lambda fake: fake.url(),
+    'date': lambda fake: fake.date_between(start_date='-2y', end_date='today').isoformat(),
+    'datetime': lambda fake: fake.date_time_between(start_date='-2y', end_date='now').isoformat(),
+    'description': lambda fake: fake.paragraph(nb_sentences=3),
+    'title': lambda fake: fake.sentence(nb_words=4).rstrip('.'),
+    'word': lambda fake: fake.word(),
+}
+
 
 class DataGenerator:
     """Coherent anonymized data generator."""
     
-    def __init__(self, locale: str = 'en_US'):
+    def __init__(self, locale: str = 'en_US', seed: Optional[int] = None,
+                 pool_size: int = 0, pool_seed: Optional[int] = None):
         """
         Initialize the generator with a specific locale.
         
         Args:
             locale: Locale for generation (default English)
+            seed: Seed for this instance only. When omitted, the shared
+                Faker seed and the global random module are used.
+            pool_size: Size of the per-category value pools. When greater
+                than 0, string categories are sampled from pools of that
+                many Faker values instead of calling Faker every time.
+            pool_seed: Seed of the value pools. Each pool is then seeded from
+                this value and its category, independently of the record
+                seed. When omitted, pools are drawn from the instance Faker
+                and refreshed by set_seed.
         """
+        # Imported here so that importing this module stays cheap
+        from faker import Faker
+        
+        self.locale = locale
         self.fake = Faker(locale)
-        Faker.seed(42)  # For reproducibility
+        self._random = random
+        self._seeded = False
+        
+        # Value pools, filled lazily on first use of each category
+        self.pool_size = pool_size
+        self._pool_seed = pool_seed
+        self._pool_generation = 0
+        self._pool_fake = None
+        self._pools: Dict[str, List[str]] = {}
+        
+        if seed is None:
+            Faker.seed(42)  # For reproducibility
+        else:
+            self.set_seed(seed)
         
         # Cache to maintain consistency
         self._cached_data = {}
         
+        # Generator of each string category, direct or pooled
+        self._string_generators = {
+            category: self._make_string_generator(category) for category in STRING_FACTORIES
+        }
+        
     def generate_by_type(self, field_type: str, field_name: str = "", 
                         constraints: Optional[Dict] = None) -> Any:
         """
@@ -59,65 +117,36 @@ class DataGenerator:
             return self._generate_string(field_name, constraints)
     
     def _generate_string(self, field_name: str, constraints: Dict) -> str:
-        """Generate a string according to the field name."""
-        field_name_lower = field_name.lower()
-        
-        # Type detection based on field name
-        if any(keyword in field_name_lower for keyword in ['email', 'mail', 'e-mail']):
-            return self._get_cached_or_generate(f"email_{field_name}", self.fake.email)
-        
-        elif any(keyword in field_name_lower for keyword in ['phone', 'telephone', 'tel']):
-            return self._get_cached_or_generate(f"phone_{field_name}", self.fake.phone_number)
-        
-        elif any(keyword in field_name_lower for keyword in ['name', 'surname', 'lastname']):
-            return self._get_cached_or_generate(f"name_{field_name}", self.fake.last_name)
-        
-        elif any(keyword in field_name_lower for keyword in ['firstname', 'given']):
-            return self._get_cached_or_generate(f"firstname_{field_name}", self.fake.first_name)
-        
-        elif any(keyword in field_name_lower for keyword in ['address', 'addr']):
-            return self._get_cached_or_generate(f"address_{field_name}", self.fake.address)
-        
-        elif any(keyword in field_name_lower for keyword in ['city']):
-            return self._get_cached_or_generate(f"city_{field_name}", self.fake.city)
-        
-        elif any(keyword in field_name_lower for keyword in ['postal', 'zip']):
-            return self._get_cached_or_generate(f"postal_{field_name}", self.fake.postcode)
-        
-        elif any(keyword in field_name_lower for keyword in ['country']):
-            return self._get_cached_or_generate(f"country_{field_name}", self.fake.country)
-        
-        elif any(keyword in field_name_lower for keyword in ['company']):
-            return self._get_cached_or_generate(f"company_{field_name}", self.fake.company)
-        
-        elif any(keyword in field_name_lower for keyword in ['url', 'website']):
-            return self._get_cached_or_generate(f"url_{field_name}", self.fake.url)
-        
-        elif any(keyword in field_name_lower for keyword in ['date', 'created', 'updated']):
-            return self._get_cached_or_generate(f"date_{field_name}", 
-                                              lambda: self.fake.date_between(start_date='-2y', end_date='today').isoformat())
+        """
+        Generate a string according to the field name.
         
-        elif any(keyword in field_name_lower for keyword in ['datetime', 'timestamp']):
-            return self._get_cached_or_generate(f"datetime_{field_name}", 
-                                              lambda: self.fake.date_time_between(start_date='-2y', end_date='now').isoformat())
+        Enum and pattern constraints take precedence: a name-based value
+        is only kept when it matches the pattern. Keyword precedence is
+        defined by field_classifier.STRING_CATEGORIES.
+        """
+        # Enumerations are hard constraints
+        if 'enum' in constraints:
+            return self._random.choice(constraints['enum'])
         
-        elif any(keyword in field_name_lower for keyword in ['id', 'uuid']):
-            return str(uuid.uuid4())
+        pattern = constraints.get('pattern')
         
-        elif any(keyword in field_name_lower for keyword in ['description', 'comment', 'note']):
-            return self._get_cached_or_generate(f"description_{field_name}", 
-                                              lambda: self.fake.paragraph(nb_sentences=3))
+        # Type detection based on field name
+        category = classify(field_name).string_category
         
-        elif any(keyword in field_name_lower for keyword in ['title', 'subject']):
-            return self._get_cached_or_generate(f"title_{field_name}", 
-                                              lambda: self.fake.sentence(nb_words=4).rstrip('.'))
+        if category == 'id':
+            value = self._generate_uuid()
+            if pattern is None or matches_pattern(pattern, value):
+                return value
         
-        # Check constraints
-        if 'enum' in constraints:
-            return random.choice(constraints['enum'])
+        elif category is not None:
+            value = self._get_cached_or_generate(f"{category}_{field_name}",
+                                                 self._string_generators[category])
+            if pattern is None or matches_pattern(pattern, value):
+                return value
         
-        if 'pattern' in constraints:
-            return self._generate_from_pattern(constraints['pattern'])
+        # Patterns win over name-based values that do not match them
+        if pattern is not None:
+            return self._generate_from_pattern(pattern)
         
         if 'minLength' in constraints or 'maxLength' in constraints:
             min_len = constraints.get('minLength', 5)
@@ -125,7 +154,7 @@ class DataGenerator:
             return self.fake.text(max_nb_chars=max_len)[:max_len]
         
         # Default: generate a generic word
-        return self._get_cached_or_generate(f"word_{field_name}", self.fake.word)
+        return self._get_cached_or_generate(f"word_{field_name}", self._string_generators['word'])
     
     def _generate_integer(self, constraints: Dict) -> int:
         """Generate an integer with constraints."""
@@ -134,27 +163,27 @@ class DataGenerator:
         
         if 'multipleOf' in constraints:
             multiple = constraints['multipleOf']
-            return random.randint(min_val // multiple, max_val // multiple) * multiple
+            return self._random.randint(min_val // multiple, max_val // multiple) * multiple
         
-        return random.randint(min_val, max_val)
+        return self._random.randint(min_val, max_val)
     
     def _generate_number(self, constraints: Dict) -> float:
         """Generate a number with constraints."""
         min_val = constraints.get('minimum', 0.0)
         max_val = constraints.get('maximum', 1000.0)
         
-        return round(random.uniform(min_val, max_val), 2)
+        return round(self._random.uniform(min_val, max_val), 2)
     
     def _generate_boolean(self) -> bool:
         """Generate a random boolean."""
-        return random.choice([True, False])
+        return self._random.choice([True, False])
     
     def _generate_array(self, field_name: str, constraints: Dict) -> List[Any]:
         """Generate an array with constraints."""
         min_items = constraints.get('minItems', 1)
         max_items = constraints.get('maxItems', 5)
         
-        items_count = random.randint(min_items, max_items)
+        items_count = self._random.randint(min_items, max_items)
         
         if 'items' in constraints:
             item_schema = constraints['items']
@@ -164,7 +193,8 @@ class DataGenerator:
                    for _ in range(items_count)]
         
         # Default: generate strings
-        return [self.fake.word() for _ in range(items_count)]
+        generate_word = self._string_generators['word']
+        return [generate_word() for _ in range(items_count)]
     
     def _generate_object(self, constraints: Dict) -> Dict[str, Any]:
         """Generate an object with constraints."""
@@ -179,17 +209,91 @@ class DataGenerator:
         return {}
     
     def _generate_from_pattern(self, pattern: str) -> str:
-        """Generate a string matching a regex pattern (simplified)."""
-        # Simple pattern matching - can be extended
+        """Generate a string matching a regex pattern."""
+        # Realistic dates for the common ISO date pattern
         if pattern == r'^\d{4}-\d{2}-\d{2}$':
-            return self.fake.date().isoformat()
-        elif pattern == r'^\d{3}-\d{3}-\d{4}$':
-            return f"{random.randint(100, 999)}-{random.randint(100, 999)}-{random.randint(1000, 9999)}"
-        elif pattern == r'^[A-Z]{2}\d{4}$':
-            return f"{random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')}{random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')}{random.randint(1000, 9999)}"
-        else:
-            # Default: generate a generic string
+            return self.fake.date()
+        
+        sampler = compile_pattern(pattern)
+        if sampler is None:
+            # Invalid or unsupported pattern (compile_pattern warned): generate a generic string
             return self.fake.word()
+        
+        return sampler(self._random)
+    
+    def _generate_uuid(self) -> str:
+        """Generate a UUID4, drawn from the instance RNG when seeded."""
+        if self._seeded:
+            return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+        return str(uuid.uuid4())
+    
+    def _make_string_generator(self, category: str):
+        """Build the function producing values of a string category."""
+        factory = STRING_FACTORIES[category]
+        
+        if self.pool_size > 0:
+            return lambda: self._sample_pool(category)
+        return lambda: factory(self.fake)
+    
+    def _sample_pool(self, category: str) -> str:
+        """Draw a value from a category pool, filling the pool if needed."""
+        pool = self._pools.get(category)
+        if pool is None:
+            pool = self._fill_pool(category)
+        return self._random.choice(pool)
+    
+    def _fill_pool(self, category: str) -> List[str]:
+        """
+        Fill the value pool of a category.
+        
+        Args:
+            category: String category (key of STRING_FACTORIES)
+            
+        Returns:
+            The new pool
+        """
+        fake = self.fake
+        if self._pool_seed is not None:
+            # Dedicated Faker seeded per category, so that pool contents do
+            # not depend on the order in which categories are first used
+            if self._pool_fake is None:
+                from faker import Faker
+                self._pool_fake = Faker(self.locale)
+            fake = self._pool_fake
+            fake.seed_instance(f"{self._pool_seed}:{category}:{self._pool_generation}")
+        
+        factory = STRING_FACTORIES[category]
+        pool = [factory(fake) for _ in range(self.pool_size)]
+        self._pools[category] = pool
+        return pool
+    
+    def warm_pools(self, categories: Optional[List[str]] = None):
+        """
+        Fill value pools ahead of time.
+        
+        Args:
+            categories: Categories to fill (default: all)
+        """
+        if self.pool_size <= 0:
+            return
+        
+        for category in categories or STRING_FACTORIES:
+            if category not in self._pools:
+                self._fill_pool(category)
+    
+    def refresh_pools(self, categories: Optional[List[str]] = None):
+        """
+        Discard value pools so that they are filled again with new values.
+        
+        Args:
+            categories: Categories to refresh (default: all)
+        """
+        if categories is None:
+            self._pools.clear()
+        else:
+            for category in categories:
+                self._pools.pop(category, None)
+        self._pool_generation += 1
     
     def _get_cached_or_generate(self, key: str, generator_func) -> str:
         """Get cached data or generate new one."""
@@ -202,6 +306,20 @@ class DataGenerator:
         self._cached_data.clear()
     
     def set_seed(self, seed: int):
-        """Set the random seed for reproducible generation."""
-        Faker.seed(seed)
-        random.seed(seed) 
\ No newline at end of file
+        """
+        Set the random seed for reproducible generation.
+        
+        The seed only affects this instance (its own Faker and Random
+        objects), so several seeded generators can coexist in one process.
+        Pools without a dedicated pool seed are refilled after reseeding.
+        
+        Args:
+            seed: Seed value
+        """
+        self.fake.seed_instance(seed)
+        self._random = random.Random(seed)
+        self._seeded = True
+        
+        # Pools drawn from the instance Faker follow its seed
+        if self._pool_seed is None:
+            self._pools.clear() 
\ No newline at end of file
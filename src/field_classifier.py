@@ -0,0 +1,201 @@
+"""
+Field name classification module.
+Compiles every keyword table used to interpret field names into a single
+matcher, shared by the generator, the processor and the anonymizer.
+
+Each table is an ordered list of (label, keywords). A field matches a label
+when its lowercased name contains one of the keywords, and when several
+labels match, the one listed first wins. The tables are, in precedence order:
+
+- STRING_CATEGORIES: kind of string produced by DataGenerator
+  (email > phone > name > firstname > address > city > postal > country >
+  company > url > date > datetime > id > description > title)
+- TYPE_HINTS: JSON type inferred by JSONProcessor for fields without
+  Swagger constraints (integer > number > boolean > array; names ending
+  with "s" are arrays too; anything else is a string)
+- ARRAY_ELEMENT_HINTS: element type of empty arrays
+  (integer > number > boolean; default string)
+- SENSITIVE_CATEGORIES: kind of sensitive data detected by DataAnonymizer
+  (firstName > lastName > email > phone > address > street > city >
+  postcode > country > company > url > description > date > datetime)
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+
+KeywordTable = List[Tuple[str, List[str]]]
+
+STRING_CATEGORIES: KeywordTable = [
+    ('email', ['email', 'mail', 'e-mail']),
+    ('phone', ['phone', 'telephone', 'tel']),
+    ('name', ['name', 'surname', 'lastname']),
+    ('firstname', ['firstname', 'given']),
+    ('address', ['address', 'addr']),
+    ('city', ['city']),
+    ('postal', ['postal', 'zip']),
+    ('country', ['country']),
+    ('company', ['company']),
+    ('url', ['url', 'website']),
+    ('date', ['date', 'created', 'updated']),
+    ('datetime', ['datetime', 'timestamp']),
+    ('id', ['id', 'uuid']),
+    ('description', ['description', 'comment', 'note']),
+    ('title', ['title', 'subject']),
+]
+
+TYPE_HINTS: KeywordTable = [
+    ('integer', ['id', 'count', 'number', 'age', 'year']),
+    ('number', ['price', 'amount', 'cost', 'rate', 'percent']),
+    ('boolean', ['is_', 'has_', 'can_', 'active', 'enabled']),
+    ('array', ['list']),
+]
+
+ARRAY_ELEMENT_HINTS: KeywordTable = [
+    ('integer', ['ids', 'numbers']),
+    ('number', ['prices', 'amounts', 'costs']),
+    ('boolean', ['flags', 'states']),
+]
+
+SENSITIVE_CATEGORIES: KeywordTable = [
+    ('firstName', ['prenom', 'firstname', 'fname', 'given_name', 'first_name']),
+    ('lastName', ['nom', 'lastname', 'lname', 'surname', 'last_name', 'family_name']),
+    ('email', ['email', 'mail', 'e_mail', 'e-mail', 'adresse_email']),
+    ('phone', ['telephone', 'phone', 'tel', 'mobile', 'cellphone', 'numero']),
+    ('address', ['adresse', 'address', 'addr']),
+    ('street', ['rue', 'street', 'street_address', 'voie']),
+    ('city', ['ville', 'city', 'localite']),
+    ('postcode', ['code_postal', 'postal_code', 'zip', 'zip_code', 'postcode', 'postalcode']),
+    ('country', ['pays', 'country', 'nation']),
+    ('company', ['entreprise', 'company', 'societe', 'organization']),
+    ('url', ['url', 'website', 'site', 'lien']),
+    ('description', ['description', 'commentaire', 'comment', 'note']),
+    ('date', ['date', 'created_at', 'updated_at', 'created', 'updated']),
+    ('datetime', ['datetime', 'timestamp', 'time']),
+]
+
+# Order of the tables in the compiled matcher
+_TABLES: List[KeywordTable] = [STRING_CATEGORIES, TYPE_HINTS, ARRAY_ELEMENT_HINTS, SENSITIVE_CATEGORIES]
+
+
+class FieldClass(NamedTuple):
+    """Classification of a field name."""
+
+    string_category: Optional[str]
+    value_type: str
+    element_type: str
+    sensitive_category: Optional[str]
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton finding every keyword contained in a text."""
+
+    def __init__(self, keywords: Dict[str, List[Tuple[int, int]]]):
+        """
+        Build the automaton.
+
+        Args:
+            keywords: Keyword -> list of (table index, rank in table)
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, int]]] = [[]]
+
+        for keyword, payload in keywords.items():
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state].extend(payload)
+
+        # Breadth-first construction of the failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[Tuple[int, int]]:
+        """
+        Find the payloads of all keywords contained in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of (table index, rank in table)
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[Tuple[int, int]] = set()
+        state = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+
+        return found
+
+
+def _compile_tables(tables: List[KeywordTable]) -> KeywordMatcher:
+    """Merge every keyword table into a single matcher."""
+    keywords: Dict[str, List[Tuple[int, int]]] = {}
+    for table_index, table in enumerate(tables):
+        for rank, (_, table_keywords) in enumerate(table):
+            for keyword in table_keywords:
+                keywords.setdefault(keyword, []).append((table_index, rank))
+    return KeywordMatcher(keywords)
+
+
+_MATCHER = _compile_tables(_TABLES)
+
+
+@lru_cache(maxsize=8192)
+def classify(field_name: str) -> FieldClass:
+    """
+    Classify a field name against every keyword table in one scan.
+
+    Results are memoized per field name.
+
+    Args:
+        field_name: Field name
+
+    Returns:
+        Classification of the field
+    """
+    field_name_lower = field_name.lower()
+
+    # Best (lowest) rank found in each table
+    best: List[Optional[int]] = [None] * len(_TABLES)
+    for table_index, rank in _MATCHER.find(field_name_lower):
+        if best[table_index] is None or rank < best[table_index]:
+            best[table_index] = rank
+
+    def label(table_index: int) -> Optional[str]:
+        rank = best[table_index]
+        return _TABLES[table_index][rank][0] if rank is not None else None
+
+    value_type = label(1)
+    if value_type is None:
+        value_type = "array" if field_name_lower.endswith('s') else "string"
+
+    return FieldClass(
+        string_category=label(0),
+        value_type=value_type,
+        element_type=label(2) or "string",
+        sensitive_category=label(3),
+    )
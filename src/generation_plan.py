@@ -0,0 +1,82 @@
+"""
+Compiled generation plans.
+A plan is a flat list of pre-resolved operations produced once from a
+skeleton (and an optional Swagger specification) and replayed per record.
+"""
+
+from typing import Any, List, Tuple
+
+from data_generator import DataGenerator
+
+
+# Operation codes. Every operation is a tuple whose first item is the code
+# and whose second item is the key in the enclosing container (None when
+# the value is appended to a list or is the document root).
+OP_VALUE = 0       # (OP_VALUE, key, field_type, field_name, constraints)
+OP_CONST = 1       # (OP_CONST, key, value)
+OP_ARRAY = 2       # (OP_ARRAY, key, count, element_type, item_name)
+OP_OPEN_DICT = 3   # (OP_OPEN_DICT, key)
+OP_OPEN_LIST = 4   # (OP_OPEN_LIST, key)
+OP_CLOSE = 5       # (OP_CLOSE, None)
+
+Operation = Tuple[Any, ...]
+
+
+class GenerationPlan:
+    """Flat, pre-resolved list of generation operations for a skeleton."""
+
+    def __init__(self, operations: List[Operation]):
+        """
+        Initialize the plan.
+
+        Args:
+            operations: Operations in document order
+        """
+        self.operations = operations
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def generate(self, generator: DataGenerator) -> Any:
+        """
+        Run the plan once and build a document.
+
+        Args:
+            generator: Data generator
+
+        Returns:
+            Generated document
+        """
+        generate_by_type = generator.generate_by_type
+
+        root: List[Any] = []
+        container: Any = root
+        stack: List[Any] = []
+
+        for operation in self.operations:
+            code = operation[0]
+
+            if code == OP_VALUE:
+                value = generate_by_type(operation[2], operation[3], operation[4])
+            elif code == OP_CONST:
+                value = operation[2]
+            elif code == OP_ARRAY:
+                element_type, item_name = operation[3], operation[4]
+                value = [generate_by_type(element_type, item_name) for _ in range(operation[2])]
+            elif code == OP_CLOSE:
+                container = stack.pop()
+                continue
+            else:
+                value = {} if code == OP_OPEN_DICT else []
+
+            key = operation[1]
+            if key is None:
+                container.append(value)
+            else:
+                container[key] = value
+
+            if code == OP_OPEN_DICT or code == OP_OPEN_LIST:
+                stack.append(container)
+                container = value
+
+        return root[0] if root else None
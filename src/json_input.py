@@ -0,0 +1,413 @@
+"""
+JSON input module.
+Loads JSON files through a read-only memory mapping instead of reading
+them into a string.
+
+Top-level arrays are decoded one element at a time from a sliding window
+of text, and the pages already parsed are dropped from resident memory,
+so only the parsed objects grow with the file. Other documents are parsed
+straight from the mapped bytes with orjson when it is installed (and the
+file is large enough to pay for its import), or decoded in one piece like
+json.load.
+
+The byte ranges of top-level array elements can also be listed without
+parsing the elements: a scan of the bytes only follows brackets and
+strings, so that worker processes map the same file and parse their own
+records instead of receiving copies (see ParallelAnonymizer).
+
+Compressed files (gzip, bz2, xz) cannot be mapped: they are decompressed
+in a background thread (see compressed_io) and arrays are parsed item by
+item from the text stream.
+"""
+
+import json
+import mmap
+import re
+from json.decoder import WHITESPACE, JSONDecodeError, JSONDecoder
+from typing import Any, Iterator, Tuple
+
+from compressed_io import detect_compression, open_input
+from json_output import get_orjson
+
+
+# Bytes decoded at a time when scanning a top-level array (grown for larger elements)
+WINDOW_SIZE = 1 << 20
+
+# Smallest file parsed with orjson: importing it costs more than it saves on smaller ones
+ORJSON_MIN_SIZE = 1 << 20
+
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+# orjson turns integers beyond 64 bits into floats. They need at least 19
+# digits, so bytes holding such a run are left to the json module; runs
+# are found by mapping digits to "0" and searching for 19 of them.
+_DIGIT_TABLE = bytes(0x30 if 0x30 <= i <= 0x39 else 0x20 for i in range(256))
+_LONG_RUN = b'0' * 19
+
+# Bytes checked at a time for long digit runs
+_CHECK_SIZE = 1 << 20
+
+# Structural scan of array elements: runs of bytes up to the next bracket
+# outside strings, written so that matching stays linear
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_NON_BRACKETS = re.compile(rb'[^"\[\]{}]*(?:' + _STRING + rb'[^"\[\]{}]*)*', re.DOTALL)
+_SCALAR = re.compile(_STRING + rb'|[^\s,\[\]{}"]+', re.DOTALL)
+_SPACES = re.compile(rb'[ \t\n\r]*')
+_CLOSING = {ord('['): ord(']'), ord('{'): ord('}')}
+
+# Bytes deleted to keep only the quotes and brackets of an element
+_NOT_STRUCTURAL = bytes(range(256)).translate(None, b'"[]{}')
+
+# Unavailable on Windows
+_MADV_DONTNEED = getattr(mmap, 'MADV_DONTNEED', None)
+
+
+def _has_long_digits(view: memoryview) -> bool:
+    """Whether bytes hold a run of at least 19 digits."""
+    for start in range(0, len(view), _CHECK_SIZE):
+        with view[start:start + _CHECK_SIZE + len(_LONG_RUN) - 1] as chunk:
+            if bytes(chunk).translate(_DIGIT_TABLE).find(_LONG_RUN) != -1:
+                return True
+    return False
+
+
+class MappedInput:
+    """Read-only memory mapping of a JSON file."""
+
+    def __init__(self, path: str, window_size: int = WINDOW_SIZE):
+        """
+        Map a file.
+
+        Args:
+            path: JSON file path
+            window_size: Bytes decoded at a time when scanning arrays
+        """
+        self.path = path
+        self.window_size = window_size
+
+        with open(path, 'rb') as f:
+            try:
+                self._map: Any = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                self._map = b''
+
+        self._view = memoryview(self._map)
+        self._start = len(_UTF8_BOM) if self._view[:3] == _UTF8_BOM else 0
+        self._released = 0
+
+    def close(self):
+        """Release the mapping."""
+        self._view.release()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def __enter__(self) -> 'MappedInput':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def release(self, end: int):
+        """
+        Drop the mapped pages before a byte offset from resident memory.
+
+        They are read again from the file if accessed later, so this only
+        keeps pages that were already parsed from counting in the RSS.
+        """
+        end -= end % mmap.PAGESIZE
+        if end > self._released and _MADV_DONTNEED is not None and isinstance(self._map, mmap.mmap):
+            self._map.madvise(_MADV_DONTNEED, self._released, end - self._released)
+            self._released = end
+
+    def first_char(self) -> str:
+        """Return the first significant character ('' for an empty document)."""
+        view = self._view
+        for position in range(self._start, len(view)):
+            if view[position] not in b' \t\n\r':
+                return chr(view[position])
+        return ''
+
+    def load(self) -> Any:
+        """
+        Parse the whole document.
+
+        Top-level arrays are decoded element by element; other documents
+        with orjson when available.
+
+        Returns:
+            Same value as json.load
+
+        Raises:
+            ValueError: If the document is not valid JSON
+        """
+        if self.first_char() == '[':
+            return list(self.iter_items())
+
+        orjson = self._get_orjson()
+        with self._view[self._start:] as view:
+            if orjson and not _has_long_digits(view):
+                try:
+                    return orjson.loads(view)
+                except orjson.JSONDecodeError:
+                    # NaN, Infinity, lone surrogates: json accepts them
+                    pass
+                finally:
+                    self.release(len(self))
+            text = str(view, 'utf-8')
+        self.release(len(self))
+        return json.loads(text)
+
+    def decode_range(self, start: int, end: int) -> Any:
+        """Parse the value held by a byte range of the file."""
+        orjson = self._get_orjson()
+        with self._view[start:end] as view:
+            if orjson and not _has_long_digits(view):
+                try:
+                    return orjson.loads(view)
+                except orjson.JSONDecodeError:
+                    pass
+            text = str(view, 'utf-8')
+        return json.loads(text)
+
+    def _get_orjson(self) -> Any:
+        """Return the orjson module when it is worth using for this file, else False."""
+        return len(self) >= ORJSON_MIN_SIZE and get_orjson()
+
+    def iter_item_ranges(self) -> Iterator[Tuple[int, int]]:
+        """
+        List the elements of a top-level array without parsing them.
+
+        Elements are delimited by following brackets and strings only;
+        their content is checked when they are parsed (see decode_range).
+
+        Yields:
+            (start, end) byte range of each element, in array order
+
+        Raises:
+            ValueError: If the array is not well delimited
+        """
+        data = self._map
+        size = len(data)
+        pos = _SPACES.match(data, self._start).end()
+        if pos == size or data[pos] != ord('['):
+            raise _error("Expecting '['", pos)
+        pos = _SPACES.match(data, pos + 1).end()
+
+        if pos < size and data[pos] == ord(']'):
+            pos += 1
+        else:
+            while True:
+                end = self._skip_value(pos)
+                yield pos, end
+                if end - self._released >= self.window_size:
+                    self.release(end)
+
+                pos = _SPACES.match(data, end).end()
+                if pos < size and data[pos] == ord(']'):
+                    pos += 1
+                    break
+                if pos == size or data[pos] != ord(','):
+                    raise _error("Expecting ',' delimiter", pos)
+                pos = _SPACES.match(data, pos + 1).end()
+
+        if _SPACES.match(data, pos).end() != size:
+            raise _error("Extra data", pos)
+
+    def _skip_value(self, pos: int) -> int:
+        """Return the byte offset of the end of the value starting at pos."""
+        data = self._map
+        if pos == len(data) or data[pos] not in _CLOSING:
+            match = _SCALAR.match(data, pos)
+            if match is None:
+                raise _error("Expecting value", pos)
+            return match.end()
+
+        # Fast path: the first closing bracket of the element's kind where
+        # as many brackets were closed as opened
+        closing = bytes((_CLOSING[data[pos]],))
+        depth = 0
+        end = pos
+        while True:
+            close = data.find(closing, end)
+            if close == -1:
+                return self._skip_container(pos)
+            chunk = data[end:close]
+            depth += chunk.count(b'{') + chunk.count(b'[') - chunk.count(b'}') - chunk.count(b']') - 1
+            end = close + 1
+            if depth <= 0:
+                break
+
+        # Valid unless escapes or brackets within strings fooled the count:
+        # without them, strings are left as "" once other bytes are deleted
+        element = data[pos:end]
+        if b'\\' in element or b'"' in element.translate(None, _NOT_STRUCTURAL).replace(b'""', b''):
+            return self._skip_container(pos)
+        return end
+
+    def _skip_container(self, pos: int) -> int:
+        """Return the end of the array or object starting at pos, following its strings."""
+        data = self._map
+        expected = []  # Closing brackets, innermost last
+        while True:
+            char = data[pos]
+            if char in _CLOSING:
+                expected.append(_CLOSING[char])
+            elif char == ord('"'):
+                raise _error("Unterminated string", pos)
+            elif char != expected.pop():
+                raise _error("Mismatched bracket", pos)
+            pos += 1
+            if not expected:
+                return pos
+            pos = _NON_BRACKETS.match(data, pos).end()
+            if pos == len(data):
+                raise _error("Unterminated array or object", pos)
+
+    def iter_items(self) -> Iterator[Any]:
+        """
+        Parse the elements of a top-level array one at a time.
+
+        Yields:
+            Decoded elements in array order
+
+        Raises:
+            ValueError: If the document is not a valid JSON array
+        """
+        raw_decode = JSONDecoder().raw_decode
+        window = _Window(self, self._start, self.window_size)
+
+        if window.next_char() != '[':
+            raise window.error("Expecting '['")
+        window.advance(window.pos + 1)
+
+        first = True
+        while True:
+            char = window.next_char()
+            if char == ']':
+                window.advance(window.pos + 1)
+                break
+            if not first:
+                if char != ',':
+                    raise window.error("Expecting ',' delimiter")
+                window.advance(window.pos + 1)
+                window.next_char()
+            first = False
+
+            while True:
+                text = window.text
+                try:
+                    item, end = raw_decode(text, window.pos)
+                except JSONDecodeError as e:
+                    # An element cut by the end of the window fails near that end
+                    truncated = e.msg.startswith('Unterminated string') or e.pos >= len(text) - 10
+                    if truncated and window.fill():
+                        continue
+                    raise window.error(e.msg)
+                # A number ending near the end of the window may continue
+                if end >= len(text) - 2 and window.fill():
+                    continue
+                break
+
+            window.advance(end)
+            yield item
+
+        if window.next_char():
+            raise window.error("Extra data")
+
+
+class _Window:
+    """Decoded text of a slice of mapped bytes, tracking byte offsets."""
+
+    def __init__(self, mapped: MappedInput, start: int, size: int):
+        self._mapped = mapped
+        self._view = mapped._view
+        self._size = size
+        self.text = ''
+        self.pos = 0             # Character position in text
+        self.offset = start      # Byte offset of pos in the file
+        self._end = start        # Byte offset of the end of text
+        self._ascii = True
+
+    def fill(self) -> bool:
+        """
+        Decode the bytes from the current position on.
+
+        Returns:
+            False if the window already reached the end of the file
+        """
+        view = self._view
+        if self._end >= len(view):
+            return False
+        # Bytes before the current position were parsed
+        self._mapped.release(self.offset)
+        if self.pos == 0 and self.text:
+            # Nothing consumed: the current value is larger than the window
+            self._size *= 2
+
+        end = min(len(view), self.offset + self._size)
+        # Do not cut a UTF-8 sequence (continuation bytes are 10xxxxxx)
+        while end < len(view) and view[end] & 0xC0 == 0x80:
+            end -= 1
+
+        try:
+            with view[self.offset:end] as chunk:
+                self.text = str(chunk, 'utf-8')
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e.reason} (byte {self.offset + e.start})") from None
+        self._ascii = self.text.isascii()
+        self._end = end
+        self.pos = 0
+        return True
+
+    def advance(self, pos: int):
+        """Move to a character position of the current text."""
+        if self._ascii:
+            self.offset += pos - self.pos
+        else:
+            self.offset += len(self.text[self.pos:pos].encode('utf-8'))
+        self.pos = pos
+
+    def next_char(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            self.advance(WHITESPACE.match(self.text, self.pos).end())
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def error(self, message: str) -> ValueError:
+        """Build a parse error at the current position."""
+        return _error(message, self.offset)
+
+
+def _error(message: str, offset: int) -> ValueError:
+    """Build a parse error at a byte offset."""
+    return ValueError(f"Invalid JSON: {message} (byte {offset})")
+
+
+def load_file(path: str) -> Any:
+    """
+    Load a JSON file through a memory mapping, or decompress it.
+
+    Args:
+        path: JSON file path, optionally gzip, bz2 or xz compressed
+
+    Returns:
+        Same value as json.load
+    """
+    if detect_compression(path):
+        from json_stream import iter_array_items, peek_char
+
+        with open_input(path) as stream:
+            if peek_char(stream) == '[':
+                return list(iter_array_items(stream))
+            return json.load(stream)
+
+    with MappedInput(path) as mapped:
+        return mapped.load()
+
@@ -0,0 +1,297 @@
+"""
+JSON output module.
+Encodes documents with the fastest available encoder and writes them
+through large buffers.
+
+The stdlib only has a C encoder for compact output: with indent=2 it falls
+back to pure Python. Indented output therefore goes through orjson when it
+is installed. orjson writes shorter float exponents ("1e-7" for "1e-07"),
+writes NaN and Infinity as null, and rejects integers over 64 bits and
+non-string keys, so a document holding any of these is encoded with the
+stdlib as a whole: the choice is made once per document, and its floats
+are formatted the same way throughout. Compact output always uses the
+stdlib C encoder.
+
+Arrays near the top of a document are encoded in batches of elements and
+objects key by key, so that a huge output never exists as one string in
+memory. Generated records are written one at a time, as a JSON array or
+as NDJSON.
+"""
+
+import io
+import json
+import os
+import sys
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+from compressed_io import open_compressed_output, suffix_compression
+
+
+# Size of the output buffers, so that output goes out in few large writes
+BUFFER_SIZE = 1 << 20
+
+# Environment variable selecting the library for indented output and mapped
+# input (see json_input): "orjson" or "stdlib" (default: orjson when installed)
+ENCODER_ENV = 'JSON_TOOLS_JSON_ENCODER'
+
+# Containers at a lower nesting depth are written piece by piece
+INCREMENTAL_DEPTH = 2
+
+# Array elements encoded per encoder call when writing piece by piece
+BATCH_ITEMS = 1000
+
+# orjson module, False when unavailable or disabled, None before the first lookup
+_orjson: Any = None
+
+
+def get_orjson() -> Any:
+    """Return the orjson module if it is installed and enabled, else False."""
+    global _orjson
+    if _orjson is None:
+        _orjson = False
+        if os.environ.get(ENCODER_ENV, '').lower() != 'stdlib':
+            try:
+                import orjson
+                _orjson = orjson
+            except ImportError:
+                pass
+    return _orjson
+
+
+def encoder_name() -> str:
+    """Return the name of the encoder used for indented output."""
+    return 'orjson' if get_orjson() else 'stdlib'
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """
+    Encode a value like json.dumps with ensure_ascii=False.
+
+    Args:
+        obj: JSON-serializable value
+        indent: Indentation (None for compact output)
+
+    Returns:
+        JSON text
+    """
+    return _dumps(obj, indent, _document_orjson(obj, indent))
+
+
+def _dumps(obj: Any, indent: Optional[int], orjson: Any) -> str:
+    """Encode a value with orjson when given, else with the json module."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
+
+
+def _document_orjson(obj: Any, indent: Optional[int]) -> Any:
+    """
+    Return orjson if it can encode a whole document, else False.
+
+    Each piece encoded separately (see _iter_pieces) is checked with a
+    compact encoding by both libraries, which is cheap next to indented
+    stdlib output.
+    """
+    orjson = get_orjson() if indent == 2 else False
+    if not orjson:
+        return False
+
+    for piece in _iter_pieces(obj, 0):
+        try:
+            # Integers over 64 bits, non-string keys, etc.
+            orjson.dumps(piece)
+            # NaN and Infinity, which orjson would write as null
+            json.dumps(piece, allow_nan=False)
+        except (TypeError, ValueError):
+            return False
+    return orjson
+
+
+def _iter_pieces(obj: Any, depth: int) -> Iterator[Any]:
+    """Yield the values encoded in one call by _iter_chunks."""
+    if depth < INCREMENTAL_DEPTH and isinstance(obj, list) and obj:
+        for start in range(0, len(obj), BATCH_ITEMS):
+            yield obj[start:start + BATCH_ITEMS]
+        return
+
+    if depth < INCREMENTAL_DEPTH and isinstance(obj, dict) and obj \
+            and all(isinstance(key, str) for key in obj):
+        for value in obj.values():
+            yield from _iter_pieces(value, depth + 1)
+        return
+
+    yield obj
+
+
+def iter_chunks(obj: Any, indent: Optional[int] = None) -> Iterator[str]:
+    """
+    Encode a value in chunks of JSON text.
+
+    The chunks joined are the text of dumps(obj, indent).
+
+    Args:
+        obj: JSON-serializable value
+        indent: Indentation (None for compact output)
+
+    Yields:
+        Consecutive pieces of the JSON text
+    """
+    return _iter_chunks(obj, indent, 0, _document_orjson(obj, indent))
+
+
+def _iter_chunks(obj: Any, indent: Optional[int], depth: int, orjson: Any) -> Iterator[str]:
+    """Encode a value at a nesting depth, piece by piece near the top."""
+    padding = ' ' * (indent * depth) if indent is not None else ''
+
+    if depth < INCREMENTAL_DEPTH and isinstance(obj, list) and obj:
+        # Batches encoded as lists, without their brackets, so that the
+        # encoder runs once per batch instead of once per element
+        yield '['
+        for start in range(0, len(obj), BATCH_ITEMS):
+            body = _dumps(obj[start:start + BATCH_ITEMS], indent, orjson)[1:-1]
+            if indent is not None:
+                body = body[:-1].replace('\n', '\n' + padding) if depth else body[:-1]
+            yield (',' if indent is not None else ', ') + body if start else body
+        yield ('\n' + padding if indent is not None else '') + ']'
+        return
+
+    if depth < INCREMENTAL_DEPTH and isinstance(obj, dict) and obj \
+            and all(isinstance(key, str) for key in obj):
+        if indent is None:
+            separator, closing = ', ', '}'
+        else:
+            separator = ',\n' + padding + ' ' * indent
+            closing = '\n' + padding + '}'
+
+        for index, (key, value) in enumerate(obj.items()):
+            prefix = separator if index else ('{' if indent is None else '{' + separator[1:])
+            yield prefix + json.dumps(key, ensure_ascii=False) + ': '
+            yield from _iter_chunks(value, indent, depth + 1, orjson)
+        yield closing
+        return
+
+    encoded = _dumps(obj, indent, orjson)
+    if padding and '\n' in encoded:
+        encoded = encoded.replace('\n', '\n' + padding)
+    yield encoded
+
+
+def dump(obj: Any, stream: TextIO, indent: Optional[int] = None):
+    """
+    Write a value like json.dump with ensure_ascii=False, chunk by chunk.
+
+    Args:
+        obj: JSON-serializable value
+        stream: Text stream to write to
+        indent: Indentation (None for compact output)
+    """
+    write = stream.write
+    for chunk in _iter_chunks(obj, indent, 0, _document_orjson(obj, indent)):
+        write(chunk)
+
+
+def write_records(records: Iterable[Any], stream: TextIO, pretty: bool = False,
+                  ndjson: bool = False) -> int:
+    """
+    Write records to a stream one at a time.
+
+    Args:
+        records: Iterable of JSON-serializable records
+        stream: Text stream to write to
+        pretty: Indent records (ignored for NDJSON)
+        ndjson: Write one compact record per line instead of a JSON array
+
+    Returns:
+        Number of records written
+    """
+    indent = 2 if pretty and not ndjson else None
+    encoded = (dumps(record, indent) for record in records)
+    return write_encoded_records(encoded, stream, pretty, ndjson)
+
+
+def write_encoded_records(encoded_records: Iterable[str], stream: TextIO, pretty: bool = False,
+                          ndjson: bool = False) -> int:
+    """
+    Write already encoded records to a stream one at a time.
+
+    Records must be compact for NDJSON, and indented by 2 when pretty.
+
+    Args:
+        encoded_records: Iterable of JSON-encoded records
+        stream: Text stream to write to
+        pretty: Records are indented
+        ndjson: Write one record per line instead of a JSON array
+
+    Returns:
+        Number of records written
+    """
+    written = 0
+
+    if ndjson:
+        for encoded in encoded_records:
+            stream.write(encoded)
+            stream.write('\n')
+            written += 1
+        return written
+
+    # JSON array written element by element, formatted like json.dump would
+    separator = ',\n  ' if pretty else ', '
+    for encoded in encoded_records:
+        if written == 0:
+            stream.write('[\n  ' if pretty else '[')
+        else:
+            stream.write(separator)
+
+        stream.write(encoded.replace('\n', '\n  ') if pretty else encoded)
+        written += 1
+
+    if written == 0:
+        stream.write('[]')
+    else:
+        stream.write('\n]' if pretty else ']')
+
+    return written
+
+
+@contextmanager
+def open_output(path: Optional[str] = None) -> Iterator[TextIO]:
+    """
+    Open an output file, or standard output, with a large write buffer.
+
+    Files ending in .gz, .bz2 or .xz are compressed in a background thread.
+
+    Args:
+        path: Output file path (None for standard output)
+
+    Yields:
+        UTF-8 text stream, flushed on exit
+    """
+    compression = suffix_compression(path) if path else None
+    if compression:
+        stream = open_compressed_output(path, compression, BUFFER_SIZE)
+        try:
+            yield stream
+        finally:
+            stream.close()
+        return
+
+    if path:
+        with open(path, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as stream:
+            yield stream
+        return
+
+    try:
+        fileno = sys.stdout.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        # Replaced standard output (tests, embedding): write to it directly
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+
+    sys.stdout.flush()
+    stream = open(fileno, 'w', encoding='utf-8', buffering=BUFFER_SIZE, closefd=False)
+    try:
+        yield stream
+    finally:
+        stream.close()
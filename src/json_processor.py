@@ -4,9 +4,96 @@ Combines data generation with Swagger constraints.
 """
 
 import json
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, Iterator, Tuple
 from data_generator import DataGenerator
+from field_classifier import classify
+from generation_plan import (
+    GenerationPlan, Operation, OP_VALUE, OP_CONST, OP_ARRAY, OP_OPEN_DICT, OP_OPEN_LIST, OP_CLOSE
+)
 from swagger_parser import SwaggerParser
+from tree_walker import NodePath, TreeVisitor, walk
+
+
+class _PlanCompiler(TreeVisitor):
+    """Appends the plan operations of each skeleton node."""
+    
+    def __init__(self, processor: 'JSONProcessor', swagger_parser: Optional[SwaggerParser]):
+        self.operations: List[Operation] = []
+        self._processor = processor
+        self._swagger_parser = swagger_parser
+    
+    def _append_empty_field(self, key: str, field_path: str):
+        # Empty values held by an object key, containers included, are generated
+        field_type, constraints = self._processor._resolve_field(key, field_path, self._swagger_parser)
+        self.operations.append((OP_VALUE, key, field_type, key, constraints))
+    
+    def enter_dict(self, node: dict, key: Any, path: NodePath) -> bool:
+        if path.in_object:
+            if not node:
+                self._append_empty_field(key, str(path))
+                return False
+            self.operations.append((OP_OPEN_DICT, key))
+        else:
+            self.operations.append((OP_OPEN_DICT, None))
+        return True
+    
+    def enter_list(self, node: list, key: Any, path: NodePath) -> bool:
+        in_object = path.in_object
+        if not node:
+            if in_object:
+                self._append_empty_field(key, str(path))
+            else:
+                # Empty array - generate elements
+                count, element_type, item_name = self._processor._resolve_array_elements(
+                    str(path), self._swagger_parser)
+                self.operations.append((OP_ARRAY, None, count, element_type, item_name))
+            return False
+        
+        self.operations.append((OP_OPEN_LIST, key if in_object else None))
+        return True
+    
+    def leave_dict(self, node: Any, key: Any, path: NodePath):
+        self.operations.append((OP_CLOSE, None))
+    
+    leave_list = leave_dict
+    
+    def visit_value(self, value: Any, key: Any, parent: NodePath):
+        in_object = not parent.is_list
+        if not self._processor._is_empty_value(value):
+            self.operations.append((OP_CONST, key if in_object else None, value))
+        elif in_object:
+            self._append_empty_field(key, parent.child_text(key))
+        else:
+            # Empty array item or document - generate
+            current_path = parent.child_text(key)
+            field_name = current_path.split('.')[-1] if current_path else ""
+            field_type, constraints = self._processor._resolve_field(field_name, current_path, self._swagger_parser)
+            self.operations.append((OP_VALUE, None, field_type, field_name, constraints))
+
+
+class _ConstraintChecker(TreeVisitor):
+    """Checks every object entry against the Swagger constraints of its path."""
+    
+    def __init__(self, processor: 'JSONProcessor', swagger_parser: SwaggerParser, errors: List[str]):
+        self._processor = processor
+        self._swagger_parser = swagger_parser
+        self._errors = errors
+    
+    def _check(self, value: Any, field_path: str):
+        constraints = self._swagger_parser.get_constraints_for_field(field_path)
+        if constraints:
+            self._processor._validate_field(value, constraints, field_path, self._errors)
+    
+    def enter_dict(self, node: dict, key: Any, path: NodePath) -> bool:
+        if path.in_object:
+            self._check(node, str(path))
+        return True
+    
+    enter_list = enter_dict
+    
+    def visit_value(self, value: Any, key: Any, parent: NodePath):
+        if not parent.is_list:
+            self._check(value, parent.child_text(key))
 
 
 class JSONProcessor:
@@ -32,74 +119,101 @@ class JSONProcessor:
         if not data_generator:
             data_generator = DataGenerator()
         
-        # Create Swagger parser if available
-        swagger_parser = None
-        if swagger_spec:
-            swagger_parser = SwaggerParser()
-            swagger_parser.swagger_spec = swagger_spec
-            swagger_parser._extract_schemas()
+        return self.compile(skeleton, swagger_spec).generate(data_generator)
+    
+    def compile(self, skeleton: Any,
+                swagger_spec: Optional[Dict[str, Any]] = None) -> GenerationPlan:
+        """
+        Compile a skeleton into a reusable generation plan.
+        
+        Empty-value detection, type inference and Swagger constraint lookups
+        are done once here, so running the plan only generates values.
         
-        # Recursive processing
-        return self._process_recursive(skeleton, data_generator, swagger_parser)
+        Args:
+            skeleton: JSON skeleton to fill
+            swagger_spec: Swagger specification (optional)
+            
+        Returns:
+            Generation plan to run once per document
+        """
+        swagger_parser = self._build_swagger_parser(swagger_spec)
+        return self._compile_with_parser(skeleton, swagger_parser)
     
-    def _process_recursive(self, data: Any, generator: DataGenerator, 
-                          swagger_parser: Optional[SwaggerParser] = None,
-                          current_path: str = "") -> Any:
+    def _compile_with_parser(self, skeleton: Any,
+                             swagger_parser: Optional[SwaggerParser] = None) -> GenerationPlan:
         """
-        Recursively process data structure.
+        Compile a skeleton with an already prepared Swagger parser.
         
         Args:
-            data: Data to process
-            generator: Data generator
+            skeleton: JSON skeleton to fill
             swagger_parser: Swagger parser (optional)
-            current_path: Current path in structure
             
         Returns:
-            Processed data
+            Generation plan
         """
-        if isinstance(data, dict):
-            result = {}
+        compiler = _PlanCompiler(self, swagger_parser)
+        walk(skeleton, compiler)
+        return GenerationPlan(compiler.operations)
+    
+    def generate_records(self, skeleton: Dict[str, Any], count: int,
+                         swagger_spec: Optional[Dict[str, Any]] = None,
+                         data_generator: Optional[DataGenerator] = None) -> Iterator[Any]:
+        """
+        Lazily generate several documents from the same skeleton.
+        
+        Records are yielded one at a time so callers can stream them to
+        their destination without keeping the whole batch in memory.
+        
+        Args:
+            skeleton: JSON skeleton to fill
+            count: Number of records to generate
+            swagger_spec: Swagger specification (optional)
+            data_generator: Data generator
             
-            for key, value in data.items():
-                new_path = f"{current_path}.{key}" if current_path else key
-                
-                if self._is_empty_value(value):
-                    # Generate data for empty values
-                    result[key] = self._generate_value_for_field(
-                        key, new_path, generator, swagger_parser
-                    )
-                else:
-                    # Recursive processing
-                    result[key] = self._process_recursive(
-                        value, generator, swagger_parser, new_path
-                    )
+        Returns:
+            Iterator yielding one generated document at a time
+        """
+        if not data_generator:
+            data_generator = DataGenerator()
+        
+        # Compile the skeleton once for the whole batch
+        return self.iter_records(self.compile(skeleton, swagger_spec), count, data_generator)
+    
+    def iter_records(self, plan: GenerationPlan, count: int,
+                     generator: DataGenerator) -> Iterator[Any]:
+        """
+        Yield records generated from an already compiled plan (see compile).
+        
+        Lets callers reuse one plan across batches, processes or requests.
+        
+        Args:
+            plan: Compiled generation plan
+            count: Number of records to generate
+            generator: Data generator
             
-            return result
+        Yields:
+            One generated document per iteration
+        """
+        for _ in range(count):
+            # The per-field cache keeps a single document consistent; reset it
+            # so that every record gets its own values
+            generator.clear_cache()
+            yield plan.generate(generator)
+    
+    def _build_swagger_parser(self, swagger_spec: Optional[Dict[str, Any]]) -> Optional[SwaggerParser]:
+        """
+        Get a Swagger parser for an already loaded specification.
         
-        elif isinstance(data, list):
-            # Array processing
-            if not data:
-                # Empty array - generate elements
-                return self._generate_array_elements(current_path, generator, swagger_parser)
-            else:
-                # Recursive processing of elements
-                return [
-                    self._process_recursive(item, generator, swagger_parser, f"{current_path}[{i}]")
-                    for i, item in enumerate(data)
-                ]
-        
-        elif self._is_empty_value(data):
-            # Empty value - generate
-            return self._generate_value_for_field(
-                current_path.split('.')[-1] if current_path else "",
-                current_path,
-                generator,
-                swagger_parser
-            )
+        Args:
+            swagger_spec: Swagger specification (optional)
+            
+        Returns:
+            Parser with extracted schemas, or None without specification
+        """
+        if not swagger_spec:
+            return None
         
-        else:
-            # Non-empty value - preserve
-            return data
+        return SwaggerParser.for_spec(swagger_spec)
     
     def _is_empty_value(self, value: Any) -> bool:
         """
@@ -126,20 +240,18 @@ class JSONProcessor:
         
         return False
     
-    def _generate_value_for_field(self, field_name: str, field_path: str,
-                                generator: DataGenerator,
-                                swagger_parser: Optional[SwaggerParser] = None) -> Any:
+    def _resolve_field(self, field_name: str, field_path: str,
+                       swagger_parser: Optional[SwaggerParser] = None) -> Tuple[str, Dict[str, Any]]:
         """
-        Generate a value for a given field.
+        Resolve the type and constraints used to generate a field.
         
         Args:
             field_name: Field name
             field_path: Complete field path
-            generator: Data generator
             swagger_parser: Swagger parser (optional)
             
         Returns:
-            Generated value
+            Tuple (field type, constraints)
         """
         constraints = {}
         field_type = "string"  # Default
@@ -155,51 +267,33 @@ class JSONProcessor:
         if not constraints:
             field_type = self._infer_type_from_name(field_name)
         
-        return generator.generate_by_type(field_type, field_name, constraints)
+        return field_type, constraints
     
     def _infer_type_from_name(self, field_name: str) -> str:
         """
         Infer type of a field from its name.
         
+        Keyword precedence is defined by field_classifier.TYPE_HINTS.
+        
         Args:
             field_name: Field name
             
         Returns:
             Inferred type
         """
-        field_name_lower = field_name.lower()
-        
-        # Integers
-        if any(keyword in field_name_lower for keyword in ['id', 'count', 'number', 'age', 'year']):
-            return "integer"
-        
-        # Decimal numbers
-        if any(keyword in field_name_lower for keyword in ['price', 'amount', 'cost', 'rate', 'percent']):
-            return "number"
-        
-        # Booleans
-        if any(keyword in field_name_lower for keyword in ['is_', 'has_', 'can_', 'active', 'enabled']):
-            return "boolean"
-        
-        # Arrays
-        if field_name_lower.endswith('s') or 'list' in field_name_lower:
-            return "array"
-        
-        # Default: string
-        return "string"
+        return classify(field_name).value_type
     
-    def _generate_array_elements(self, field_path: str, generator: DataGenerator,
-                               swagger_parser: Optional[SwaggerParser] = None) -> List[Any]:
+    def _resolve_array_elements(self, field_path: str,
+                                swagger_parser: Optional[SwaggerParser] = None) -> Tuple[int, str, str]:
         """
-        Generate elements for an empty array.
+        Resolve how to fill an empty array.
         
         Args:
             field_path: Array field path
-            generator: Data generator
             swagger_parser: Swagger parser (optional)
             
         Returns:
-            Generated array elements
+            Tuple (number of elements, element type, element field name)
         """
         # Default: generate 2-3 elements
         num_elements = 2
@@ -210,42 +304,25 @@ class JSONProcessor:
             if constraints:
                 num_elements = constraints.get('minItems', 2)
         
-        # Generate elements
-        elements = []
-        for i in range(num_elements):
-            # Try to infer element type from field name
-            field_name = field_path.split('.')[-1] if '.' in field_path else field_path
-            element_type = self._infer_array_element_type(field_name)
-            
-            element = generator.generate_by_type(element_type, f"{field_name}_item")
-            elements.append(element)
+        # Try to infer element type from field name
+        field_name = field_path.split('.')[-1] if '.' in field_path else field_path
+        element_type = self._infer_array_element_type(field_name)
         
-        return elements
+        return num_elements, element_type, f"{field_name}_item"
     
     def _infer_array_element_type(self, array_field_name: str) -> str:
         """
         Infer the type of array elements from the array field name.
         
+        Keyword precedence is defined by field_classifier.ARRAY_ELEMENT_HINTS.
+        
         Args:
             array_field_name: Array field name
             
         Returns:
             Inferred element type
         """
-        field_name_lower = array_field_name.lower()
-        
-        # Common patterns
-        if any(keyword in field_name_lower for keyword in ['ids', 'numbers']):
-            return "integer"
-        
-        if any(keyword in field_name_lower for keyword in ['prices', 'amounts', 'costs']):
-            return "number"
-        
-        if any(keyword in field_name_lower for keyword in ['flags', 'states']):
-            return "boolean"
-        
-        # Default: string
-        return "string"
+        return classify(array_field_name).element_type
     
     def validate_generated_data(self, data: Dict[str, Any],
                               swagger_parser: Optional[SwaggerParser] = None) -> List[str]:
@@ -262,38 +339,10 @@ class JSONProcessor:
         errors = []
         
         if swagger_parser:
-            self._validate_recursive(data, swagger_parser, errors)
+            walk(data, _ConstraintChecker(self, swagger_parser, errors))
         
         return errors
     
-    def _validate_recursive(self, data: Any, swagger_parser: SwaggerParser,
-                          errors: List[str], current_path: str = ""):
-        """
-        Recursively validate data.
-        
-        Args:
-            data: Data to validate
-            swagger_parser: Swagger parser
-            errors: Error list
-            current_path: Current path in structure
-        """
-        if isinstance(data, dict):
-            for key, value in data.items():
-                new_path = f"{current_path}.{key}" if current_path else key
-                
-                # Get constraints for this field
-                constraints = swagger_parser.get_constraints_for_field(new_path)
-                if constraints:
-                    self._validate_field(value, constraints, new_path, errors)
-                
-                # Recursive validation
-                self._validate_recursive(value, swagger_parser, errors, new_path)
-        
-        elif isinstance(data, list):
-            for i, item in enumerate(data):
-                item_path = f"{current_path}[{i}]" if current_path else f"[{i}]"
-                self._validate_recursive(item, swagger_parser, errors, item_path)
-    
     def _validate_field(self, value: Any, constraints: Dict[str, Any],
                        field_path: str, errors: List[str]):
         """
@@ -0,0 +1,398 @@
+"""
+Incremental JSON reading and writing module.
+Tokenizes a JSON text stream into events and writes events back as JSON
+text, so that documents larger than memory can be transformed while they
+are read. Memory use depends on the nesting depth and on the size of the
+largest single value, not on the document size.
+
+Events are (event, value) pairs:
+
+    start_map, end_map, start_array, end_array   value is None
+    map_key                                      key string
+    string                                       decoded string
+    number                                       number text as in the input
+    boolean                                      True or False
+    null                                         None
+"""
+
+import re
+from json.decoder import JSONDecodeError, JSONDecoder, scanstring
+from json.encoder import encode_basestring
+from typing import Any, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+try:
+    from _json import encode_basestring as c_encode_basestring
+except ImportError:  # pragma: no cover - pure Python json
+    c_encode_basestring = None
+
+
+# Characters read from the input at a time
+CHUNK_SIZE = 64 * 1024
+
+# Pending output fragments written to the stream at once
+WRITE_BATCH = 4096
+
+Event = Tuple[str, Any]
+
+_encode_string = c_encode_basestring or encode_basestring
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Same grammar as the json module
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?')
+
+# Literals accepted by json.load, with their event
+_LITERALS = {
+    't': ('true', 'boolean', True),
+    'f': ('false', 'boolean', False),
+    'n': ('null', 'null', None),
+    'N': ('NaN', 'number', 'NaN'),
+    'I': ('Infinity', 'number', 'Infinity'),
+}
+
+# Parser states
+_VALUE, _FIRST_KEY, _KEY, _FIRST_ITEM, _AFTER_VALUE = range(5)
+
+
+class _Reader:
+    """Sliding window over a text stream."""
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def fill(self, min_size: int = 0) -> bool:
+        """Drop consumed text and read more; return False at end of input."""
+        if self.eof:
+            return False
+
+        # Read at least as much as is buffered so that values spanning many
+        # chunks are rescanned a logarithmic number of times
+        size = max(self.chunk_size, min_size, len(self.buffer) - self.pos)
+        chunk = self.stream.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def next_char(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def error(self, message: str) -> ValueError:
+        """Build a parse error at the current position."""
+        return ValueError(f"Invalid JSON: {message} (character {self.offset + self.pos})")
+
+    def read_string(self) -> str:
+        """Read the string starting at the current position."""
+        while True:
+            try:
+                value, end = scanstring(self.buffer, self.pos + 1, True)
+            except JSONDecodeError as e:
+                truncated = e.msg.startswith('Unterminated string') or e.pos >= len(self.buffer) - 6
+                if truncated and self.fill():
+                    continue
+                raise self.error(e.msg)
+            self.pos = end
+            return value
+
+    def read_number(self) -> str:
+        """Read the number starting at the current position."""
+        # A number ending within two characters of the end of the buffer may
+        # continue in the next chunk ("1.", "1e", "1e+")
+        while True:
+            match = _NUMBER.match(self.buffer, self.pos)
+            end = match.end() if match is not None else self.pos
+            if (len(self.buffer) - end <= 2 or len(self.buffer) - self.pos < len('-Infinity')) and self.fill():
+                continue
+            break
+
+        if self.buffer.startswith('-Infinity', self.pos):
+            self.pos += len('-Infinity')
+            return '-Infinity'
+        if match is None:
+            raise self.error("Expecting value")
+        self.pos = match.end()
+        return match.group()
+
+    def read_literal(self, literal: str):
+        """Consume a literal (true, false, null, NaN, Infinity)."""
+        while len(self.buffer) - self.pos < len(literal) and self.fill():
+            pass
+        if not self.buffer.startswith(literal, self.pos):
+            raise self.error("Expecting value")
+        self.pos += len(literal)
+
+
+def iter_events(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Event]:
+    """
+    Tokenize a JSON document read from a text stream.
+
+    Accepts the same documents as json.load.
+
+    Args:
+        stream: Text stream positioned at the start of the document
+        chunk_size: Characters read at a time
+
+    Yields:
+        (event, value) pairs in document order
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    reader = _Reader(stream, chunk_size)
+    containers: List[bool] = []  # True for objects, False for arrays
+    state = _VALUE
+
+    while True:
+        char = reader.next_char()
+
+        if state == _AFTER_VALUE:
+            if not containers:
+                if char:
+                    raise reader.error("Extra data")
+                return
+            if char == ',':
+                reader.pos += 1
+                state = _KEY if containers[-1] else _VALUE
+                continue
+            if char == ('}' if containers[-1] else ']'):
+                reader.pos += 1
+                yield ('end_map' if containers.pop() else 'end_array'), None
+                continue
+            raise reader.error("Expecting ',' delimiter")
+
+        if state == _FIRST_KEY or state == _KEY:
+            if char == '}' and state == _FIRST_KEY:
+                reader.pos += 1
+                containers.pop()
+                yield 'end_map', None
+                state = _AFTER_VALUE
+                continue
+            if char != '"':
+                raise reader.error("Expecting property name enclosed in double quotes")
+            key = reader.read_string()
+            if reader.next_char() != ':':
+                raise reader.error("Expecting ':' delimiter")
+            reader.pos += 1
+            yield 'map_key', key
+            state = _VALUE
+            continue
+
+        if state == _FIRST_ITEM and char == ']':
+            reader.pos += 1
+            containers.pop()
+            yield 'end_array', None
+            state = _AFTER_VALUE
+            continue
+
+        # A value
+        if char == '"':
+            yield 'string', reader.read_string()
+            state = _AFTER_VALUE
+        elif char == '{':
+            reader.pos += 1
+            containers.append(True)
+            yield 'start_map', None
+            state = _FIRST_KEY
+        elif char == '[':
+            reader.pos += 1
+            containers.append(False)
+            yield 'start_array', None
+            state = _FIRST_ITEM
+        elif char == '-' or '0' <= char <= '9':
+            yield 'number', reader.read_number()
+            state = _AFTER_VALUE
+        elif char in _LITERALS:
+            literal, event, value = _LITERALS[char]
+            reader.read_literal(literal)
+            yield event, value
+            state = _AFTER_VALUE
+        else:
+            raise reader.error("Expecting value")
+
+
+def peek_char(stream: TextIO) -> str:
+    """
+    Return the first non-whitespace character of a text stream.
+
+    The stream is left positioned on that character. Streams that cannot
+    seek (decompressed input) must not have been read yet: the character
+    is looked up in their binary read-ahead buffer.
+
+    Args:
+        stream: Seekable text stream, or unread buffered text stream
+
+    Returns:
+        First significant character ('' for an empty stream)
+    """
+    if not stream.seekable():
+        head = stream.buffer.peek(CHUNK_SIZE).lstrip(b'\xef\xbb\xbf \t\n\r')
+        return chr(head[0]) if head else ''
+
+    while True:
+        position = stream.tell()
+        char = stream.read(1)
+        if not char or not char.isspace():
+            stream.seek(position)
+            return char
+
+
+def iter_array_items(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Parse the items of a top-level JSON array one at a time.
+
+    Each item is decoded by the json module, so only one item is held in
+    memory at once.
+
+    Args:
+        stream: Text stream positioned at the start of the array
+        chunk_size: Characters read at a time
+
+    Yields:
+        Decoded items in array order
+
+    Raises:
+        ValueError: If the document is not a valid JSON array
+    """
+    decoder = JSONDecoder()
+    reader = _Reader(stream, chunk_size)
+
+    if reader.next_char() != '[':
+        raise reader.error("Expecting '['")
+    reader.pos += 1
+
+    first = True
+    while True:
+        char = reader.next_char()
+        if char == ']':
+            reader.pos += 1
+            break
+        if not first:
+            if char != ',':
+                raise reader.error("Expecting ',' delimiter")
+            reader.pos += 1
+            reader.next_char()
+        first = False
+
+        while True:
+            try:
+                item, end = decoder.raw_decode(reader.buffer, reader.pos)
+            except JSONDecodeError as e:
+                # An item cut by the end of the buffer fails near that end
+                truncated = e.msg.startswith('Unterminated string') or e.pos >= len(reader.buffer) - 10
+                if truncated and reader.fill():
+                    continue
+                raise reader.error(e.msg)
+            # A number ending near the end of the buffer may continue
+            if end >= len(reader.buffer) - 2 and reader.fill():
+                continue
+            break
+
+        reader.pos = end
+        yield item
+
+    if reader.next_char():
+        raise reader.error("Extra data")
+
+
+def format_number(text: str) -> str:
+    """
+    Format number text the way json.dump writes the parsed number.
+
+    Args:
+        text: Number text from the input
+
+    Returns:
+        Number text as json.dump(json.loads(text)) would write it
+    """
+    if text in ('NaN', 'Infinity', '-Infinity'):
+        return text
+    if '.' not in text and 'e' not in text and 'E' not in text:
+        # Integers are written back unchanged, except for negative zero
+        return '0' if text == '-0' else text
+
+    value = float(text)
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return 'Infinity' if value > 0 else '-Infinity'
+    return float.__repr__(value)
+
+
+def write_events(events: Iterable[Event], stream: TextIO, indent: Optional[int] = None):
+    """
+    Write events as JSON text, formatted like json.dump with ensure_ascii=False.
+
+    Args:
+        events: (event, value) pairs of one document
+        stream: Text stream to write to
+        indent: Indentation like json.dump (None for compact output)
+    """
+    pretty = indent is not None
+    item_separator = ',' if pretty else ', '
+    pending: List[str] = []
+
+    # Number of values written in each open container
+    counts: List[int] = []
+    after_key = False
+
+    for event, value in events:
+        closing = event == 'end_map' or event == 'end_array'
+
+        if closing:
+            count = counts.pop()
+            if count and pretty:
+                pending.append('\n' + ' ' * (indent * len(counts)))
+            pending.append('}' if event == 'end_map' else ']')
+        else:
+            # Separator and indentation before a key, or before an array item
+            if after_key:
+                after_key = False
+            elif counts:
+                if counts[-1]:
+                    pending.append(item_separator)
+                if pretty:
+                    pending.append('\n' + ' ' * (indent * len(counts)))
+                counts[-1] += 1
+
+            if event == 'map_key':
+                pending.append(_encode_string(value))
+                pending.append(': ')
+                after_key = True
+            elif event == 'string':
+                pending.append(_encode_string(value))
+            elif event == 'number':
+                pending.append(format_number(value))
+            elif event == 'boolean':
+                pending.append('true' if value else 'false')
+            elif event == 'null':
+                pending.append('null')
+            elif event == 'start_map':
+                pending.append('{')
+                counts.append(0)
+            elif event == 'start_array':
+                pending.append('[')
+                counts.append(0)
+            else:
+                raise ValueError(f"Unknown JSON event: {event}")
+
+        if len(pending) >= WRITE_BATCH:
+            stream.write(''.join(pending))
+            pending = []
+
+    if pending:
+        stream.write(''.join(pending))
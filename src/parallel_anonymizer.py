@@ -0,0 +1,184 @@
+"""
+Multi-process anonymization module.
+Splits the records of a top-level JSON array or of an NDJSON file into
+chunks anonymized by a process pool, and yields them back in input order.
+
+Records of a mapped file (see json_input) are sent to the workers as byte
+ranges: each worker maps the file itself and parses its own records, so
+records are neither copied nor pickled between processes.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Any, Optional, List, Iterable, Iterator, Tuple
+
+from data_anonymizer import DataAnonymizer
+from json_input import MappedInput
+from json_output import dumps
+
+
+# Records per chunk sent to a worker
+DEFAULT_CHUNK_SIZE = 1000
+
+# State built once per worker process by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(locale: str, pools: Dict[str, List[str]], pseudonym_key: Optional[bytes],
+                 memo_size: int):
+    """Prepare the anonymizer of a worker process with the parent's pools."""
+    _worker_state['anonymizer'] = DataAnonymizer(locale, pools=pools, pseudonym_key=pseudonym_key,
+                                                 memo_size=memo_size)
+
+
+def _anonymize_chunk(task: Tuple[List[Any], bool, Optional[int]]) -> List[str]:
+    """
+    Anonymize and encode the records of one chunk.
+
+    Args:
+        task: (records, records are NDJSON lines to decode, indent)
+
+    Returns:
+        List of JSON-encoded records
+    """
+    records, encoded, indent = task
+    anonymizer = _worker_state['anonymizer']
+
+    if encoded:
+        records = (json.loads(line) for line in records)
+    return [dumps(anonymizer.anonymize_json(record), indent) for record in records]
+
+
+def _anonymize_ranges(task: Tuple[str, List[Tuple[int, int]], Optional[int]]) -> List[str]:
+    """
+    Anonymize and encode records held by byte ranges of a file.
+
+    Args:
+        task: (file path, (start, end) byte range of each record, indent)
+
+    Returns:
+        List of JSON-encoded records
+    """
+    path, ranges, indent = task
+    anonymizer = _worker_state['anonymizer']
+
+    # The mapping is opened once per worker and file
+    inputs = _worker_state.setdefault('inputs', {})
+    mapped = inputs.get(path)
+    if mapped is None:
+        mapped = inputs[path] = MappedInput(path)
+
+    encoded = [dumps(anonymizer.anonymize_json(mapped.decode_range(start, end)), indent)
+               for start, end in ranges]
+    # Chunks come in increasing order, so earlier pages are not needed anymore
+    mapped.release(ranges[-1][1])
+    return encoded
+
+
+class ParallelAnonymizer:
+    """Anonymizer running chunks of records on a process pool."""
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 locale: str = 'en_US', anonymizer: Optional[DataAnonymizer] = None):
+        """
+        Initialize the parallel anonymizer.
+
+        Args:
+            workers: Number of worker processes (default: CPU count)
+            chunk_size: Number of records per chunk
+            locale: Locale for generation (ignored when anonymizer is given)
+            anonymizer: Anonymizer whose pools the workers share (optional)
+        """
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be at least 1.")
+
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self.anonymizer = anonymizer or DataAnonymizer(locale)
+        self.locale = self.anonymizer.locale
+
+    def iter_encoded(self, records: Iterable[Any], indent: Optional[int] = None,
+                     encoded: bool = False) -> Iterator[str]:
+        """
+        Anonymize records and yield them JSON-encoded, in input order.
+
+        Args:
+            records: Records, or JSON-encoded records when encoded is set
+            indent: JSON indentation of each output record
+            encoded: Records are JSON text (e.g. NDJSON lines), decoded in the workers
+
+        Yields:
+            One encoded anonymized record per iteration
+        """
+        tasks = ((chunk, encoded, indent) for chunk in self._split(records))
+        for chunk in self._run(_anonymize_chunk, tasks):
+            yield from chunk
+
+    def iter_encoded_ranges(self, path: str, ranges: Iterable[Tuple[int, int]],
+                            indent: Optional[int] = None) -> Iterator[str]:
+        """
+        Anonymize records held by byte ranges of a file, in input order.
+
+        Args:
+            path: File holding the records
+            ranges: (start, end) byte range of each record (see MappedInput.iter_item_ranges)
+            indent: JSON indentation of each output record
+
+        Yields:
+            One encoded anonymized record per iteration
+        """
+        tasks = ((path, chunk, indent) for chunk in self._split(ranges))
+        try:
+            for chunk in self._run(_anonymize_ranges, tasks):
+                yield from chunk
+        finally:
+            if self.workers == 1:
+                # Worker processes release their mappings when they exit
+                for mapped in _worker_state.pop('inputs', {}).values():
+                    mapped.close()
+
+    def _split(self, items: Iterable[Any]) -> Iterator[List[Any]]:
+        """Split items into chunks of chunk_size."""
+        iterator = iter(items)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _run(self, function: Callable[[Any], List[str]], tasks: Iterable[Any]) -> Iterator[List[str]]:
+        """
+        Run chunk tasks and yield their results in input order.
+
+        Args:
+            function: Worker function run on each task
+            tasks: Chunk tasks
+
+        Yields:
+            Encoded records of one chunk
+        """
+        if self.workers == 1:
+            _worker_state['anonymizer'] = self.anonymizer
+            for task in tasks:
+                yield function(task)
+            return
+
+        # Pools are built once here and handed to every worker
+        anonymizer = self.anonymizer
+        initargs = (self.locale, anonymizer.build_pools(), anonymizer.pseudonym_key, anonymizer.memo_size)
+
+        # Keep a bounded window of chunks in flight so that memory does not
+        # grow with the input size
+        window = self.workers * 2
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=initargs) as executor:
+            pending = []
+            for task in tasks:
+                pending.append(executor.submit(function, task))
+                if len(pending) >= window:
+                    yield pending.pop(0).result()
+
+            for future in pending:
+                yield future.result()
@@ -0,0 +1,189 @@
+"""
+Multi-process bulk generation module.
+Splits a bulk job into fixed-size shards generated by a process pool.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+
+from data_generator import DataGenerator
+from json_output import dumps
+from json_processor import JSONProcessor
+
+
+# Records per shard. The output only depends on the master seed and on this
+# value, never on the number of workers.
+DEFAULT_SHARD_SIZE = 1000
+
+# Default master seed, matching the historical Faker.seed(42)
+DEFAULT_SEED = 42
+
+# State built once per worker process by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def derive_shard_seed(master_seed: int, shard_index: int) -> int:
+    """
+    Derive the seed of a shard from the master seed.
+
+    Args:
+        master_seed: Seed of the whole bulk job
+        shard_index: Index of the shard
+
+    Returns:
+        64-bit seed for the shard
+    """
+    digest = hashlib.blake2b(f"{master_seed}:{shard_index}".encode('ascii'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _init_worker(skeleton: Any, swagger_spec: Optional[Dict[str, Any]], locale: str,
+                 pool_size: int, pool_seed: int, collect_stats: bool = False):
+    """Prepare the generator and compiled plan of a worker process."""
+    processor = JSONProcessor()
+    _worker_state['processor'] = processor
+    _worker_state['plan'] = processor.compile(skeleton, swagger_spec)
+    # Pools are seeded from the master seed, so every worker holds the same ones
+    generator = DataGenerator(locale, seed=0, pool_size=pool_size, pool_seed=pool_seed)
+    _worker_state['generator'] = generator
+
+    # Counters of the worker, shipped back with each shard
+    _worker_state['stats'] = None
+    if collect_stats:
+        from run_stats import RunStats
+        _worker_state['stats'] = RunStats()
+        _worker_state['stats'].instrument_generator(generator)
+
+
+def _generate_shard(task: Tuple[int, int, int, Optional[int]]) -> Tuple[List[str], Optional[Dict[str, Any]]]:
+    """
+    Generate and encode the records of one shard.
+
+    Args:
+        task: (master seed, shard index, record count, indent)
+
+    Returns:
+        List of JSON-encoded records, and the shard's run statistics
+        counters (None unless the worker collects statistics)
+    """
+    master_seed, shard_index, size, indent = task
+
+    generator = _worker_state['generator']
+    generator.set_seed(derive_shard_seed(master_seed, shard_index))
+
+    records = _worker_state['processor'].iter_records(_worker_state['plan'], size, generator)
+    encoded = [dumps(record, indent) for record in records]
+
+    stats = _worker_state['stats']
+    return encoded, stats.take_counters() if stats is not None else None
+
+
+class ParallelGenerator:
+    """Deterministic bulk generator running shards on a process pool."""
+
+    def __init__(self, skeleton: Any, swagger_spec: Optional[Dict[str, Any]] = None,
+                 seed: int = DEFAULT_SEED, workers: Optional[int] = None,
+                 shard_size: int = DEFAULT_SHARD_SIZE, locale: str = 'en_US',
+                 pool_size: int = 0, stats: Optional[Any] = None):
+        """
+        Initialize the parallel generator.
+
+        Args:
+            skeleton: JSON skeleton to fill
+            swagger_spec: Swagger specification (optional)
+            seed: Master seed; each shard gets a seed derived from it
+            workers: Number of worker processes (default: CPU count)
+            shard_size: Number of records per shard
+            locale: Locale for generation
+            pool_size: Size of the generator value pools (0 disables them)
+            stats: RunStats receiving the value, Faker and cache counters
+                of every shard (optional)
+        """
+        if shard_size < 1:
+            raise ValueError("The shard size must be at least 1.")
+
+        self.skeleton = skeleton
+        self.swagger_spec = swagger_spec
+        self.seed = seed
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.shard_size = shard_size
+        self.locale = locale
+        self.pool_size = pool_size
+        self.stats = stats
+
+    def iter_encoded(self, count: int, indent: Optional[int] = None) -> Iterator[str]:
+        """
+        Generate records and yield them JSON-encoded, in order.
+
+        Encoding happens in the workers so that the parent process only
+        has to write the results.
+
+        Args:
+            count: Number of records to generate
+            indent: JSON indentation of each record
+
+        Yields:
+            One encoded record per iteration
+        """
+        for shard, counters in self._iter_shards(count, indent):
+            if counters is not None:
+                self.stats.merge_counters(counters)
+            yield from shard
+
+    def iter_records(self, count: int) -> Iterator[Any]:
+        """
+        Generate records and yield them as Python objects, in order.
+
+        Args:
+            count: Number of records to generate
+
+        Yields:
+            One generated document per iteration
+        """
+        for encoded in self.iter_encoded(count):
+            yield json.loads(encoded)
+
+    def _shard_tasks(self, count: int, indent: Optional[int]) -> Iterator[Tuple[int, int, int, Optional[int]]]:
+        """Split a job of count records into shard tasks."""
+        for shard_index, start in enumerate(range(0, count, self.shard_size)):
+            yield (self.seed, shard_index, min(self.shard_size, count - start), indent)
+
+    def _iter_shards(self, count: int,
+                     indent: Optional[int]) -> Iterator[Tuple[List[str], Optional[Dict[str, Any]]]]:
+        """
+        Run the shards and yield their results in shard order.
+
+        Args:
+            count: Number of records to generate
+            indent: JSON indentation of each record
+
+        Yields:
+            Encoded records and statistics counters of one shard
+        """
+        tasks = self._shard_tasks(count, indent)
+        initargs = (self.skeleton, self.swagger_spec, self.locale, self.pool_size, self.seed,
+                    self.stats is not None)
+
+        # Same code path without a pool so that output stays identical
+        if self.workers == 1 or count <= self.shard_size:
+            _init_worker(*initargs)
+            for task in tasks:
+                yield _generate_shard(task)
+            return
+
+        # Keep a bounded window of shards in flight so that memory does not
+        # grow with the job size when the consumer is slower than the pool
+        window = self.workers * 2
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=initargs) as executor:
+            pending = []
+            for task in tasks:
+                pending.append(executor.submit(_generate_shard, task))
+                if len(pending) >= window:
+                    yield pending.pop(0).result()
+
+            for future in pending:
+                yield future.result()
@@ -0,0 +1,175 @@
+"""
+Value-level PII detection module.
+Finds personal data in string values whatever their key: e-mails, phone
+numbers, IBANs, credit cards, IP addresses and dates.
+
+Every detector is compiled into a single regular expression. Values are
+first checked against a cheap pattern (an "@", a ":" or two close digits),
+which rejects most names, words and sentences before the combined pattern
+runs. Candidates with a checksum (IBAN mod 97, credit card Luhn) or a
+strict syntax (IPv6, calendar dates) are then validated. A rejected
+candidate (a phone number failing the Luhn check of a card number) is
+searched again with the detectors that come after it.
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Detectors in precedence order: where matches overlap, the first one wins
+DETECTORS: List[Tuple[str, str]] = [
+    ('email', r'[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}'),
+    ('iban', r'\b[A-Z]{2}\d{2}(?: ?[A-Z0-9]{4}){2,7}(?: ?[A-Z0-9]{1,3})?\b'),
+    ('credit_card', r'(?<![\d-])(?:\d[ -]?){12,18}\d(?![\d-])'),
+    ('ipv4', r'(?<![\d.])(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(?![\d.])'),
+    ('ipv6', r'(?<![\w:])(?:[0-9A-Fa-f]{0,4}:){2,7}[0-9A-Fa-f]{0,4}(?![\w:])'),
+    ('date', r'(?<!\d)(?:\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?'
+             r'|\d{1,2}[/.]\d{1,2}[/.](?:\d{4}|\d{2})(?![./]\d))(?!\d)'),
+    ('phone', r'(?<![\w+])(?:\+\d{1,3}[ .-]?)?(?:\(\d{1,4}\)[ .-]?)?(?:\d{1,4}(?:[ .-]\d{1,4}){1,5}|\d{9,15})(?!\w)'),
+]
+
+# Shortest string any detector can match ("a@b.co")
+MIN_LENGTH = 6
+
+# Strings without any of these cannot hold a detectable value
+_PRECHECK = re.compile(r'[@:]|\d.?\d')
+
+_DIGITS = re.compile(r'\d')
+
+
+def _luhn_valid(text: str) -> bool:
+    """Check the Luhn checksum of a card number."""
+    digits = [int(c) for c in text if c.isdigit()]
+    if not 13 <= len(digits) <= 19:
+        return False
+
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        if i % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+def _iban_valid(text: str) -> bool:
+    """Check the mod 97 checksum of an IBAN."""
+    iban = text.replace(' ', '')
+    if not 15 <= len(iban) <= 34:
+        return False
+
+    rearranged = iban[4:] + iban[:4]
+    number = ''.join(str(int(c, 36)) for c in rearranged)
+    return int(number) % 97 == 1
+
+
+def _ipv6_valid(text: str) -> bool:
+    """Check that a candidate is a real IPv6 address (not a time of day)."""
+    import ipaddress
+
+    try:
+        ipaddress.IPv6Address(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _date_valid(text: str) -> bool:
+    """Check that the day and month of a date are in range."""
+    if '-' in text[:10]:
+        month, day = int(text[5:7]), int(text[8:10])
+    else:
+        parts = re.split(r'[/.]', text)
+        # Day/month order is ambiguous: accept either
+        day, month = int(parts[0]), int(parts[1])
+        if month > 12:
+            day, month = month, day
+    return 1 <= month <= 12 and 1 <= day <= 31
+
+
+def _phone_valid(text: str) -> bool:
+    """Require a plausible digit count and a phone-like shape."""
+    digit_count = len(_DIGITS.findall(text))
+    if not 9 <= digit_count <= 15:
+        return False
+    return text[0] in '+(0' or any(c in text for c in ' .-()')
+
+
+# Validators of the detectors that need one
+VALIDATORS: Dict[str, Callable[[str], bool]] = {
+    'iban': _iban_valid,
+    'credit_card': _luhn_valid,
+    'ipv6': _ipv6_valid,
+    'date': _date_valid,
+    'phone': _phone_valid,
+}
+
+
+class PIIScanner:
+    """Combined scanner for personal data in string values."""
+
+    def __init__(self, detectors: Optional[List[str]] = None):
+        """
+        Compile the scanner.
+
+        Args:
+            detectors: Names of the detectors to enable (default: all of DETECTORS)
+        """
+        enabled = [(name, pattern) for name, pattern in DETECTORS
+                   if detectors is None or name in detectors]
+        if not enabled:
+            raise ValueError("At least one detector must be enabled.")
+
+        self.detectors = [name for name, _ in enabled]
+        self._enabled = enabled
+        self._pattern = self._compile(enabled)
+
+        # Detector name -> pattern of the detectors after it, compiled on first rejection
+        self._fallbacks: Dict[str, Optional['re.Pattern[str]']] = {}
+
+    @staticmethod
+    def _compile(detectors: List[Tuple[str, str]]) -> 're.Pattern[str]':
+        """Combine detectors into one pattern with a named group each."""
+        return re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in detectors))
+
+    def _fallback(self, name: str) -> Optional['re.Pattern[str]']:
+        """Return the pattern of the detectors after a detector (None for the last one)."""
+        if name not in self._fallbacks:
+            index = self.detectors.index(name)
+            rest = self._enabled[index + 1:]
+            self._fallbacks[name] = self._compile(rest) if rest else None
+        return self._fallbacks[name]
+
+    def scan(self, value: str) -> List[str]:
+        """
+        Detect the kinds of personal data contained in a value.
+
+        Args:
+            value: String value
+
+        Returns:
+            Names of the detectors that matched, each at most once, in
+            order of appearance
+        """
+        if len(value) < MIN_LENGTH or _PRECHECK.search(value) is None:
+            return []
+
+        found: List[str] = []
+        for match in self._pattern.finditer(value):
+            span_end = match.end()
+            while match is not None:
+                name = match.lastgroup
+                if name in found:
+                    break
+                validator = VALIDATORS.get(name)
+                if validator is None or validator(match.group()):
+                    found.append(name)
+                    break
+
+                # Rejected: a later detector may still match within the span
+                fallback = self._fallback(name)
+                match = fallback.search(value, match.start()) if fallback else None
+                if match is not None and match.start() >= span_end:
+                    break
+        return found
@@ -0,0 +1,328 @@
+"""
+Regex-driven string generation module.
+Turns Swagger/OpenAPI `pattern` constraints into samplers producing
+matching strings. Each pattern is parsed once with the standard library
+regex parser and compiled into a tree of small sampling functions.
+"""
+
+import re
+import string
+import warnings
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:  # Python 3.11+
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # pragma: no cover - older Python versions
+    import sre_parse
+    import sre_constants
+
+
+# Upper bound added to the minimum of open-ended repeats (*, +, {n,})
+REPEAT_SPAN = 8
+
+# Attempts made to satisfy patterns that can only be sampled approximately
+MAX_ATTEMPTS = 20
+
+# Characters used for wildcards, negated classes and huge ranges
+_UNIVERSE = string.ascii_letters + string.digits + string.punctuation + ' '
+
+# Characters used for negated classes excluding all of _UNIVERSE (e.g. [^\x00-\x7f]):
+# Latin-1 and accented Latin, Greek, Cyrillic, punctuation and CJK
+_NON_ASCII = ''.join(chr(c) for c in (*range(0xA1, 0x180), *range(0x3B1, 0x3CA), *range(0x430, 0x450),
+                                      *range(0x2010, 0x2028), *range(0x4E00, 0x4F00))
+                     if chr(c).isprintable())
+
+_WORD = string.ascii_letters + string.digits + '_'
+
+_CATEGORIES = {
+    'CATEGORY_DIGIT': string.digits,
+    'CATEGORY_NOT_DIGIT': ''.join(c for c in _UNIVERSE if c not in string.digits),
+    'CATEGORY_WORD': _WORD,
+    'CATEGORY_NOT_WORD': ''.join(c for c in _UNIVERSE if c not in _WORD),
+    'CATEGORY_SPACE': ' ',
+    'CATEGORY_NOT_SPACE': _UNIVERSE.replace(' ', ''),
+    'CATEGORY_LINEBREAK': '\n',
+    'CATEGORY_NOT_LINEBREAK': _UNIVERSE,
+}
+
+# Regexes of the categories, to test characters outside _UNIVERSE
+_CATEGORY_REGEXES = {
+    'CATEGORY_DIGIT': r'\d',
+    'CATEGORY_NOT_DIGIT': r'\D',
+    'CATEGORY_WORD': r'\w',
+    'CATEGORY_NOT_WORD': r'\W',
+    'CATEGORY_SPACE': r'\s',
+    'CATEGORY_NOT_SPACE': r'\S',
+    'CATEGORY_LINEBREAK': r'\n',
+    'CATEGORY_NOT_LINEBREAK': r'[^\n]',
+}
+
+_MAXREPEAT = sre_constants.MAXREPEAT
+
+
+def _op(name: str) -> Any:
+    """Return a parser opcode, or None when this Python does not define it."""
+    return getattr(sre_constants, name, None)
+
+
+LITERAL = _op('LITERAL')
+NOT_LITERAL = _op('NOT_LITERAL')
+ANY = _op('ANY')
+IN = _op('IN')
+RANGE = _op('RANGE')
+NEGATE = _op('NEGATE')
+CATEGORY = _op('CATEGORY')
+BRANCH = _op('BRANCH')
+SUBPATTERN = _op('SUBPATTERN')
+ATOMIC_GROUP = _op('ATOMIC_GROUP')
+REPEATS = {_op('MAX_REPEAT'), _op('MIN_REPEAT'), _op('POSSESSIVE_REPEAT')} - {None}
+AT = _op('AT')
+ASSERT = _op('ASSERT')
+ASSERT_NOT = _op('ASSERT_NOT')
+GROUPREF = _op('GROUPREF')
+GROUPREF_EXISTS = _op('GROUPREF_EXISTS')
+
+# Node sampler: (rng, captured groups) -> generated text
+Node = Callable[[Any, Dict[int, str]], str]
+
+
+class UnsupportedPattern(Exception):
+    """Raised when a pattern uses a construct the sampler cannot produce."""
+
+
+class _Compiler:
+    """Compile a parsed pattern into sampling functions."""
+
+    def __init__(self):
+        # Set when the sampler may produce non-matching strings (lookarounds,
+        # word boundaries), in which case samples are checked and retried
+        self.approximate = False
+
+    def compile_sequence(self, items) -> Node:
+        """Compile a sequence of parsed items."""
+        nodes: List[Node] = []
+        literal: List[str] = []
+
+        for op, av in items:
+            if op is LITERAL:
+                literal.append(chr(av))
+                continue
+
+            node = self.compile_item(op, av)
+            if node is None:
+                continue
+            if literal:
+                nodes.append(_constant(''.join(literal)))
+                literal = []
+            nodes.append(node)
+
+        if literal:
+            nodes.append(_constant(''.join(literal)))
+
+        if not nodes:
+            return _constant('')
+        if len(nodes) == 1:
+            return nodes[0]
+
+        def sequence(rng, groups):
+            return ''.join([node(rng, groups) for node in nodes])
+        return sequence
+
+    def compile_item(self, op, av) -> Optional[Node]:
+        """Compile a single parsed item, or return None when it produces no text."""
+        if op is IN or op is NOT_LITERAL or op is ANY:
+            return _choice(self.alphabet(op, av))
+
+        if op in REPEATS:
+            return self.compile_repeat(*av)
+
+        if op is BRANCH:
+            branches = [self.compile_sequence(branch) for branch in av[1]]
+
+            def branch(rng, groups):
+                return rng.choice(branches)(rng, groups)
+            return branch
+
+        if op is SUBPATTERN:
+            group, inner = av[0], self.compile_sequence(av[-1])
+            if group is None:
+                return inner
+
+            def capture(rng, groups):
+                value = inner(rng, groups)
+                groups[group] = value
+                return value
+            return capture
+
+        if op is ATOMIC_GROUP:
+            return self.compile_sequence(av)
+
+        if op is GROUPREF:
+            return lambda rng, groups: groups.get(av, '')
+
+        if op is GROUPREF_EXISTS:
+            group, yes = av[0], self.compile_sequence(av[1])
+            no = self.compile_sequence(av[2]) if av[2] is not None else _constant('')
+            return lambda rng, groups: yes(rng, groups) if group in groups else no(rng, groups)
+
+        if op is AT:
+            if _name(av) not in ('AT_BEGINNING', 'AT_BEGINNING_STRING', 'AT_END', 'AT_END_STRING'):
+                self.approximate = True
+            return None
+
+        if op is ASSERT or op is ASSERT_NOT:
+            self.approximate = True
+            return None
+
+        raise UnsupportedPattern(f"Unsupported regex construct: {op}")
+
+    def compile_repeat(self, min_count: int, max_count: int, items) -> Node:
+        """Compile a repeated sub-pattern."""
+        if max_count is _MAXREPEAT or max_count == _MAXREPEAT:
+            max_count = min_count + REPEAT_SPAN
+
+        # Fast path for a repeated character class (e.g. \d{4}, [A-Z]+)
+        if len(items) == 1 and (items[0][0] is IN or items[0][0] is ANY or items[0][0] is NOT_LITERAL):
+            alphabet = self.alphabet(*items[0])
+
+            def repeat_chars(rng, groups):
+                return ''.join(rng.choices(alphabet, k=rng.randint(min_count, max_count)))
+            return repeat_chars
+
+        inner = self.compile_sequence(items)
+
+        def repeat(rng, groups):
+            return ''.join([inner(rng, groups) for _ in range(rng.randint(min_count, max_count))])
+        return repeat
+
+    def alphabet(self, op, av) -> str:
+        """Expand a character class into the characters it may produce."""
+        if op is ANY:
+            return _UNIVERSE
+        if op is NOT_LITERAL:
+            return _UNIVERSE.replace(chr(av), '')
+
+        chars: List[str] = []
+        spans: List[Tuple[int, int]] = []  # Huge ranges, only partly listed in chars
+        categories: List[str] = []
+        negate = False
+        for item_op, item_av in av:
+            if item_op is NEGATE:
+                negate = True
+            elif item_op is LITERAL:
+                chars.append(chr(item_av))
+            elif item_op is RANGE:
+                low, high = item_av
+                if high - low > 0xFF:
+                    spans.append((low, high))
+                    # Huge (Unicode) ranges: keep the readable characters
+                    subset = [c for c in _UNIVERSE if low <= ord(c) <= high]
+                    chars.extend(subset or [chr(c) for c in range(low, low + 0x100)])
+                else:
+                    chars.extend(chr(c) for c in range(low, high + 1))
+            elif item_op is CATEGORY:
+                name = _name(item_av).replace('_UNI_', '_').replace('_LOC_', '_')
+                if name not in _CATEGORIES:
+                    raise UnsupportedPattern(f"Unsupported character category: {item_av}")
+                categories.append(name)
+                chars.extend(_CATEGORIES[name])
+            else:
+                raise UnsupportedPattern(f"Unsupported character class item: {item_op}")
+
+        if negate:
+            excluded = set(chars)
+            chars = [c for c in _UNIVERSE if c not in excluded]
+            if not chars:
+                chars = [c for c in _NON_ASCII
+                         if c not in excluded
+                         and not any(low <= ord(c) <= high for low, high in spans)
+                         and not any(re.match(_CATEGORY_REGEXES[name], c) for name in categories)]
+
+        # Keep the first occurrence of each character, in a stable order
+        alphabet = ''.join(dict.fromkeys(chars))
+        if not alphabet:
+            raise UnsupportedPattern("Empty character class")
+        return alphabet
+
+
+def _name(code: Any) -> str:
+    """Name of a parser constant."""
+    return getattr(code, 'name', str(code))
+
+
+def _constant(text: str) -> Node:
+    """Node always producing the same text."""
+    return lambda rng, groups: text
+
+
+def _choice(alphabet: str) -> Node:
+    """Node producing one character of an alphabet."""
+    if len(alphabet) == 1:
+        return _constant(alphabet)
+    return lambda rng, groups: rng.choice(alphabet)
+
+
+@lru_cache(maxsize=1024)
+def compile_pattern(pattern: str) -> Optional[Callable[[Any], str]]:
+    """
+    Compile a regex pattern into a sampler.
+
+    Results are cached per pattern.
+
+    Args:
+        pattern: Regular expression (Swagger `pattern` constraint)
+
+    Returns:
+        Function taking a random.Random-like object and returning a matching
+        string, or None (with a warning) if the pattern is invalid or unsupported
+    """
+    try:
+        compiler = _Compiler()
+        root = compiler.compile_sequence(sre_parse.parse(pattern))
+        regex = re.compile(pattern)
+    except (UnsupportedPattern, re.error, RecursionError, OverflowError) as e:
+        warnings.warn(f"Cannot generate strings for pattern {pattern!r}: {e}", stacklevel=2)
+        return None
+
+    if not compiler.approximate:
+        return lambda rng: root(rng, {})
+
+    def sample_checked(rng) -> str:
+        value = ''
+        for _ in range(MAX_ATTEMPTS):
+            value = root(rng, {})
+            if regex.search(value):
+                break
+        else:
+            warnings.warn(f"No string matching pattern {pattern!r} found in {MAX_ATTEMPTS} attempts",
+                          stacklevel=2)
+        return value
+    return sample_checked
+
+
+@lru_cache(maxsize=1024)
+def _compiled_regex(pattern: str):
+    """Compile a pattern for matching, or return None if it is invalid."""
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
+
+
+def matches_pattern(pattern: str, value: str) -> bool:
+    """
+    Check whether a value matches a Swagger pattern (search semantics).
+
+    Invalid patterns are treated as matching anything.
+
+    Args:
+        pattern: Regular expression
+        value: Value to check
+
+    Returns:
+        True if the value matches
+    """
+    regex = _compiled_regex(pattern)
+    return regex is None or regex.search(value) is not None
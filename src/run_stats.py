@@ -0,0 +1,268 @@
+"""
+Run statistics module.
+Collects the --stats report of a CLI run: wall time per phase, generated
+values per type and category, Faker calls and their cumulative time,
+cache hit rates and peak memory.
+
+Instrumentation is only installed on the objects of a run that asked for
+statistics, so normal runs pay nothing.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from field_classifier import classify
+
+
+# Faker methods that configure the instance instead of producing a value
+_FAKER_SETUP_METHODS = frozenset({'seed', 'seed_instance', 'seed_locale'})
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Return the peak resident memory of the process in MB (None if unknown)."""
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+class _TimedFaker:
+    """Faker proxy counting and timing the calls of each provider method."""
+
+    def __init__(self, fake: Any, stats: 'RunStats'):
+        self._fake = fake
+        self._stats = stats
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._fake, name)
+        if not callable(attribute) or name in _FAKER_SETUP_METHODS:
+            return attribute
+
+        calls = self._stats.faker_calls
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                entry = calls.get(name)
+                if entry is None:
+                    entry = calls[name] = [0, 0.0]
+                entry[0] += 1
+                entry[1] += perf_counter() - start
+
+        return timed
+
+
+class RunStats:
+    """Statistics of one CLI run."""
+
+    def __init__(self):
+        # Phase name -> exclusive seconds (time in nested phases is not counted twice)
+        self.phases: Dict[str, float] = {}
+        self._phase_stack: List[List[Any]] = []
+
+        # "type" or "type/category" -> generated values
+        self.values: Dict[str, int] = {}
+
+        # Faker method -> [calls, cumulative seconds]
+        self.faker_calls: Dict[str, List[Any]] = {}
+
+        # Cache name -> [hits, misses]
+        self.caches: Dict[str, List[int]] = {}
+
+        self._started_at = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the block as the given phase."""
+        now = time.perf_counter()
+        if self._phase_stack:
+            parent = self._phase_stack[-1]
+            self.phases[parent[0]] = self.phases.get(parent[0], 0.0) + now - parent[1]
+
+        entry = [name, now]
+        self._phase_stack.append(entry)
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._phase_stack.pop()
+            self.phases[name] = self.phases.get(name, 0.0) + now - entry[1]
+            if self._phase_stack:
+                self._phase_stack[-1][1] = now
+
+    def timed_iter(self, items: Iterable[Any], name: str) -> Iterator[Any]:
+        """
+        Pass items through, timing the production of each one as a phase.
+
+        Used for lazily generated records, whose generation is interleaved
+        with their serialization.
+        """
+        iterator = iter(items)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def count_cache(self, name: str, hit: bool):
+        """Record one lookup of a cache."""
+        entry = self.caches.get(name)
+        if entry is None:
+            entry = self.caches[name] = [0, 0]
+        entry[0 if hit else 1] += 1
+
+    def instrument_faker(self, owner: Any):
+        """Count and time the Faker calls of an object with a `fake` attribute."""
+        if not isinstance(owner.fake, _TimedFaker):
+            owner.fake = _TimedFaker(owner.fake, self)
+
+    def instrument_generator(self, generator: Any):
+        """
+        Count the values, Faker calls and cache hits of a DataGenerator.
+
+        Args:
+            generator: DataGenerator of the run
+        """
+        self.instrument_faker(generator)
+        values = self.values
+        generate_by_type = generator.generate_by_type
+
+        def counted_generate_by_type(field_type: str, field_name: str = "",
+                                     constraints: Optional[Dict] = None) -> Any:
+            if field_type == 'string':
+                category = classify(field_name).string_category or 'generic'
+                key = f"string/{category}"
+            else:
+                key = field_type
+            values[key] = values.get(key, 0) + 1
+            return generate_by_type(field_type, field_name, constraints)
+
+        generator.generate_by_type = counted_generate_by_type
+
+        cached_data = generator._cached_data
+        get_cached_or_generate = generator._get_cached_or_generate
+
+        def counted_get_cached_or_generate(key: str, generator_func: Callable[[], str]) -> str:
+            self.count_cache('value cache', key in cached_data)
+            return get_cached_or_generate(key, generator_func)
+
+        generator._get_cached_or_generate = counted_get_cached_or_generate
+
+    def instrument_spec_cache(self, cache: Any):
+        """Count the hits of a SpecCache."""
+        load = cache.load
+
+        def counted_load(file_path: str) -> Any:
+            payload = load(file_path)
+            self.count_cache('spec cache', payload is not None)
+            return payload
+
+        cache.load = counted_load
+
+    def take_counters(self) -> Dict[str, Any]:
+        """
+        Return the value, Faker and cache counters and reset them.
+
+        Used by worker processes to ship the counters of each shard to the
+        parent, which adds them up with merge_counters.
+        """
+        counters = {"values": dict(self.values), "faker_calls": dict(self.faker_calls),
+                    "caches": dict(self.caches)}
+        # Cleared in place: the instrumented objects hold references to them
+        self.values.clear()
+        self.faker_calls.clear()
+        self.caches.clear()
+        return counters
+
+    def merge_counters(self, counters: Dict[str, Any]):
+        """Add counters returned by take_counters to this run."""
+        for key, count in counters['values'].items():
+            self.values[key] = self.values.get(key, 0) + count
+
+        for name, (calls, seconds) in counters['faker_calls'].items():
+            entry = self.faker_calls.get(name)
+            if entry is None:
+                entry = self.faker_calls[name] = [0, 0.0]
+            entry[0] += calls
+            entry[1] += seconds
+
+        for name, (hits, misses) in counters['caches'].items():
+            entry = self.caches.get(name)
+            if entry is None:
+                entry = self.caches[name] = [0, 0]
+            entry[0] += hits
+            entry[1] += misses
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Build the statistics report.
+
+        Returns:
+            Report with phases, values, Faker calls, caches and memory
+        """
+        caches = {name: self._cache_entry(hits, misses) for name, (hits, misses) in self.caches.items()}
+
+        # Memoized functions of the run, whatever their caller
+        from regex_generator import compile_pattern
+        for name, function in (('field classifier', classify), ('pattern compiler', compile_pattern)):
+            info = function.cache_info()
+            if info.hits or info.misses:
+                caches[name] = self._cache_entry(info.hits, info.misses)
+
+        faker = sorted(self.faker_calls.items(), key=lambda item: -item[1][1])
+        return {
+            "wall_seconds": round(time.perf_counter() - self._started_at, 6),
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "values": dict(sorted(self.values.items(), key=lambda item: -item[1])),
+            "faker": {
+                "calls": sum(calls for calls, _ in self.faker_calls.values()),
+                "seconds": round(sum(seconds for _, seconds in self.faker_calls.values()), 6),
+                "methods": {name: {"calls": calls, "seconds": round(seconds, 6)}
+                            for name, (calls, seconds) in faker},
+            },
+            "caches": caches,
+            "peak_memory_mb": peak_memory_mb(),
+        }
+
+    @staticmethod
+    def _cache_entry(hits: int, misses: int) -> Dict[str, Any]:
+        lookups = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": round(hits / lookups, 4) if lookups else None}
+
+    def format_text(self) -> str:
+        """Format the report for a terminal."""
+        report = self.to_dict()
+        lines = [f"Run statistics ({report['wall_seconds'] * 1000:.1f} ms)", "  phases"]
+        lines += [f"    {name:<26}{seconds * 1000:10.1f} ms" for name, seconds in report['phases'].items()]
+
+        if report['values']:
+            lines.append("  generated values")
+            lines += [f"    {name:<26}{count:10d}" for name, count in report['values'].items()]
+
+        faker = report['faker']
+        if faker['calls']:
+            lines.append(f"  faker: {faker['calls']} call(s), {faker['seconds'] * 1000:.1f} ms")
+            lines += [f"    {name:<26}{entry['calls']:10d}{entry['seconds'] * 1000:10.1f} ms"
+                      for name, entry in list(faker['methods'].items())[:10]]
+
+        if report['caches']:
+            lines.append("  caches")
+            for name, entry in report['caches'].items():
+                rate = f"{entry['hit_rate']:.1%}" if entry['hit_rate'] is not None else '-'
+                lines.append(f"    {name:<26}{entry['hits']:10d} hit(s) {entry['misses']:8d} miss(es) {rate:>7}")
+
+        if report['peak_memory_mb'] is not None:
+            lines.append(f"  peak memory {report['peak_memory_mb']:.1f} MB")
+        return '\n'.join(lines)
@@ -0,0 +1,253 @@
+"""
+Schema reference resolution module.
+Dereferences local `$ref` pointers and merges `allOf` compositions so that
+Swagger/OpenAPI schemas expose their full constraints.
+
+References nested below properties and items are kept as `{"$ref": ...}`
+nodes and resolved on demand with resolve_ref, so that long reference
+chains and recursive schemas do not have to be expanded up front.
+ResolvedSchema exposes such a schema with its nested references resolved
+as they are accessed, for consumers that walk sub-schemas (the generator).
+"""
+
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, Iterator, List, Mapping, Optional, Set
+from urllib.parse import unquote
+
+
+# Keys whose value is a single sub-schema
+_SCHEMA_KEYS = ('items', 'additionalProperties', 'not')
+
+# Keys whose value is a list of sub-schemas
+_COMPOSITION_KEYS = ('allOf', 'oneOf', 'anyOf')
+
+# Stand-in for a reference met again below itself (recursive schema), so
+# that walking the schema ends
+_RECURSIVE_STUB: Mapping[str, Any] = MappingProxyType({'type': 'object'})
+
+
+class SchemaResolver:
+    """Memoizing resolver for local `$ref`, `allOf`, `oneOf` and `anyOf`."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        """
+        Initialize the resolver.
+
+        Args:
+            spec: Complete Swagger/OpenAPI specification
+        """
+        self.spec = spec
+
+        # Resolved component per reference, shared by every referrer
+        self._resolved: Dict[str, Dict[str, Any]] = {}
+
+        # References being resolved, to detect recursive schemas
+        self._in_progress: Set[str] = set()
+
+    def resolve_ref(self, ref: str) -> Dict[str, Any]:
+        """
+        Resolve a reference, dereferencing each component only once.
+
+        A reference met again while it is being resolved (recursive `allOf`)
+        is left as a `{"$ref": ...}` node.
+
+        Args:
+            ref: Local reference (ex: "#/components/schemas/User")
+
+        Returns:
+            Resolved schema
+        """
+        resolved = self._resolved.get(ref)
+        if resolved is not None:
+            return resolved
+
+        if ref in self._in_progress:
+            return {'$ref': ref}
+
+        target = self._lookup(ref)
+        if target is None:
+            # External or dangling reference: keep it as is
+            return {'$ref': ref}
+
+        self._in_progress.add(ref)
+        try:
+            resolved = self.resolve(target)
+        finally:
+            self._in_progress.discard(ref)
+
+        self._resolved[ref] = resolved
+        return resolved
+
+    def resolve(self, schema: Any) -> Any:
+        """
+        Resolve a schema node and everything below it.
+
+        The input is never modified; resolved nodes are new dictionaries.
+        Plain references nested in the node are kept for resolve_ref.
+
+        Args:
+            schema: Schema node
+
+        Returns:
+            Resolved schema node
+        """
+        if not isinstance(schema, dict):
+            return schema
+
+        if '$ref' in schema:
+            target = self.resolve_ref(schema['$ref'])
+            siblings = {key: value for key, value in schema.items() if key != '$ref'}
+            if not siblings:
+                return target
+            # Keywords next to $ref (OpenAPI 3.1) refine the target
+            return self._merge([target, self.resolve(siblings)])
+
+        resolved = {}
+        for key, value in schema.items():
+            if key == 'properties' and isinstance(value, dict):
+                resolved[key] = {name: self._resolve_nested(prop) for name, prop in value.items()}
+            elif key in _SCHEMA_KEYS and isinstance(value, dict):
+                resolved[key] = self._resolve_nested(value)
+            elif key in _COMPOSITION_KEYS and isinstance(value, list):
+                resolved[key] = [self.resolve(item) for item in value]
+            else:
+                resolved[key] = value
+
+        if 'allOf' in resolved:
+            parts = resolved.pop('allOf')
+            resolved = self._merge(parts + [resolved])
+
+        # oneOf / anyOf: the first variant provides constraints for generation
+        for key in ('oneOf', 'anyOf'):
+            variants = resolved.get(key)
+            if variants and isinstance(variants[0], dict) and 'type' not in resolved and 'properties' not in resolved:
+                first = {k: v for k, v in variants[0].items() if k not in _COMPOSITION_KEYS}
+                resolved = {**first, **resolved}
+                break
+
+        return resolved
+
+    def _resolve_nested(self, schema: Any) -> Any:
+        """Resolve a nested node, keeping plain references for later."""
+        if isinstance(schema, dict) and '$ref' in schema and len(schema) == 1:
+            return schema
+        return self.resolve(schema)
+
+    def _merge(self, schemas: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge resolved schemas, later ones taking precedence.
+
+        Properties and required lists are combined instead of replaced.
+
+        Args:
+            schemas: Resolved schemas to merge
+
+        Returns:
+            Merged schema
+        """
+        merged: Dict[str, Any] = {}
+        properties: Dict[str, Any] = {}
+        required: List[str] = []
+
+        for schema in schemas:
+            if not isinstance(schema, dict):
+                continue
+            for key, value in schema.items():
+                if key == 'properties' and isinstance(value, dict):
+                    properties.update(value)
+                elif key == 'required' and isinstance(value, list):
+                    required.extend(name for name in value if name not in required)
+                else:
+                    merged[key] = value
+
+        if properties:
+            merged['properties'] = properties
+            merged.setdefault('type', 'object')
+        if required:
+            merged['required'] = required
+
+        return merged
+
+    def _lookup(self, ref: str) -> Optional[Any]:
+        """
+        Follow a local JSON pointer in the specification.
+
+        Args:
+            ref: Reference starting with "#/"
+
+        Returns:
+            Target node or None if the reference cannot be followed
+        """
+        if not ref.startswith('#/'):
+            return None
+
+        node: Any = self.spec
+        for token in ref[2:].split('/'):
+            token = unquote(token).replace('~1', '/').replace('~0', '~')
+            if isinstance(node, dict) and token in node:
+                node = node[token]
+            elif isinstance(node, list) and token.isdigit() and int(token) < len(node):
+                node = node[int(token)]
+            else:
+                return None
+
+        return node
+
+
+class ResolvedSchema(Mapping):
+    """
+    Read-only view of a resolved schema whose nested references are
+    resolved when accessed.
+
+    Sub-schemas under properties, items, additionalProperties and not are
+    returned as views too, built once per view. A reference met again
+    below itself is replaced by an empty object schema.
+    """
+
+    __slots__ = ('_schema', '_resolver', '_refs', '_children')
+
+    def __init__(self, schema: Dict[str, Any], resolver: SchemaResolver, refs: FrozenSet[str] = frozenset()):
+        """
+        Args:
+            schema: Resolved schema node
+            resolver: Resolver of the spec holding the schema
+            refs: References followed to reach this node
+        """
+        self._schema = schema
+        self._resolver = resolver
+        self._refs = refs
+        self._children: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._schema[key]
+        if not isinstance(value, dict) or (key != 'properties' and key not in _SCHEMA_KEYS):
+            return value
+
+        child = self._children.get(key)
+        if child is None:
+            if key == 'properties':
+                child = MappingProxyType({name: self._view(prop) for name, prop in value.items()})
+            else:
+                child = self._view(value)
+            self._children[key] = child
+        return child
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schema)
+
+    def __len__(self) -> int:
+        return len(self._schema)
+
+    def _view(self, schema: Any) -> Any:
+        """Return the view of a sub-schema, following a plain reference."""
+        if not isinstance(schema, dict):
+            return schema
+
+        refs = self._refs
+        if '$ref' in schema and len(schema) == 1:
+            ref = schema['$ref']
+            if ref in refs:
+                return _RECURSIVE_STUB
+            schema = self._resolver.resolve_ref(ref)
+            refs = refs | {ref}
+        return ResolvedSchema(schema, self._resolver, refs)
@@ -0,0 +1,571 @@
+"""
+Schema validation module.
+Checks generated or anonymized documents against Swagger/OpenAPI schemas.
+
+Each schema is compiled once into a tree of specialized closures: type,
+format, pattern, enum, length and range checks, required properties,
+nested objects and array items. Field paths and error messages are built
+at compile time, so validating a value costs a few calls and no string
+formatting. Errors are aggregated by wildcard path ("users[*].email")
+and message, with counts.
+"""
+
+import ipaddress
+import json
+import re
+from datetime import date, datetime, time as dt_time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from swagger_parser import SwaggerParser
+
+
+# A compiled check adds its errors to the counter and returns True if the value is valid
+Check = Callable[[Any, Dict[Tuple[str, str], int]], bool]
+
+# Number of aggregated errors listed in a report by default
+MAX_REPORTED_ERRORS = 100
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    'string': lambda value: isinstance(value, str),
+    'integer': _is_integer,
+    'number': _is_number,
+    'boolean': lambda value: isinstance(value, bool),
+    'array': lambda value: isinstance(value, list),
+    'object': lambda value: isinstance(value, dict),
+    'null': lambda value: value is None,
+}
+
+
+def _parses(parse: Callable[[str], Any]) -> Callable[[str], bool]:
+    """Build a format check accepting the strings a parser accepts."""
+    def check(value: str) -> bool:
+        try:
+            parse(value)
+        except ValueError:
+            return False
+        return True
+    return check
+
+
+def _is_date_time(value: str) -> bool:
+    # fromisoformat only accepts the "Z" suffix from Python 3.11
+    if value[-1:] in 'Zz':
+        value = value[:-1]
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return 'T' in value or 't' in value or ' ' in value
+
+
+_EMAIL = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+_UUID = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+_URI = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*:\S+')
+_HOSTNAME = re.compile(r'(?=.{1,253}$)[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?'
+                       r'(?:\.[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?)*')
+
+# String formats checked; other formats are accepted as is
+FORMAT_CHECKS: Dict[str, Callable[[str], bool]] = {
+    'email': lambda value: _EMAIL.fullmatch(value) is not None,
+    'date': _parses(date.fromisoformat),
+    'date-time': _is_date_time,
+    'time': _parses(dt_time.fromisoformat),
+    'uuid': lambda value: _UUID.fullmatch(value) is not None,
+    'uri': lambda value: _URI.fullmatch(value) is not None,
+    'url': lambda value: _URI.fullmatch(value) is not None,
+    'hostname': lambda value: _HOSTNAME.fullmatch(value) is not None,
+    'ipv4': _parses(ipaddress.IPv4Address),
+    'ipv6': _parses(ipaddress.IPv6Address),
+}
+
+
+def _accept(value: Any, errors: Dict[Tuple[str, str], int]) -> bool:
+    return True
+
+
+def _join(path: str, key: str) -> str:
+    return f"{path}.{key}" if path else key
+
+
+class ValidationReport:
+    """Validation errors aggregated by path and message."""
+
+    def __init__(self):
+        self.documents = 0
+        self.invalid_documents = 0
+        # (wildcard path, message) -> number of occurrences
+        self.errors: Dict[Tuple[str, str], int] = {}
+
+    @property
+    def valid(self) -> bool:
+        return self.invalid_documents == 0
+
+    def to_dict(self, max_errors: Optional[int] = MAX_REPORTED_ERRORS) -> Dict[str, Any]:
+        """
+        Build the JSON report.
+
+        Args:
+            max_errors: Number of aggregated errors listed, most frequent
+                first (None for all)
+
+        Returns:
+            Validation report
+        """
+        ranked = sorted(self.errors.items(), key=lambda item: -item[1])
+        if max_errors is not None:
+            ranked = ranked[:max_errors]
+
+        return {
+            "valid": self.valid,
+            "documents": self.documents,
+            "invalid_documents": self.invalid_documents,
+            "total_errors": sum(self.errors.values()),
+            "errors": [{"path": path, "message": message, "count": count}
+                       for (path, message), count in ranked],
+            "message": f"{self.invalid_documents} of {self.documents} document(s) invalid, "
+                       f"{len(self.errors)} distinct error(s)"
+        }
+
+
+class SchemaValidator:
+    """Validator compiling the schemas of a Swagger specification."""
+
+    def __init__(self, swagger_parser: SwaggerParser):
+        """
+        Initialize the validator.
+
+        Args:
+            swagger_parser: Parser holding the resolved schemas
+        """
+        self.swagger_parser = swagger_parser
+        self._checks: Dict[Tuple[str, str], Check] = {}
+
+        # Schemas being compiled, to stop on recursive references
+        self._compiling: List[int] = []
+
+    def compile(self, schema_name: str, path: str = "") -> Check:
+        """
+        Return the compiled check of a named schema, compiling it once.
+
+        Args:
+            schema_name: Schema name
+            path: Path of the validated values, used in error messages
+
+        Returns:
+            Compiled check
+        """
+        check = self._checks.get((schema_name, path))
+        if check is None:
+            schema = self.swagger_parser.schemas.get(schema_name)
+            if schema is None:
+                raise ValueError(f"Unknown schema '{schema_name}'.")
+            check = self._checks[(schema_name, path)] = self._compile(schema, path)
+        return check
+
+    def validate(self, document: Any, schema_name: Optional[str] = None,
+                 report: Optional[ValidationReport] = None) -> ValidationReport:
+        """
+        Validate one document.
+
+        Without a schema name, each object of the document is matched with
+        SwaggerParser.find_matching_schema; matched objects are validated
+        with their schema, others are searched for matching children.
+
+        Args:
+            document: Document to validate
+            schema_name: Schema of the whole document (optional)
+            report: Report to add to (default: a new one)
+
+        Returns:
+            Validation report
+        """
+        if report is None:
+            report = ValidationReport()
+
+        report.documents += 1
+        if schema_name is not None:
+            valid = self.compile(schema_name)(document, report.errors)
+        else:
+            valid = self._validate_matched(document, report.errors)
+
+        if not valid:
+            report.invalid_documents += 1
+        return report
+
+    def validate_records(self, records: Iterable[Any], schema_name: Optional[str] = None,
+                         report: Optional[ValidationReport] = None) -> ValidationReport:
+        """
+        Validate a sequence of documents.
+
+        Args:
+            records: Documents to validate
+            schema_name: Schema of each document (optional, see validate)
+            report: Report to add to (default: a new one)
+
+        Returns:
+            Validation report
+        """
+        if report is None:
+            report = ValidationReport()
+
+        for record in records:
+            self.validate(record, schema_name, report)
+        return report
+
+    def validate_ndjson(self, lines: Iterable[str], schema_name: Optional[str] = None,
+                        report: Optional[ValidationReport] = None) -> ValidationReport:
+        """
+        Validate newline-delimited JSON records one line at a time.
+
+        Args:
+            lines: Lines with one JSON document each (blank lines are skipped)
+            schema_name: Schema of each document (optional, see validate)
+            report: Report to add to (default: a new one)
+
+        Returns:
+            Validation report
+        """
+        return self.validate_records((json.loads(line) for line in lines if line.strip()),
+                                     schema_name, report)
+
+    def _validate_matched(self, document: Any, errors: Dict[Tuple[str, str], int]) -> bool:
+        """Validate the objects of a document against their matching schemas."""
+        find_matching_schema = self.swagger_parser.find_matching_schema
+        valid = True
+
+        stack = [(document, "")]
+        while stack:
+            node, path = stack.pop()
+
+            if isinstance(node, dict):
+                schema_name = find_matching_schema(node)
+                if schema_name is not None:
+                    if not self.compile(schema_name, path)(node, errors):
+                        valid = False
+                    continue
+                stack.extend((value, _join(path, key)) for key, value in node.items()
+                             if isinstance(value, (dict, list)))
+
+            elif isinstance(node, list):
+                item_path = f"{path}[*]"
+                stack.extend((item, item_path) for item in node if isinstance(item, (dict, list)))
+
+        return valid
+
+    def _compile(self, schema: Any, path: str) -> Check:
+        """
+        Compile a schema node into a check.
+
+        Args:
+            schema: Resolved schema node
+            path: Wildcard path of the values it validates
+
+        Returns:
+            Compiled check
+        """
+        if isinstance(schema, dict) and '$ref' in schema:
+            schema = self.swagger_parser._resolver.resolve_ref(schema['$ref'])
+        if not isinstance(schema, dict) or '$ref' in schema:
+            # Unresolvable reference
+            return _accept
+
+        if id(schema) in self._compiling:
+            return self._compile_lazily(schema, path)
+
+        self._compiling.append(id(schema))
+        try:
+            variants = schema.get('oneOf') or schema.get('anyOf')
+            if isinstance(variants, list) and variants:
+                return self._compile_variants(variants, path)
+            return self._compile_node(schema, path)
+        finally:
+            self._compiling.pop()
+
+    def _compile_lazily(self, schema: Dict[str, Any], path: str) -> Check:
+        """Compile a recursive schema on its first use only."""
+        compiled: Optional[Check] = None
+
+        def check(value, errors):
+            nonlocal compiled
+            if compiled is None:
+                compiled = self._compile(schema, path)
+            return compiled(value, errors)
+
+        return check
+
+    def _compile_variants(self, variants: List[Any], path: str) -> Check:
+        """
+        Compile oneOf/anyOf: a value is valid if any variant accepts it.
+
+        Keys the resolver merged from the first variant are not checked
+        on their own.
+        """
+        checks = [self._compile(variant, path) for variant in variants]
+        error = (path, f"matches none of the {len(checks)} schema variants")
+
+        def check(value, errors):
+            for variant_check in checks:
+                if variant_check(value, {}):
+                    return True
+            errors[error] = errors.get(error, 0) + 1
+            return False
+
+        return check
+
+    def _compile_node(self, schema: Dict[str, Any], path: str) -> Check:
+        """Compile the keywords of one schema node."""
+        type_check = self._compile_type(schema)
+        type_error = (path, f"expected type {schema.get('type')}")
+        nullable = bool(schema.get('nullable'))
+
+        checks: List[Check] = []
+        enum = schema.get('enum')
+        if isinstance(enum, list):
+            checks.append(self._compile_enum(enum, path))
+        checks.extend(self._compile_string(schema, path))
+        checks.extend(self._compile_number(schema, path))
+        checks.extend(self._compile_array(schema, path))
+        checks.extend(self._compile_object(schema, path))
+
+        if type_check is None and not checks:
+            return _accept
+
+        def check(value, errors):
+            if value is None and nullable:
+                return True
+            if type_check is not None and not type_check(value):
+                errors[type_error] = errors.get(type_error, 0) + 1
+                return False
+
+            valid = True
+            for keyword_check in checks:
+                if not keyword_check(value, errors):
+                    valid = False
+            return valid
+
+        return check
+
+    def _compile_type(self, schema: Dict[str, Any]) -> Optional[Callable[[Any], bool]]:
+        """Build the type test of a node (None when any type is allowed)."""
+        expected = schema.get('type')
+        if isinstance(expected, str):
+            return TYPE_CHECKS.get(expected)
+
+        if isinstance(expected, list):
+            type_checks = [TYPE_CHECKS[name] for name in expected if name in TYPE_CHECKS]
+            if type_checks:
+                return lambda value: any(type_check(value) for type_check in type_checks)
+
+        return None
+
+    def _compile_enum(self, enum: List[Any], path: str) -> Check:
+        """Build the enum check, with a set lookup when the values allow it."""
+        error = (path, f"not one of the {len(enum)} allowed values")
+        try:
+            allowed = frozenset(enum)
+        except TypeError:
+            allowed = enum
+
+        def check(value, errors):
+            try:
+                if value in allowed:
+                    return True
+            except TypeError:
+                # Unhashable value (object or array)
+                if value in enum:
+                    return True
+            errors[error] = errors.get(error, 0) + 1
+            return False
+
+        return check
+
+    def _compile_string(self, schema: Dict[str, Any], path: str) -> List[Check]:
+        """Build the length, pattern and format checks of a string node."""
+        tests: List[Tuple[Callable[[str], bool], Tuple[str, str]]] = []
+
+        min_length = schema.get('minLength')
+        if isinstance(min_length, int):
+            tests.append((lambda value: len(value) >= min_length, (path, f"string too short (min: {min_length})")))
+
+        max_length = schema.get('maxLength')
+        if isinstance(max_length, int):
+            tests.append((lambda value: len(value) <= max_length, (path, f"string too long (max: {max_length})")))
+
+        pattern = schema.get('pattern')
+        if isinstance(pattern, str):
+            try:
+                search = re.compile(pattern).search
+            except re.error:
+                search = None
+            if search is not None:
+                tests.append((lambda value: search(value) is not None,
+                              (path, f"does not match pattern {pattern}")))
+
+        format_check = FORMAT_CHECKS.get(schema.get('format'))
+        if format_check is not None:
+            tests.append((format_check, (path, f"invalid {schema['format']} format")))
+
+        return [self._guarded(str, tests)] if tests else []
+
+    def _compile_number(self, schema: Dict[str, Any], path: str) -> List[Check]:
+        """Build the range and multipleOf checks of a numeric node."""
+        tests: List[Tuple[Callable[[Any], bool], Tuple[str, str]]] = []
+
+        minimum = schema.get('minimum')
+        exclusive_minimum = schema.get('exclusiveMinimum')
+        if _is_number(exclusive_minimum):
+            # OpenAPI 3.1: the exclusive bound itself
+            tests.append((lambda value: value > exclusive_minimum,
+                          (path, f"value too small (exclusive min: {exclusive_minimum})")))
+        elif _is_number(minimum) and exclusive_minimum is True:
+            tests.append((lambda value: value > minimum, (path, f"value too small (exclusive min: {minimum})")))
+        elif _is_number(minimum):
+            tests.append((lambda value: value >= minimum, (path, f"value too small (min: {minimum})")))
+
+        maximum = schema.get('maximum')
+        exclusive_maximum = schema.get('exclusiveMaximum')
+        if _is_number(exclusive_maximum):
+            tests.append((lambda value: value < exclusive_maximum,
+                          (path, f"value too large (exclusive max: {exclusive_maximum})")))
+        elif _is_number(maximum) and exclusive_maximum is True:
+            tests.append((lambda value: value < maximum, (path, f"value too large (exclusive max: {maximum})")))
+        elif _is_number(maximum):
+            tests.append((lambda value: value <= maximum, (path, f"value too large (max: {maximum})")))
+
+        multiple_of = schema.get('multipleOf')
+        if _is_number(multiple_of) and multiple_of > 0:
+            tests.append((lambda value: (value / multiple_of).is_integer(),
+                          (path, f"not a multiple of {multiple_of}")))
+
+        if not tests:
+            return []
+
+        numeric = self._guarded((int, float), tests)
+
+        def check(value, errors):
+            # Booleans are ints in Python, but not numbers in JSON
+            return isinstance(value, bool) or numeric(value, errors)
+
+        return [check]
+
+    def _compile_array(self, schema: Dict[str, Any], path: str) -> List[Check]:
+        """Build the size, uniqueness and item checks of an array node."""
+        tests: List[Tuple[Callable[[list], bool], Tuple[str, str]]] = []
+
+        min_items = schema.get('minItems')
+        if isinstance(min_items, int) and min_items > 0:
+            tests.append((lambda value: len(value) >= min_items, (path, f"too few items (min: {min_items})")))
+
+        max_items = schema.get('maxItems')
+        if isinstance(max_items, int):
+            tests.append((lambda value: len(value) <= max_items, (path, f"too many items (max: {max_items})")))
+
+        if schema.get('uniqueItems') is True:
+            tests.append((lambda value: len({json.dumps(item, sort_keys=True) for item in value}) == len(value),
+                          (path, "items are not unique")))
+
+        checks = [self._guarded(list, tests)] if tests else []
+
+        items = schema.get('items')
+        if isinstance(items, dict):
+            item_check = self._compile(items, f"{path}[*]")
+            if item_check is not _accept:
+                def check_items(value, errors):
+                    if not isinstance(value, list):
+                        return True
+                    valid = True
+                    for item in value:
+                        if not item_check(item, errors):
+                            valid = False
+                    return valid
+
+                checks.append(check_items)
+
+        return checks
+
+    def _compile_object(self, schema: Dict[str, Any], path: str) -> List[Check]:
+        """Build the required, property and additional property checks of an object node."""
+        checks: List[Check] = []
+
+        required = schema.get('required')
+        if isinstance(required, list) and required:
+            missing = [(name, (_join(path, name), "missing required property")) for name in required]
+
+            def check_required(value, errors):
+                if not isinstance(value, dict):
+                    return True
+                valid = True
+                for name, error in missing:
+                    if name not in value:
+                        errors[error] = errors.get(error, 0) + 1
+                        valid = False
+                return valid
+
+            checks.append(check_required)
+
+        properties = schema.get('properties')
+        property_checks: Dict[str, Check] = {}
+        if isinstance(properties, dict):
+            for name, property_schema in properties.items():
+                property_check = self._compile(property_schema, _join(path, name))
+                if property_check is not _accept:
+                    property_checks[name] = property_check
+
+        additional = schema.get('additionalProperties')
+        additional_check: Optional[Check] = None
+        known = frozenset(properties) if isinstance(properties, dict) else frozenset()
+        if additional is False:
+            additional_error = (path, "unexpected property")
+
+            def additional_check(value, errors):
+                errors[additional_error] = errors.get(additional_error, 0) + 1
+                return False
+        elif isinstance(additional, dict):
+            additional_check = self._compile(additional, _join(path, '*'))
+            if additional_check is _accept:
+                additional_check = None
+
+        if property_checks or additional_check is not None:
+            def check_properties(value, errors):
+                if not isinstance(value, dict):
+                    return True
+                valid = True
+                for name, child in value.items():
+                    property_check = property_checks.get(name)
+                    if property_check is not None:
+                        if not property_check(child, errors):
+                            valid = False
+                    elif additional_check is not None and name not in known:
+                        if not additional_check(child, errors):
+                            valid = False
+                return valid
+
+            checks.append(check_properties)
+
+        return checks
+
+    @staticmethod
+    def _guarded(value_type: Any, tests: List[Tuple[Callable[[Any], bool], Tuple[str, str]]]) -> Check:
+        """Combine tests that only apply to values of a given type."""
+        def check(value, errors):
+            if not isinstance(value, value_type):
+                return True
+            valid = True
+            for test, error in tests:
+                if not test(value):
+                    errors[error] = errors.get(error, 0) + 1
+                    valid = False
+            return valid
+
+        return check
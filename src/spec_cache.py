@@ -0,0 +1,215 @@
+"""
+On-disk cache of parsed Swagger/OpenAPI specifications.
+Stores each parsed and resolved spec in a pickle file so that later runs
+skip YAML parsing and `$ref` resolution.
+
+Entries are keyed by the absolute path of the spec. Each entry records the
+file mtime, size and SHA-256 content hash:
+
+- mtime and size unchanged: the entry is used without reading the spec
+- mtime or size changed but same content hash: the entry is used and its
+  header refreshed (e.g. after a checkout or a `touch`)
+- otherwise, or when CACHE_VERSION / the Python version differ: the spec
+  is parsed again and the entry rewritten
+
+The cache directory is bounded by MAX_CACHE_BYTES; the least recently used
+entries are removed when a new entry is written. Set JSON_TOOLS_CACHE_DIR
+to move the cache, or to "off" to disable it.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# Bump when the cached payload layout changes
+CACHE_VERSION = 1
+
+# Total size of the cache directory
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+CACHE_DIR_ENV = 'JSON_TOOLS_CACHE_DIR'
+
+_ENTRY_SUFFIX = '.spec.pickle'
+
+
+def default_cache_dir() -> Optional[Path]:
+    """
+    Return the cache directory, or None if caching is disabled.
+
+    Returns:
+        JSON_TOOLS_CACHE_DIR if set, otherwise the user cache directory
+    """
+    configured = os.environ.get(CACHE_DIR_ENV)
+    if configured is not None:
+        if configured.strip().lower() in ('', '0', 'off', 'none', 'false'):
+            return None
+        return Path(configured).expanduser()
+
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'json-tools' / 'specs'
+
+
+class SpecCache:
+    """Persistent cache of parsed specifications."""
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = MAX_CACHE_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Cache directory (default: default_cache_dir())
+            max_bytes: Maximum total size of the cache entries
+        """
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        """True when the cache has a directory."""
+        return self.directory is not None
+
+    def load(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached payload of a spec file if it is still valid.
+
+        Args:
+            file_path: Path to the spec file
+
+        Returns:
+            Cached payload, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        source = Path(file_path).resolve()
+        entry_path = self._entry_path(source)
+        try:
+            stat = source.stat()
+            with open(entry_path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or entry.get('version') != self._version():
+            return None
+
+        if entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            try:
+                content_hash = hashlib.sha256(source.read_bytes()).hexdigest()
+            except OSError:
+                return None
+            if content_hash != entry['content_hash']:
+                return None
+            # Same content under a new mtime: refresh the header
+            entry['mtime_ns'], entry['size'] = stat.st_mtime_ns, stat.st_size
+            self._write(entry_path, entry)
+        else:
+            self._touch(entry_path)
+
+        return entry['payload']
+
+    def store(self, file_path: str, content: bytes, payload: Dict[str, Any]):
+        """
+        Store the payload of a spec file.
+
+        Failures to write are ignored: the cache is an optimization only.
+
+        Args:
+            file_path: Path to the spec file
+            content: Raw content the payload was parsed from
+            payload: Picklable payload
+        """
+        if not self.enabled:
+            return
+
+        source = Path(file_path).resolve()
+        try:
+            stat = source.stat()
+        except OSError:
+            return
+
+        entry = {
+            'version': self._version(),
+            'path': str(source),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'content_hash': hashlib.sha256(content).hexdigest(),
+            'payload': payload,
+        }
+        if self._write(self._entry_path(source), entry):
+            self.prune()
+
+    def prune(self):
+        """Remove the least recently used entries above max_bytes."""
+        if not self.enabled:
+            return
+
+        entries = []
+        try:
+            for entry_path in self.directory.glob('*' + _ENTRY_SUFFIX):
+                stat = entry_path.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry_path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove every cache entry."""
+        if not self.enabled or not self.directory.is_dir():
+            return
+
+        for entry_path in self.directory.glob('*' + _ENTRY_SUFFIX):
+            try:
+                entry_path.unlink()
+            except OSError:
+                pass
+
+    def _entry_path(self, source: Path) -> Path:
+        """Entry file of a spec path."""
+        name = hashlib.sha256(str(source).encode('utf-8')).hexdigest()[:32]
+        return self.directory / (name + _ENTRY_SUFFIX)
+
+    def _version(self) -> str:
+        """Version tag stored in entries, invalidating them on upgrades."""
+        return f"{CACHE_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:{pickle.HIGHEST_PROTOCOL}"
+
+    def _write(self, entry_path: Path, entry: Dict[str, Any]) -> bool:
+        """Write an entry atomically; return False on failure."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, entry_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except (OSError, pickle.PicklingError, RecursionError):
+            return False
+        return True
+
+    @staticmethod
+    def _touch(entry_path: Path):
+        """Mark an entry as recently used for the pruning order."""
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
@@ -4,10 +4,43 @@ Extracts schemas and constraints for data generation.
 """
 
 import json
-import yaml
-from typing import Dict, Any, Optional
+import re
+from types import MappingProxyType
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Mapping, Tuple
 from pathlib import Path
 
+from schema_resolver import ResolvedSchema, SchemaResolver
+from spec_cache import SpecCache
+
+
+# Schema keys copied into field constraints
+CONSTRAINT_KEYS = (
+    'type', 'format', 'minLength', 'maxLength', 'minimum', 'maximum', 'pattern',
+    'enum', 'items', 'minItems', 'maxItems', 'properties',
+)
+
+# Nesting depth indexed eagerly below each schema ("Schema.field",
+# "Schema.field[]", "Schema.field.sub"); deeper paths are indexed on first lookup
+EAGER_INDEX_DEPTH = 2
+
+# Array indices in field paths ("users[3].email" -> "users[].email")
+_ARRAY_INDEX = re.compile(r'\[\d+\]')
+
+# Path segments after the schema name: ".field" or "[]"
+_PATH_SEGMENT = re.compile(r'\.([^.\[]+)|\[\]')
+
+_NO_CONSTRAINTS: Mapping[str, Any] = MappingProxyType({})
+
+# Number of memoized find_matching_schema results
+MATCH_CACHE_SIZE = 4096
+
+# Number of loaded specs whose parser is kept for SwaggerParser.for_spec
+LOADED_PARSERS_SIZE = 8
+
+# id(spec) -> (spec, parser); the spec is kept so that its id stays unique
+_LOADED_PARSERS: "OrderedDict[int, Tuple[Dict[str, Any], SwaggerParser]]" = OrderedDict()
+
 
 class SwaggerParser:
     """Swagger/OpenAPI file parser."""
@@ -16,12 +49,24 @@ class SwaggerParser:
         self.swagger_spec = None
         self.schemas = {}
         
-    def load_swagger(self, file_path: str) -> Dict[str, Any]:
+        # Normalized field path -> schema (None if unknown) / frozen constraints,
+        # see _build_index
+        self._schema_index: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._constraint_index: Dict[str, Mapping[str, Any]] = {}
+        self._resolver = SchemaResolver({})
+        
+        # Property name -> ranks in _match_schemas, see _build_match_index
+        self._property_index: Optional[Dict[str, List[int]]] = None
+        self._match_schemas: List[Tuple[str, Dict[str, Any]]] = []
+        self._match_cache: "OrderedDict[frozenset, Optional[str]]" = OrderedDict()
+        
+    def load_swagger(self, file_path: str, cache: Optional[SpecCache] = None) -> Dict[str, Any]:
         """
         Load a Swagger/OpenAPI file.
         
         Args:
             file_path: Path to the Swagger file
+            cache: On-disk cache of parsed specs (optional)
             
         Returns:
             Parsed Swagger specification
@@ -29,20 +74,62 @@ class SwaggerParser:
         file_path_obj = Path(file_path)
         
         try:
-            with open(file_path_obj, 'r', encoding='utf-8') as f:
+            cached = cache.load(file_path) if cache is not None else None
+            if cached is not None:
+                self.swagger_spec = cached['spec']
+                self.schemas = cached['schemas']
+                self._resolver = cached['resolver']
+                self._build_index()
+            else:
+                content = file_path_obj.read_bytes()
                 if file_path_obj.suffix.lower() in ['.yaml', '.yml']:
-                    self.swagger_spec = yaml.safe_load(f)
+                    import yaml
+                    # libyaml-based loader when available, several times faster
+                    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+                    self.swagger_spec = yaml.load(content, Loader=loader)
                 else:
-                    self.swagger_spec = json.load(f)
-            
-            # Extract schemas
-            self._extract_schemas()
+                    self.swagger_spec = json.loads(content.decode('utf-8'))
+                
+                # Extract schemas
+                self._extract_schemas()
+                
+                if cache is not None:
+                    cache.store(file_path, content, {
+                        'spec': self.swagger_spec,
+                        'schemas': self.schemas,
+                        'resolver': self._resolver,
+                    })
             
+            _register_parser(self)
             return self.swagger_spec
             
         except Exception as e:
             raise ValueError(f"Error loading Swagger file: {str(e)}")
     
+    @classmethod
+    def for_spec(cls, swagger_spec: Dict[str, Any]) -> 'SwaggerParser':
+        """
+        Return a parser for an already loaded specification.
+        
+        The parser that loaded this exact spec object is reused when it is
+        still known, so its resolved schemas and index are not rebuilt.
+        
+        Args:
+            swagger_spec: Swagger specification
+            
+        Returns:
+            Parser with extracted schemas
+        """
+        entry = _LOADED_PARSERS.get(id(swagger_spec))
+        if entry is not None and entry[0] is swagger_spec:
+            return entry[1]
+        
+        swagger_parser = cls()
+        swagger_parser.swagger_spec = swagger_spec
+        swagger_parser._extract_schemas()
+        _register_parser(swagger_parser)
+        return swagger_parser
+    
     def _extract_schemas(self):
         """Extract schemas from the Swagger specification."""
         if not self.swagger_spec:
@@ -50,104 +137,267 @@ class SwaggerParser:
         
         # OpenAPI 3.x
         if 'components' in self.swagger_spec:
-            self.schemas = self.swagger_spec.get('components', {}).get('schemas', {})
+            raw_schemas = self.swagger_spec.get('components', {}).get('schemas', {})
+            ref_prefix = '#/components/schemas/'
         
         # Swagger 2.x
         elif 'definitions' in self.swagger_spec:
-            self.schemas = self.swagger_spec.get('definitions', {})
+            raw_schemas = self.swagger_spec.get('definitions', {})
+            ref_prefix = '#/definitions/'
+        
+        else:
+            raw_schemas, ref_prefix = {}, ''
+        
+        # Dereference $ref and merge allOf, each component only once
+        self._resolver = resolver = SchemaResolver(self.swagger_spec)
+        self.schemas = {
+            name: resolver.resolve_ref(ref_prefix + name.replace('~', '~0').replace('/', '~1'))
+            for name in (raw_schemas or {})
+        }
+        
+        self._build_index()
     
-    def get_schema_for_field(self, field_path: str) -> Optional[Dict[str, Any]]:
+    def _build_index(self):
         """
-        Retrieve the schema for a given field.
+        Index the field paths of every schema.
+        
+        Paths are "Schema.field", nested properties add ".sub" and array
+        items add "[]" (e.g. "User.addresses[].city"). Each path maps to its
+        schema and to a read-only constraint mapping built once. Shallow
+        paths are indexed here, deeper ones on their first lookup.
+        """
+        self._schema_index = {}
+        self._constraint_index = {}
+        
+        # Schema matching index, built on the first find_matching_schema call
+        self._property_index = None
+        self._match_cache = OrderedDict()
+        
+        for schema_name, schema in self.schemas.items():
+            if isinstance(schema, dict):
+                self._index_children(schema_name, schema, 0)
+    
+    def _index_children(self, path: str, schema: Dict[str, Any], depth: int):
+        """
+        Index the properties and array items below a schema.
+        
+        Args:
+            path: Normalized path of the schema
+            schema: Schema to index
+            depth: Current nesting depth
+        """
+        if depth >= EAGER_INDEX_DEPTH:
+            return
+        
+        properties = schema.get('properties')
+        if isinstance(properties, dict):
+            for field_name, field_schema in properties.items():
+                if isinstance(field_schema, dict):
+                    self._index_field(f"{path}.{field_name}", field_schema, depth + 1)
+        
+        items = schema.get('items')
+        if isinstance(items, dict):
+            self._index_field(f"{path}[]", items, depth + 1)
+    
+    def _index_field(self, path: str, schema: Optional[Dict[str, Any]], depth: int = EAGER_INDEX_DEPTH):
+        """Index one field path (None for unknown paths) and its children."""
+        if path in self._constraint_index:
+            return
+        if schema and '$ref' in schema:
+            schema = self._resolver.resolve_ref(schema['$ref'])
+        
+        self._schema_index[path] = schema
+        self._constraint_index[path] = self._extract_constraints(schema) if schema else _NO_CONSTRAINTS
+        if schema:
+            self._index_children(path, schema, depth)
+    
+    def _index_path(self, field_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a field path that is not indexed yet and index it.
         
         Args:
-            field_path: Field path (ex: "User.email")
+            field_path: Field path
             
         Returns:
             Field schema or None if not found
         """
-        if not self.schemas:
+        path = self._normalize_path(field_path)
+        if path not in self._constraint_index:
+            self._index_field(path, self._walk_path(path))
+        return self._schema_index[path]
+    
+    def _walk_path(self, path: str) -> Optional[Dict[str, Any]]:
+        """Follow a normalized field path through the schemas."""
+        schema_name_end = len(path)
+        for separator in '.[':
+            position = path.find(separator)
+            if position != -1:
+                schema_name_end = min(schema_name_end, position)
+        
+        schema = self.schemas.get(path[:schema_name_end])
+        if schema_name_end == len(path):
+            # A schema name alone is not a field
             return None
         
-        path_parts = field_path.split('.')
+        position = schema_name_end
+        while position < len(path):
+            match = _PATH_SEGMENT.match(path, position)
+            if match is None or not isinstance(schema, dict):
+                return None
+            if '$ref' in schema:
+                # Nested references are resolved on demand
+                schema = self._resolver.resolve_ref(schema['$ref'])
+            
+            if match.group(1) is not None:
+                schema = (schema.get('properties') or {}).get(match.group(1))
+            else:
+                schema = schema.get('items')
+            position = match.end()
         
-        if len(path_parts) < 2:
-            return None
+        return schema if isinstance(schema, dict) else None
+    
+    def _extract_constraints(self, schema: Dict[str, Any]) -> Mapping[str, Any]:
+        """
+        Build the read-only constraint mapping of a field schema.
         
-        schema_name = path_parts[0]
-        field_name = path_parts[1]
+        Nested references under items and properties are resolved when the
+        generator reaches them (see ResolvedSchema).
         
-        if schema_name in self.schemas:
-            schema = self.schemas[schema_name]
-            properties = schema.get('properties', {})
+        Args:
+            schema: Field schema
             
-            if field_name in properties:
-                return properties[field_name]
+        Returns:
+            Constraints (empty mapping if the schema has none)
+        """
+        view = ResolvedSchema(schema, self._resolver)
+        constraints = {key: view[key] for key in CONSTRAINT_KEYS if key in schema}
+        return MappingProxyType(constraints) if constraints else _NO_CONSTRAINTS
+    
+    def _normalize_path(self, field_path: str) -> str:
+        """Replace array indices in a field path by "[]"."""
+        return _ARRAY_INDEX.sub('[]', field_path) if '[' in field_path else field_path
+    
+    def get_schema_for_field(self, field_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the schema for a given field.
         
-        return None
+        Args:
+            field_path: Field path (ex: "User.email", "User.address.city",
+                "User.tags[0]")
+            
+        Returns:
+            Field schema or None if not found
+        """
+        if field_path in self._schema_index:
+            return self._schema_index[field_path]
+        return self._index_path(field_path)
     
-    def get_constraints_for_field(self, field_path: str) -> Dict[str, Any]:
+    def get_constraints_for_field(self, field_path: str) -> Mapping[str, Any]:
         """
         Retrieve constraints for a given field.
         
+        Constraints come from the path index (see _build_index), so a
+        repeated lookup is a dictionary hit returning a shared read-only
+        mapping.
+        
         Args:
             field_path: Field path
             
         Returns:
-            Dictionary of constraints
+            Mapping of constraints (empty if the field is unknown)
         """
-        schema = self.get_schema_for_field(field_path)
-        
-        if not schema:
-            return {}
+        constraints = self._constraint_index.get(field_path)
+        if constraints is None:
+            self._index_path(field_path)
+            constraints = self._constraint_index[self._normalize_path(field_path)]
+        return constraints
+    
+    def find_matching_schema(self, json_structure: Dict[str, Any]) -> Optional[str]:
+        """
+        Find the schema that best matches a JSON structure.
         
-        constraints = {}
+        Only schemas sharing a property name with the structure can match.
+        They are found through an inverted index and scored in decreasing
+        order of their best possible score, stopping once no remaining
+        candidate can beat the best match. Results are memoized per set of
+        keys and value types.
         
-        # Type constraints
-        if 'type' in schema:
-            constraints['type'] = schema['type']
+        Args:
+            json_structure: JSON structure to analyze
+            
+        Returns:
+            Matching schema name or None
+        """
+        if not self.schemas:
+            return None
         
-        # Format constraints
-        if 'format' in schema:
-            constraints['format'] = schema['format']
+        if self._property_index is None:
+            self._build_match_index()
         
-        # Length constraints
-        if 'minLength' in schema:
-            constraints['minLength'] = schema['minLength']
-        if 'maxLength' in schema:
-            constraints['maxLength'] = schema['maxLength']
+        signature = frozenset((key, type(value)) for key, value in json_structure.items())
+        if signature in self._match_cache:
+            self._match_cache.move_to_end(signature)
+            return self._match_cache[signature]
         
-        # Numeric constraints
-        if 'minimum' in schema:
-            constraints['minimum'] = schema['minimum']
-        if 'maximum' in schema:
-            constraints['maximum'] = schema['maximum']
+        best_match = self._find_best_candidate(json_structure)
         
-        # Regex pattern
-        if 'pattern' in schema:
-            constraints['pattern'] = schema['pattern']
+        self._match_cache[signature] = best_match
+        if len(self._match_cache) > MATCH_CACHE_SIZE:
+            self._match_cache.popitem(last=False)
+        return best_match
+    
+    def match_document(self, document: Any) -> Dict[str, Optional[str]]:
+        """
+        Match every object of a document against the schemas in one pass.
         
-        # Enumeration
-        if 'enum' in schema:
-            constraints['enum'] = schema['enum']
+        Args:
+            document: JSON document
+            
+        Returns:
+            Path of each object ("" for the root, e.g. "users[0].address")
+            -> matching schema name or None, in document order
+        """
+        matches: Dict[str, Optional[str]] = {}
+        stack = [(document, "")]
         
-        # Array constraints
-        if 'items' in schema:
-            constraints['items'] = schema['items']
-        if 'minItems' in schema:
-            constraints['minItems'] = schema['minItems']
-        if 'maxItems' in schema:
-            constraints['maxItems'] = schema['maxItems']
+        while stack:
+            node, path = stack.pop()
+            
+            if isinstance(node, dict):
+                matches[path] = self.find_matching_schema(node)
+                children = [(value, f"{path}.{key}" if path else key) for key, value in node.items()
+                            if isinstance(value, (dict, list))]
+            elif isinstance(node, list):
+                children = [(item, f"{path}[{i}]") for i, item in enumerate(node)
+                            if isinstance(item, (dict, list))]
+            else:
+                continue
+            
+            # Reversed so that objects come out in document order
+            stack.extend(reversed(children))
         
-        # Object properties
-        if 'properties' in schema:
-            constraints['properties'] = schema['properties']
+        return matches
+    
+    def _build_match_index(self):
+        """Index the schemas with properties by property name."""
+        self._match_schemas = []
+        self._property_index = {}
         
-        return constraints
+        for schema_name, schema in self.schemas.items():
+            if not isinstance(schema, dict) or not schema.get('properties'):
+                continue
+            
+            rank = len(self._match_schemas)
+            self._match_schemas.append((schema_name, schema['properties']))
+            for key in schema['properties']:
+                self._property_index.setdefault(key, []).append(rank)
     
-    def find_matching_schema(self, json_structure: Dict[str, Any]) -> Optional[str]:
+    def _find_best_candidate(self, json_structure: Dict[str, Any]) -> Optional[str]:
         """
-        Find the schema that best matches a JSON structure.
+        Score the candidate schemas of a JSON structure.
+        
+        Gives the same result as scoring every schema with
+        _calculate_match_score, ties going to the first schema.
         
         Args:
             json_structure: JSON structure to analyze
@@ -155,20 +405,42 @@ class SwaggerParser:
         Returns:
             Matching schema name or None
         """
-        if not self.schemas:
-            return None
-        
-        best_match = None
+        # Number of keys shared with each candidate schema
+        common_counts: Dict[int, int] = {}
+        for key in json_structure:
+            for rank in self._property_index.get(key, ()):
+                common_counts[rank] = common_counts.get(rank, 0) + 1
+        
+        # Upper bound of each score, assuming every common key has the right type
+        json_key_count = len(json_structure)
+        candidates = []
+        for rank, common in common_counts.items():
+            total = json_key_count + len(self._match_schemas[rank][1]) - common
+            bound = (common / total * 0.6) + 0.4
+            if bound > 0.5:
+                candidates.append((-bound, rank))
+        candidates.sort()
+        
+        best_rank = None
         best_score = 0
-        
-        for schema_name, schema in self.schemas.items():
-            score = self._calculate_match_score(json_structure, schema)
+        for negative_bound, rank in candidates:
+            if -negative_bound < best_score:
+                break
+            
+            schema_properties = self._match_schemas[rank][1]
+            common_keys = [key for key in json_structure if key in schema_properties]
+            key_score = len(common_keys) / (json_key_count + len(schema_properties) - len(common_keys))
+            type_matches = sum(1 for key in common_keys
+                               if self._types_match(json_structure[key], schema_properties[key]))
+            score = (key_score * 0.6) + (type_matches / len(common_keys) * 0.4)
             
-            if score > best_score:
+            if score > best_score or (score == best_score and best_rank is not None and rank < best_rank):
                 best_score = score
-                best_match = schema_name
+                best_rank = rank
         
-        return best_match if best_score > 0.5 else None
+        if best_rank is None or best_score <= 0.5:
+            return None
+        return self._match_schemas[best_rank][0]
     
     def _calculate_match_score(self, json_structure: Dict[str, Any], 
                              schema: Dict[str, Any]) -> float:
@@ -252,4 +524,16 @@ class SwaggerParser:
         Returns:
             Dictionary of schemas
         """
-        return self.schemas 
\ No newline at end of file
+        return self.schemas 
+
+
+def _register_parser(swagger_parser: SwaggerParser):
+    """Remember the parser of a loaded spec for SwaggerParser.for_spec."""
+    spec = swagger_parser.swagger_spec
+    if not spec:
+        return
+    
+    _LOADED_PARSERS[id(spec)] = (spec, swagger_parser)
+    _LOADED_PARSERS.move_to_end(id(spec))
+    if len(_LOADED_PARSERS) > LOADED_PARSERS_SIZE:
+        _LOADED_PARSERS.popitem(last=False)
@@ -0,0 +1,151 @@
+"""
+JSON tree traversal module.
+Walks parsed JSON documents with an explicit stack instead of Python
+recursion, calling visitor callbacks on every node.
+
+Nesting depth is therefore only bounded by memory, not by the recursion
+limit. Paths ("users[0].email") are built lazily: the walker only links
+path nodes, and their text is formatted the first time a visitor asks
+for it.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+
+class NodePath:
+    """Lazily formatted path of a node in a JSON document."""
+
+    __slots__ = ('parent', 'key', 'is_list', '_text')
+
+    def __init__(self, parent: Optional['NodePath'] = None, key: Any = None, is_list: bool = False):
+        """
+        Args:
+            parent: Path of the enclosing container (None for the root)
+            key: Object key or array index of the node in its parent
+            is_list: Whether the node itself is an array
+        """
+        self.parent = parent
+        self.key = key
+        self.is_list = is_list
+        self._text: Optional[str] = '' if parent is None else None
+
+    @property
+    def in_object(self) -> bool:
+        """Whether the node is held by an object key."""
+        return self.parent is not None and not self.parent.is_list
+
+    def child(self, key: Any, is_list: bool = False) -> 'NodePath':
+        """Return the path of a child of this node."""
+        return NodePath(self, key, is_list)
+
+    def child_text(self, key: Any) -> str:
+        """Return the text of a child path without building its node."""
+        prefix = str(self)
+        if key is None:
+            return prefix
+        if self.is_list:
+            return f"{prefix}[{key}]"
+        return f"{prefix}.{key}" if prefix else key
+
+    def __str__(self) -> str:
+        if self._text is None:
+            # Format the missing ancestors top-down, without recursion
+            pending = []
+            node = self
+            while node._text is None:
+                pending.append(node)
+                node = node.parent
+            for node in reversed(pending):
+                node._text = node.parent.child_text(node.key)
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"NodePath({str(self)!r})"
+
+
+class TreeVisitor:
+    """
+    Callbacks of a tree walk; override the ones you need.
+
+    Containers receive their own path. Scalars only receive the path of
+    their parent, so that visitors build theirs (parent.child_text(key))
+    only when they need it. The root has key None and path text "", and
+    a scalar is held by an object key exactly when its parent is not a list.
+    """
+
+    def enter_dict(self, node: dict, key: Any, path: NodePath) -> bool:
+        """Called before the entries of an object; return False to skip them."""
+        return True
+
+    def leave_dict(self, node: dict, key: Any, path: NodePath):
+        """Called after the entries of an object that was entered."""
+
+    def enter_list(self, node: list, key: Any, path: NodePath) -> bool:
+        """Called before the items of an array; return False to skip them."""
+        return True
+
+    def leave_list(self, node: list, key: Any, path: NodePath):
+        """Called after the items of an array that was entered."""
+
+    def visit_value(self, value: Any, key: Any, parent: NodePath):
+        """Called for every scalar (string, number, boolean, null)."""
+
+
+# Exact types of the scalars of parsed JSON, checked before the containers
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+# Parent given to visit_value for a scalar root document (a list, since the
+# root is not held by an object key)
+_ROOT_PARENT = NodePath(is_list=True)
+
+
+def walk(data: Any, visitor: TreeVisitor):
+    """
+    Walk a document depth-first, in document order.
+
+    Args:
+        data: Parsed JSON document
+        visitor: Callbacks to call on each node
+    """
+    # (remaining children, container, key, path) of each entered container
+    stack: List[Tuple[Any, Any, Any, NodePath]] = []
+    enter_dict = visitor.enter_dict
+    enter_list = visitor.enter_list
+    visit_value = visitor.visit_value
+
+    if isinstance(data, dict):
+        path = NodePath()
+        if enter_dict(data, None, path):
+            stack.append((iter(data.items()), data, None, path))
+    elif isinstance(data, list):
+        path = NodePath(is_list=True)
+        if enter_list(data, None, path):
+            stack.append((iter(enumerate(data)), data, None, path))
+    else:
+        visit_value(data, None, _ROOT_PARENT)
+
+    while stack:
+        children, container, container_key, parent = stack[-1]
+
+        for key, value in children:
+            if value.__class__ in _SCALAR_TYPES:
+                visit_value(value, key, parent)
+            elif isinstance(value, dict):
+                path = NodePath(parent, key)
+                if enter_dict(value, key, path):
+                    stack.append((iter(value.items()), value, key, path))
+                    break
+            elif isinstance(value, list):
+                path = NodePath(parent, key, True)
+                if enter_list(value, key, path):
+                    stack.append((iter(enumerate(value)), value, key, path))
+                    break
+            else:
+                visit_value(value, key, parent)
+        else:
+            # All children visited
+            stack.pop()
+            if parent.is_list:
+                visitor.leave_list(container, container_key, parent)
+            else:
+                visitor.leave_dict(container, container_key, parent)